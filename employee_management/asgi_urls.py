@@ -0,0 +1,19 @@
+"""
+URL configuration used for requests served over ASGI.
+
+Identical to ``employee_management.urls`` except that the employee and review
+read endpoints are native async views. Selected per request by
+``employees.middleware.ASGIURLConfMiddleware``.
+"""
+from django.apps import apps
+from django.urls import path, include
+
+urlpatterns = [
+    path('api/v1/', include('employees.async_urls')),
+]
+
+if apps.is_installed('django.contrib.admin'):
+    from django.contrib import admin
+
+    urlpatterns.insert(0, path('admin/', admin.site.urls))
+
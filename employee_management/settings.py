@@ -47,6 +47,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'employees.middleware.RequestMetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -54,10 +55,17 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'employees.middleware.ASGIURLConfMiddleware',
+    'employees.middleware.ReplicaRoutingMiddleware',
+    'employees.middleware.AdmissionControlMiddleware',
 ]
 
 ROOT_URLCONF = 'employee_management.urls'
 
+# Used instead of ROOT_URLCONF for requests served over ASGI (asgi.py); it
+# maps the employee and review read endpoints to native async views.
+ASGI_URLCONF = 'employee_management.asgi_urls'
+
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
@@ -80,18 +88,144 @@ WSGI_APPLICATION = 'employee_management.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.0/ref/settings/#databases
 
+# Connections are reused instead of opened per request. With DATABASE_POOL
+# set, each worker process keeps a psycopg 3 connection pool (requires
+# "psycopg[pool]"); requests wait up to DATABASE_POOL_TIMEOUT seconds for a
+# free connection. Otherwise each thread keeps its connection open for
+# DATABASE_CONN_MAX_AGE seconds; prefer the pool under ASGI, where requests
+# do not reuse threads. Reused connections are health-checked either way.
+# Current usage is reported per worker at /api/v1/metrics/db/.
+
+DATABASE_POOL = os.getenv('DATABASE_POOL', '').lower() in ('1', 'true', 'yes', 'on')
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.postgresql',
         'NAME': 'db.employees_management',
         'USER': os.getenv('DATABASE_USER'),
         'PASSWORD': os.getenv('DATABASE_PASSWORD'),
-        'HOST': 'localhost',
-        'PORT': '5432',
+        'HOST': os.getenv('DATABASE_HOST', 'localhost'),
+        'PORT': os.getenv('DATABASE_PORT', '5432'),
+        # Pooling and persistent connections are mutually exclusive.
+        'CONN_MAX_AGE': 0 if DATABASE_POOL else int(os.getenv('DATABASE_CONN_MAX_AGE', '60')),
+        'CONN_HEALTH_CHECKS': os.getenv('DATABASE_HEALTH_CHECKS', 'true').lower() in ('1', 'true', 'yes', 'on'),
+        'OPTIONS': {
+            'pool': {
+                'min_size': int(os.getenv('DATABASE_POOL_MIN_SIZE', '2')),
+                'max_size': int(os.getenv('DATABASE_POOL_MAX_SIZE', '10')),
+                'timeout': float(os.getenv('DATABASE_POOL_TIMEOUT', '10')),
+                'max_idle': float(os.getenv('DATABASE_POOL_MAX_IDLE', '600')),
+                'max_lifetime': float(os.getenv('DATABASE_POOL_MAX_LIFETIME', '3600')),
+            },
+        } if DATABASE_POOL else {},
+    }
+}
+
+# Read replicas: DATABASE_REPLICA_HOSTS=host1,host2 adds aliases replica1,
+# replica2 with the primary's name and credentials. Safe-method requests read
+# from them (employees.routers); a client that has just written reads from the
+# primary for REPLICA_PIN_SECONDS. Tests mirror replicas onto the test database.
 
+DATABASE_REPLICAS = []
+for index, host in enumerate(filter(None, os.getenv('DATABASE_REPLICA_HOSTS', '').split(',')), start=1):
+    DATABASES[f'replica{index}'] = {**DATABASES['default'], 'HOST': host.strip(), 'TEST': {'MIRROR': 'default'}}
+    DATABASE_REPLICAS.append(f'replica{index}')
+
+DATABASE_ROUTERS = ['employees.routers.PrimaryReplicaRouter']
+
+REPLICA_PIN_SECONDS = int(os.getenv('REPLICA_PIN_SECONDS', '5'))
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.0/topics/cache/
+# Backs the read-through response cache in employees/cache.py. Defaults to a
+# per-process local-memory cache; point CACHE_BACKEND/CACHE_LOCATION at a
+# shared backend (e.g. django.core.cache.backends.redis.RedisCache) in production.
+
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv('CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.getenv('CACHE_LOCATION', ''),
     }
 }
 
+API_CACHE_TIMEOUT = int(os.getenv('API_CACHE_TIMEOUT', '300'))
+
+
+# Request instrumentation (employees.instrumentation): requests repeating one
+# SQL statement shape N_PLUS_ONE_THRESHOLD times are logged as likely N+1
+# queries; /metrics/requests/ computes percentiles over the last
+# REQUEST_METRICS_SAMPLES requests per route.
+
+N_PLUS_ONE_THRESHOLD = int(os.getenv('N_PLUS_ONE_THRESHOLD', '5'))
+REQUEST_METRICS_SAMPLES = int(os.getenv('REQUEST_METRICS_SAMPLES', '1000'))
+
+
+# Employee deletion (employees.deletion): with EMPLOYEE_SOFT_DELETE, deletes
+# only mark employees deleted and `manage.py purge_employees` removes them
+# later; either way rows go in batches of EMPLOYEE_DELETE_BATCH_SIZE.
+
+EMPLOYEE_SOFT_DELETE = os.getenv('EMPLOYEE_SOFT_DELETE', '').lower() in ('1', 'true', 'yes', 'on')
+EMPLOYEE_DELETE_BATCH_SIZE = int(os.getenv('EMPLOYEE_DELETE_BATCH_SIZE', '1000'))
+
+
+# Background jobs (employees.jobs), run by `manage.py run_workers`. Uploads
+# and exports live in JOB_FILES_DIR. JOB_CONCURRENCY overrides how many jobs
+# of a kind run at once, e.g. "export_employees=4,import_employees=1". A
+# running job whose heartbeat is JOB_STALE_SECONDS old is retried, up to
+# JOB_MAX_ATTEMPTS starts.
+
+JOB_FILES_DIR = os.getenv('JOB_FILES_DIR', BASE_DIR / 'job_files')
+JOB_CONCURRENCY = {
+    kind.strip(): int(limit)
+    for kind, _, limit in (item.partition('=') for item in os.getenv('JOB_CONCURRENCY', '').split(',') if item.strip())
+}
+JOB_HEARTBEAT_SECONDS = float(os.getenv('JOB_HEARTBEAT_SECONDS', '10'))
+JOB_STALE_SECONDS = float(os.getenv('JOB_STALE_SECONDS', '60'))
+JOB_MAX_ATTEMPTS = int(os.getenv('JOB_MAX_ATTEMPTS', '3'))
+
+# Change feed (GET /employees/changes/?since=). Changes newer than
+# CHANGE_FEED_SETTLE_SECONDS are held back until concurrent transactions have
+# committed; deletions are kept CHANGE_FEED_RETENTION_DAYS (purge_employees'
+# default), and older cursors get 410 Gone.
+
+CHANGE_FEED_SETTLE_SECONDS = float(os.getenv('CHANGE_FEED_SETTLE_SECONDS', '5'))
+CHANGE_FEED_RETENTION_DAYS = float(os.getenv('CHANGE_FEED_RETENTION_DAYS', '30'))
+
+# Rate limiting and admission control (employees.throttling); all off unless
+# set. Each client gets a token bucket refilled at THROTTLE_RATE (e.g.
+# "50/s") holding THROTTLE_BURST tokens, in the THROTTLE_CACHE_ALIAS cache,
+# which must be shared (e.g. Redis) for limits to hold across processes.
+# Requests cost ROUTE_COSTS tokens, overridable with THROTTLE_COSTS;
+# THROTTLE_ROUTE_RATES ("GET employee-export=2/s,...") adds a bucket per route
+# shared by all clients. At most ADMISSION_MAX_HEAVY requests costing
+# ADMISSION_HEAVY_COST or more run at once; others get 503 immediately.
+
+THROTTLE_RATE = os.getenv('THROTTLE_RATE', '')
+THROTTLE_BURST = float(os.getenv('THROTTLE_BURST', '0')) or None
+THROTTLE_CACHE_ALIAS = os.getenv('THROTTLE_CACHE_ALIAS', 'default')
+THROTTLE_COSTS = {
+    route.strip(): int(cost)
+    for route, _, cost in (item.partition('=') for item in os.getenv('THROTTLE_COSTS', '').split(',') if item.strip())
+}
+THROTTLE_ROUTE_RATES = {
+    route.strip(): rate.strip()
+    for route, _, rate in (item.partition('=') for item in os.getenv('THROTTLE_ROUTE_RATES', '').split(',') if item.strip())
+}
+ADMISSION_MAX_HEAVY = int(os.getenv('ADMISSION_MAX_HEAVY', '0'))
+ADMISSION_HEAVY_COST = int(os.getenv('ADMISSION_HEAVY_COST', '5'))
+ADMISSION_SLOT_TIMEOUT = int(os.getenv('ADMISSION_SLOT_TIMEOUT', '300'))
+
+# Start-up (employees.startup). With STARTUP_WARM_UP, wsgi.py and asgi.py
+# import the views and compile every route before returning the application,
+# instead of on the first request. `manage.py startup_profile` fails when a
+# cold start (interpreter to first response) takes over STARTUP_BUDGET_MS;
+# the test suite checks the budget only with STARTUP_BUDGET_TEST=1.
+# settings_production.py is a leaner profile for API workers.
+
+STARTUP_WARM_UP = os.getenv('STARTUP_WARM_UP', '').lower() in ('1', 'true', 'yes', 'on')
+STARTUP_BUDGET_MS = float(os.getenv('STARTUP_BUDGET_MS', '1500'))
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
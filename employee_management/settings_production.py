@@ -0,0 +1,62 @@
+"""
+Lean settings for API worker processes.
+
+Use with DJANGO_SETTINGS_MODULE=employee_management.settings_production. On
+top of the base settings it:
+
+* leaves out the apps the JSON API does not use (the admin, sessions,
+  messages, static files and DRF tokens, with their middleware and context
+  processors), unless ADMIN_ENABLED is set, e.g. for an admin deployment or
+  to run `manage.py migrate`;
+* warms routes up at boot (STARTUP_WARM_UP) so the first request served
+  does not import the views;
+* turns DEBUG off and takes ALLOWED_HOSTS from the environment.
+
+`manage.py startup_profile --settings=employee_management.settings_production`
+shows the difference.
+"""
+import os
+
+from .settings import *  # noqa: F401,F403
+from .settings import INSTALLED_APPS, MIDDLEWARE, TEMPLATES
+
+DEBUG = False
+
+ALLOWED_HOSTS = [host.strip() for host in os.getenv('ALLOWED_HOSTS', '').split(',') if host.strip()]
+
+ADMIN_ENABLED = os.getenv('ADMIN_ENABLED', '').lower() in ('1', 'true', 'yes', 'on')
+
+OPTIONAL_APPS = [
+    'django.contrib.admin',
+    'django.contrib.sessions',
+    'django.contrib.messages',
+    'django.contrib.staticfiles',
+    'rest_framework.authtoken',
+]
+
+if not ADMIN_ENABLED:
+    INSTALLED_APPS = [app for app in INSTALLED_APPS if app not in OPTIONAL_APPS]
+    # Authentication middleware needs sessions; DRF authenticates API requests itself.
+    MIDDLEWARE = [
+        middleware for middleware in MIDDLEWARE
+        if middleware not in (
+            'django.contrib.sessions.middleware.SessionMiddleware',
+            'django.contrib.auth.middleware.AuthenticationMiddleware',
+            'django.contrib.messages.middleware.MessageMiddleware',
+        )
+    ]
+    TEMPLATES = [
+        {
+            **template,
+            'OPTIONS': {
+                **template['OPTIONS'],
+                'context_processors': [
+                    processor for processor in template['OPTIONS']['context_processors']
+                    if processor != 'django.contrib.messages.context_processors.messages'
+                ],
+            },
+        }
+        for template in TEMPLATES
+    ]
+
+STARTUP_WARM_UP = os.getenv('STARTUP_WARM_UP', 'true').lower() in ('1', 'true', 'yes', 'on')
@@ -14,10 +14,15 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
-from django.contrib import admin
+from django.apps import apps
 from django.urls import path, include  # add include here
 
 urlpatterns = [
-    path('admin/', admin.site.urls),
     path('api/v1/', include('employees.urls')),  # now include is defined
-]
\ No newline at end of file
+]
+
+# The lean production profile (settings_production.py) leaves the admin out.
+if apps.is_installed('django.contrib.admin'):
+    from django.contrib import admin
+
+    urlpatterns.insert(0, path('admin/', admin.site.urls))
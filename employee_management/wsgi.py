@@ -9,8 +9,14 @@ https://docs.djangoproject.com/en/5.0/howto/deployment/wsgi/
 
 import os
 
+from django.conf import settings
 from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'employee_management.settings')
 
 application = get_wsgi_application()
+
+if getattr(settings, 'STARTUP_WARM_UP', False):
+    from employees.startup import warm_up
+
+    warm_up()
@@ -5,3 +5,5 @@ class EmployeesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'employees'
 
+    def ready(self):
+        from . import signals  # noqa: F401
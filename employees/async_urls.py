@@ -0,0 +1,24 @@
+from django.urls import URLPattern
+
+from . import async_views
+from .urls import urlpatterns as sync_urlpatterns
+
+# Routes whose GET has a native async implementation; see employees.async_views.
+ASYNC_READ_VIEWS = {
+    'employee-retrieve': async_views.retrieve_employee,
+    'employee-list': async_views.list_employees,
+    'review-list': async_views.list_reviews,
+    'review-detail': async_views.retrieve_review,
+}
+
+# The same routes, in the same order, as employees/urls.py.
+urlpatterns = [
+    URLPattern(
+        pattern.pattern,
+        async_views.with_sync_fallback(ASYNC_READ_VIEWS[pattern.name], pattern.callback)
+        if pattern.name in ASYNC_READ_VIEWS else pattern.callback,
+        pattern.default_args,
+        pattern.name,
+    )
+    for pattern in sync_urlpatterns
+]
@@ -0,0 +1,132 @@
+"""
+Native async implementations of the read endpoints, used under ASGI.
+
+``employees.middleware.ASGIURLConfMiddleware`` routes ASGI requests through
+``employees.async_urls``, where GET on the employee retrieve/list and review
+list/retrieve routes is served here with Django's async ORM, so a request
+waiting on the database does not occupy a thread. Every other method falls
+through to the synchronous DRF viewsets.
+
+The views borrow the viewsets' configuration (eager loading, ``filter_params``,
+ordering, ``?fields=``, pagination) and use the same response cache, so both
+paths return the same JSON. Only JSON is rendered; the browsable API is
+available over WSGI.
+"""
+from functools import partial, wraps
+
+from asgiref.sync import sync_to_async
+from django.http import Http404, HttpResponse
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework.exceptions import APIException, NotFound
+
+from .renderers import ORJSONRenderer
+from .cache import EMPLOYEE_LIST_NAMESPACE, REVIEW_LIST_NAMESPACE, acached_response, employee_namespace, review_namespace
+from .serializers import EmployeeSerializer
+from .streaming import astreaming_json_response
+from .views import EmployeeViewSet, PerformanceReviewViewSet
+
+
+def json_response(data, status=200):
+    return HttpResponse(ORJSONRenderer().render(data), status=status, content_type='application/json')
+
+
+def api_view(view_func):
+    """
+    Render ``APIException`` and ``Http404`` the way DRF's exception handler does.
+    """
+    @wraps(view_func)
+    async def view(request, *args, **kwargs):
+        try:
+            return await view_func(request, *args, **kwargs)
+        except Http404 as exc:
+            return json_response({'detail': NotFound(*exc.args).detail}, status=404)
+        except APIException as exc:
+            detail = exc.detail if isinstance(exc.detail, (list, dict)) else {'detail': exc.detail}
+            return json_response(detail, status=exc.status_code)
+    return view
+
+
+def with_sync_fallback(async_view, sync_view):
+    """
+    Serve GET with ``async_view`` and any other method with the DRF ``sync_view``.
+    """
+    @wraps(async_view)
+    async def view(request, *args, **kwargs):
+        if request.method == 'GET':
+            return await async_view(request, *args, **kwargs)
+        return await sync_to_async(sync_view)(request, *args, **kwargs)
+    return csrf_exempt(view)
+
+
+def get_viewset(viewset_class, request, action, **kwargs):
+    """
+    A viewset instance bound to ``request``, used for its configuration only.
+
+    Building querysets and serializers does not touch the database, so this is
+    safe in an async context; evaluation happens in the views below.
+    """
+    view = viewset_class(action_map={'get': action}, format_kwarg=None, args=(), kwargs=kwargs)
+    view.request = view.initialize_request(request)
+    return view
+
+
+@api_view
+async def retrieve_employee(request, identifier):
+    view = get_viewset(EmployeeViewSet, request, 'retrieve_employee', identifier=identifier)
+
+    async def build():
+        employee = await view.get_queryset().by_identifier(identifier).afirst()
+        if employee is None:
+            raise Http404('No Employee matches the given query.')
+        return view.get_serializer(employee).data, employee.version
+
+    if identifier.isdigit():
+        return await acached_response(request, employee_namespace(int(identifier)), build, versioned=True)
+    data, _ = await build()
+    return json_response(data)
+
+
+@api_view
+async def list_employees(request):
+    view = get_viewset(EmployeeViewSet, request, 'list')
+    queryset = view.filter_queryset(view.get_queryset())
+    if view.request.query_params.get('stream'):
+        if not queryset.ordered:
+            queryset = queryset.order_by('id')
+        return astreaming_json_response(queryset, partial(EmployeeSerializer, fields=view.get_requested_fields()))
+
+    async def build():
+        if view.get_values_serializer() is not None:
+            return await view.alist_data(queryset)
+        page = await view.paginator.apaginate_queryset(queryset, view.request, view=view)
+        if page is not None:
+            return view.get_paginated_response(view.get_serializer(page, many=True).data).data
+        return view.get_serializer([employee async for employee in queryset], many=True).data
+
+    return await acached_response(request, EMPLOYEE_LIST_NAMESPACE, build)
+
+
+@api_view
+async def list_reviews(request):
+    view = get_viewset(PerformanceReviewViewSet, request, 'list')
+    queryset = view.filter_queryset(view.get_queryset())
+
+    async def build():
+        if view.get_values_serializer() is not None:
+            return await view.alist_data(queryset)
+        return view.get_serializer([review async for review in queryset], many=True).data
+
+    return await acached_response(request, REVIEW_LIST_NAMESPACE, build)
+
+
+@api_view
+async def retrieve_review(request, pk):
+    view = get_viewset(PerformanceReviewViewSet, request, 'retrieve', pk=pk)
+
+    async def build():
+        review = await view.get_queryset().filter(pk=pk).afirst()
+        if review is None:
+            raise Http404('No Review matches the given query.')
+        return view.get_serializer(review).data
+
+    return await acached_response(request, review_namespace(int(pk)), build)
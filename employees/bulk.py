@@ -0,0 +1,201 @@
+from itertools import islice
+
+from django.db import transaction
+from django.db.models import F
+
+from .cache import EMPLOYEE_LIST_NAMESPACE, REVIEW_LIST_NAMESPACE, employee_namespace, invalidate, invalidate_all
+from .models import Employee, Review
+from .serializers import EmployeeUpsertSerializer, ReviewBulkSerializer, validate_row
+
+UPSERT_BATCH_SIZE = 1000
+REVIEW_BATCH_SIZE = 1000
+
+# Columns overwritten when an incoming row's email already exists.
+UPSERT_UPDATE_FIELDS = [
+    'first_name',
+    'last_name',
+    'contact_number',
+    'contact_info',
+    'department',
+    'birth_date',
+    'hire_date',
+    'updated_at',
+    # Uploading a soft-deleted employee's email brings it back.
+    'deleted_at',
+]
+
+
+def upsert_employees(rows, batch_size=UPSERT_BATCH_SIZE):
+    """
+    Validate and insert-or-update employees keyed on ``email``, in batches.
+
+    Each batch is validated row by row with ``EmployeeUpsertSerializer``
+    (the ``EmployeeSerializer`` rules minus the per-row email uniqueness
+    query), checked against the database with one ``email__in`` query, and
+    written with a single ``INSERT ... ON CONFLICT (email) DO UPDATE`` inside
+    its own transaction. A row whose email already appeared earlier in the
+    same upload is rejected rather than silently overwriting it.
+
+    Args:
+        rows (iterable): Employee dicts, e.g. a parsed JSON array or NDJSON body.
+        batch_size (int): Rows validated and written per transaction.
+
+    Returns:
+        list: One result per input row, in input order, each with ``index``,
+        ``status`` (``created``, ``updated`` or ``error``) and either ``id``
+        or ``errors``.
+    """
+    results = []
+    seen_emails = set()
+    serializer = EmployeeUpsertSerializer()
+    rows = iter(rows)
+    while True:
+        batch = list(islice(rows, batch_size))
+        if not batch:
+            return results
+        results += _upsert_batch(serializer, batch, len(results), seen_emails)
+
+
+def _upsert_batch(serializer, rows, offset, seen_emails):
+    results = []
+    valid = []
+    for index, row in enumerate(rows, start=offset):
+        data, errors = validate_row(serializer, row)
+        if errors:
+            results.append({'index': index, 'status': 'error', 'errors': errors})
+            continue
+        email = data['email']
+        if email in seen_emails:
+            results.append({'index': index, 'status': 'error', 'errors': {'email': ['Duplicate email in this upload.']}})
+            continue
+        seen_emails.add(email)
+        result = {'index': index}
+        results.append(result)
+        valid.append((result, Employee(**data)))
+
+    if not valid:
+        return results
+
+    with transaction.atomic():
+        existing = save_employees([employee for _, employee in valid])
+
+    for result, employee in valid:
+        result['status'] = 'updated' if employee.email in existing else 'created'
+        result['id'] = employee.pk
+    return results
+
+
+def save_employees(employees):
+    """
+    Insert-or-update unsaved employees on ``email`` with one upsert statement.
+
+    Emails must be unique within ``employees``. Primary keys are set on the
+    instances afterwards. ``bulk_create`` sends no model signals, so the
+    whole response cache is invalidated. Call inside a transaction.
+
+    Args:
+        employees (list): Unsaved ``Employee`` instances.
+
+    Returns:
+        set: The emails that already existed, i.e. the rows that were updated.
+    """
+    emails = [employee.email for employee in employees]
+    # Soft-deleted employees count: the upsert restores them.
+    existing = set(Employee.all_objects.filter(email__in=emails).values_list('email', flat=True))
+    Employee.objects.bulk_create(
+        employees,
+        update_conflicts=True,
+        unique_fields=['email'],
+        update_fields=UPSERT_UPDATE_FIELDS,
+    )
+    if existing:
+        # Fail concurrent If-Match updates based on the overwritten versions.
+        Employee.all_objects.filter(email__in=existing).update(version=F('version') + 1)
+    if any(employee.pk is None for employee in employees):
+        # Backends that cannot RETURNING from an upsert leave pk unset.
+        ids = dict(Employee.objects.filter(email__in=emails).values_list('email', 'id'))
+        for employee in employees:
+            employee.pk = ids[employee.email]
+    invalidate_all()
+    return existing
+
+
+def create_reviews(rows, batch_size=REVIEW_BATCH_SIZE):
+    """
+    Validate and insert reviews, in batches.
+
+    Each batch is validated row by row with ``ReviewBulkSerializer``, its
+    employee IDs are resolved with one ``id__in`` query, and its valid rows are
+    written with ``bulk_create`` inside their own transaction.
+
+    Args:
+        rows (iterable): Review dicts, e.g. a parsed JSON array or NDJSON body.
+        batch_size (int): Rows validated and written per transaction.
+
+    Returns:
+        list: One result per input row, in input order, each with ``index``,
+        ``status`` (``created`` or ``error``) and either ``id`` or ``errors``.
+    """
+    results = []
+    serializer = ReviewBulkSerializer()
+    rows = iter(rows)
+    while True:
+        batch = list(islice(rows, batch_size))
+        if not batch:
+            return results
+        results += _create_review_batch(serializer, batch, len(results))
+
+
+def _create_review_batch(serializer, rows, offset):
+    results = []
+    valid = []
+    for index, row in enumerate(rows, start=offset):
+        data, errors = validate_row(serializer, row)
+        if errors:
+            results.append({'index': index, 'status': 'error', 'errors': errors})
+            continue
+        result = {'index': index}
+        results.append(result)
+        valid.append((result, Review(employee_id=data.pop('employee'), **data)))
+
+    if not valid:
+        return results
+
+    employee_ids = {review.employee_id for _, review in valid}
+    existing = set(Employee.objects.filter(id__in=employee_ids).values_list('id', flat=True))
+    reviews = []
+    for result, review in valid:
+        if review.employee_id in existing:
+            reviews.append((result, review))
+        else:
+            result['status'] = 'error'
+            result['errors'] = {'employee': [f'Invalid pk "{review.employee_id}" - object does not exist.']}
+
+    if reviews:
+        with transaction.atomic():
+            save_reviews([review for _, review in reviews])
+    for result, review in reviews:
+        result['status'] = 'created'
+        result['id'] = review.pk
+    return results
+
+
+def save_reviews(reviews):
+    """
+    Insert unsaved reviews with ``bulk_create``.
+
+    ``bulk_create`` sends no model signals, so the review stats of the
+    employees involved are recomputed with one ``UPDATE`` and their cached
+    responses are invalidated here. Call inside a transaction.
+
+    Args:
+        reviews (list): Unsaved ``Review`` instances of existing employees.
+    """
+    Review.objects.bulk_create(reviews)
+    employee_ids = {review.employee_id for review in reviews}
+    Employee.objects.filter(pk__in=employee_ids).refresh_review_stats()
+    invalidate(
+        REVIEW_LIST_NAMESPACE,
+        EMPLOYEE_LIST_NAMESPACE,
+        *(employee_namespace(employee_id) for employee_id in employee_ids),
+    )
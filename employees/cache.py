@@ -0,0 +1,201 @@
+"""
+Read-through response cache for the employee and review read endpoints.
+
+Entries are keyed by a namespace (``employee:<id>``, ``employees:list``,
+``review:<id>``, ``reviews:list``) plus the request URI. Each
+namespace carries a generation counter that is part of the key, so
+invalidating a namespace is a single ``incr`` no matter how many query-string
+variants were cached under it. A global epoch does the same for writes that
+bypass model signals (bulk inserts, ``QuerySet.update``).
+"""
+import hashlib
+import json
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.http import HttpResponse, HttpResponseNotModified
+from rest_framework import status
+from rest_framework.response import Response
+
+from .renderers import ORJSONRenderer
+from .routers import pinned_to_primary
+
+EPOCH_KEY = 'api:epoch'
+EMPLOYEE_LIST_NAMESPACE = 'employees:list'
+REVIEW_LIST_NAMESPACE = 'reviews:list'
+# Not a response namespace: versions the in-process search index (employees.search).
+SEARCH_NAMESPACE = 'employees:search'
+
+
+def get_cache():
+    return caches[getattr(settings, 'API_CACHE_ALIAS', 'default')]
+
+
+def employee_namespace(pk):
+    return f'employee:{pk}'
+
+
+def review_namespace(pk):
+    return f'review:{pk}'
+
+
+def _generation_key(namespace):
+    return f'api:gen:{namespace}'
+
+
+def _bump(key):
+    cache = get_cache()
+    try:
+        cache.incr(key)
+    except ValueError:
+        # Missing (never set or evicted): start from a value no earlier key can have used.
+        cache.add(key, time.time_ns(), timeout=None)
+
+
+def _bump_now_and_on_commit(key):
+    # Bump immediately for this connection's own reads, and again after commit
+    # so a concurrent reader cannot re-cache pre-commit data under the new key.
+    _bump(key)
+    transaction.on_commit(lambda: _bump(key))
+
+
+def invalidate(*namespaces):
+    """
+    Invalidate every cached response under the given namespaces.
+    """
+    for namespace in namespaces:
+        _bump_now_and_on_commit(_generation_key(namespace))
+
+
+def invalidate_all():
+    """
+    Invalidate every cached response; for set-based writes that skip signals.
+    """
+    _bump_now_and_on_commit(EPOCH_KEY)
+
+
+def get_generation(namespace):
+    """
+    The current ``(epoch, generation)`` of ``namespace``; changes whenever it is invalidated.
+    """
+    generation_key = _generation_key(namespace)
+    versions = get_cache().get_many([EPOCH_KEY, generation_key])
+    return versions.get(EPOCH_KEY, 0), versions.get(generation_key, 0)
+
+
+def make_etag(body, version=None):
+    """
+    A strong ETag for ``body``, prefixed with the row ``version`` it renders if
+    given, so ``If-Match`` can be checked against the row without rendering it.
+    """
+    digest = hashlib.md5(body).hexdigest()
+    return f'"{digest}"' if version is None else f'"{version}-{digest}"'
+
+
+def if_match_versions(request):
+    """
+    The row versions named by the ``If-Match`` header.
+
+    Returns:
+        set or None: ``None`` without a header or for ``*``, which any existing
+        row matches. Weak and unversioned tags match no version.
+    """
+    header = request.headers.get('If-Match')
+    if not header or header.strip() == '*':
+        return None
+    versions = set()
+    for candidate in header.split(','):
+        version, _, _ = candidate.strip().removeprefix('"').partition('-')
+        if version.isdigit():
+            versions.add(int(version))
+    return versions
+
+
+def etag_matches(request, etag):
+    header = request.headers.get('If-None-Match')
+    if not header:
+        return False
+    candidates = [candidate.strip() for candidate in header.split(',')]
+    return '*' in candidates or any(candidate.removeprefix('W/') == etag for candidate in candidates)
+
+
+def cache_key(request, namespace):
+    versions = get_cache().get_many([EPOCH_KEY, _generation_key(namespace)])
+    return _versioned_key(request, namespace, versions)
+
+
+async def acache_key(request, namespace):
+    versions = await get_cache().aget_many([EPOCH_KEY, _generation_key(namespace)])
+    return _versioned_key(request, namespace, versions)
+
+
+def _versioned_key(request, namespace, versions):
+    # The full URI: paginated responses embed absolute ``next`` links.
+    query = hashlib.md5(request.build_absolute_uri().encode('utf-8')).hexdigest()
+    return f'api:{versions.get(EPOCH_KEY, 0)}:{namespace}:{versions.get(_generation_key(namespace), 0)}:{query}'
+
+
+def cached_response(request, namespace, build, versioned=False):
+    """
+    Serve ``build()``'s data from the cache, with ``ETag`` and ``304`` support.
+
+    Args:
+        request (Request): The current request; its query string is part of the key.
+        namespace (str): The namespace whose invalidation drops this entry.
+        build (callable): Returns the response data on a cache miss.
+        versioned (bool): ``build`` returns ``(data, row version)`` and the
+            version goes into the ETag (see ``make_etag``).
+
+    Returns:
+        response (Response): ``304 Not Modified`` if ``If-None-Match`` matches,
+        otherwise the data with its ``ETag``.
+    """
+    cache = get_cache()
+    key = cache_key(request, namespace)
+    # A client that just wrote skips entries that may have been built from a
+    # lagging replica; its fresh entry from the primary replaces them.
+    entry = None if pinned_to_primary() else cache.get(key)
+    if entry is None:
+        data, version = build() if versioned else (build(), None)
+        body = ORJSONRenderer().render(data)
+        # Cache plain JSON types so hits can still be rendered by any renderer.
+        entry = (make_etag(body, version), json.loads(body))
+        cache.set(key, entry, getattr(settings, 'API_CACHE_TIMEOUT', 300))
+
+    etag, data = entry
+    if etag_matches(request, etag):
+        return Response(status=status.HTTP_304_NOT_MODIFIED, headers={'ETag': etag})
+    return Response(data, headers={'ETag': etag})
+
+
+async def acached_response(request, namespace, build, versioned=False):
+    """
+    ``cached_response`` for async views.
+
+    Args:
+        request (HttpRequest): The current request.
+        namespace (str): The namespace whose invalidation drops this entry.
+        build (coroutine function): Returns the response data on a cache miss.
+        versioned (bool): As for ``cached_response``.
+
+    Returns:
+        response (HttpResponse): The rendered JSON, or ``304 Not Modified``.
+    """
+    cache = get_cache()
+    key = await acache_key(request, namespace)
+    entry = None if pinned_to_primary() else await cache.aget(key)
+    body = None
+    if entry is None:
+        data, version = await build() if versioned else (await build(), None)
+        body = ORJSONRenderer().render(data)
+        entry = (make_etag(body, version), json.loads(body))
+        await cache.aset(key, entry, getattr(settings, 'API_CACHE_TIMEOUT', 300))
+
+    etag, data = entry
+    if etag_matches(request, etag):
+        return HttpResponseNotModified(headers={'ETag': etag})
+    if body is None:
+        body = ORJSONRenderer().render(data)
+    return HttpResponse(body, content_type='application/json', headers={'ETag': etag})
@@ -0,0 +1,68 @@
+"""
+The employee change feed: what changed since a cursor, for incremental sync.
+
+Changes are read in ``(updated_at, id)`` order through the
+``employee_updated_at_idx`` index. Live employees are upserts; soft-deleted
+employees and ``EmployeeTombstone`` rows (hard deletes) are deletions. The
+two sources are read with the same keyset bounds and merged, so a page costs
+two index range scans however far into the feed it is.
+
+``updated_at`` is set by the application before its transaction commits, so
+a write may become visible after a later one was already served. Rows
+changed in the last ``CHANGE_FEED_SETTLE_SECONDS`` are therefore held back
+until such writes have committed, and a cursor never skips them.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from .models import Employee, EmployeeTombstone
+from .pagination import keyset_filter
+from .serializers import EmployeeSerializer
+
+UPSERT = 'upsert'
+DELETE = 'delete'
+
+
+def settle_delay():
+    return timedelta(seconds=getattr(settings, 'CHANGE_FEED_SETTLE_SECONDS', 5))
+
+
+def employee_changes(position, limit):
+    """
+    The first ``limit`` employee changes after ``position``.
+
+    Args:
+        position (list): ``[updated_at, id]`` of the last change already
+            consumed, or ``None`` to start from the beginning.
+        limit (int): Most changes to return.
+
+    Returns:
+        list: Dicts with ``op`` (``upsert`` or ``delete``), ``id``,
+        ``updated_at`` and ``employee`` (the instance, for upserts).
+    """
+    until = timezone.now() - settle_delay()
+    employees = Employee.all_objects.filter(updated_at__lte=until)
+    tombstones = EmployeeTombstone.objects.filter(deleted_at__lte=until)
+    if position is not None:
+        employees = employees.filter(keyset_filter(('updated_at', 'id'), position))
+        tombstones = tombstones.filter(keyset_filter(('deleted_at', 'employee_id'), position))
+
+    employees = EmployeeSerializer.setup_eager_loading(employees, required_fields=['updated_at', 'deleted_at'])
+    changes = [
+        {
+            'op': UPSERT if employee.deleted_at is None else DELETE,
+            'id': employee.pk,
+            'updated_at': employee.updated_at,
+            'employee': employee if employee.deleted_at is None else None,
+        }
+        for employee in employees.order_by('updated_at', 'id')[:limit]
+    ]
+    changes += [
+        {'op': DELETE, 'id': employee_id, 'updated_at': deleted_at, 'employee': None}
+        for deleted_at, employee_id in tombstones.order_by('deleted_at', 'employee_id')
+        .values_list('deleted_at', 'employee_id')[:limit]
+    ]
+    changes.sort(key=lambda change: (change['updated_at'], change['id']))
+    return changes[:limit]
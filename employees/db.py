@@ -0,0 +1,58 @@
+"""
+Per-process database connection metrics, for sizing ``CONN_MAX_AGE`` or the
+connection pool of each worker.
+"""
+import os
+from collections import Counter
+
+from django.db import DEFAULT_DB_ALIAS, connections
+
+# Connections handed to Django per alias: newly opened, or checked out of the pool.
+connects = Counter()
+
+
+def record_connect(alias):
+    connects[alias] += 1
+
+
+def connection_stats(alias=DEFAULT_DB_ALIAS):
+    """
+    Describe how this process connects to the database ``alias``.
+
+    Args:
+        alias (str): The database alias.
+
+    Returns:
+        dict: Connection settings and counters. ``pool`` is ``None`` unless
+        pooling is enabled; otherwise it reports the pool's size, connections
+        checked out, requests waiting now, and how many requests had to wait
+        and for how long in total.
+    """
+    connection = connections[alias]
+    settings_dict = connection.settings_dict
+    stats = {
+        'alias': alias,
+        'vendor': connection.vendor,
+        'pid': os.getpid(),
+        'conn_max_age': settings_dict['CONN_MAX_AGE'],
+        'health_checks': settings_dict['CONN_HEALTH_CHECKS'],
+        'connects': connects[alias],
+        'pool': None,
+    }
+    pool = getattr(connection, 'pool', None)
+    if pool is not None:
+        raw = pool.get_stats()
+        stats['pool'] = {
+            'min_size': raw.get('pool_min', 0),
+            'max_size': raw.get('pool_max', 0),
+            'size': raw.get('pool_size', 0),
+            'available': raw.get('pool_available', 0),
+            'checked_out': raw.get('pool_size', 0) - raw.get('pool_available', 0),
+            'waiting': raw.get('requests_waiting', 0),
+            'requests': raw.get('requests_num', 0),
+            'waits': raw.get('requests_queued', 0),
+            'wait_ms': raw.get('requests_wait_ms', 0),
+            'timeouts': raw.get('requests_errors', 0),
+            'connections_opened': raw.get('connections_num', 0),
+        }
+    return stats
@@ -0,0 +1,160 @@
+"""
+Set-based, batched employee deletion.
+
+``Model.delete()`` runs Django's collector: it loads every review of the
+employee, sends a signal per object and deletes them in one transaction, so
+removing long-tenured staff or a whole department holds locks for seconds.
+Here each batch is a short transaction of ``DELETE ... WHERE id IN (...)``
+statements, reviews first, and the response cache is invalidated once per
+batch instead of per row.
+
+With ``settings.EMPLOYEE_SOFT_DELETE`` the API only marks employees deleted
+(``Employee.deleted_at``); reads go through ``Employee.objects``, which skips
+them via the ``employee_live_idx`` partial index, and ``purge_employees``
+hard-deletes them later with :func:`delete_employees`.
+
+Hard deletes leave an ``EmployeeTombstone`` per employee so the change feed
+(``employees.changes``) can report them; ``purge_employees`` prunes both.
+"""
+import time
+
+from django.conf import settings
+from django.db import router, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .cache import invalidate_all
+from .models import Employee, EmployeeTombstone, Review
+
+
+def delete_batch_size():
+    return getattr(settings, 'EMPLOYEE_DELETE_BATCH_SIZE', 1000)
+
+
+def soft_delete_enabled():
+    return getattr(settings, 'EMPLOYEE_SOFT_DELETE', False)
+
+
+def _id_batches(queryset, batch_size):
+    """
+    Yield ``queryset``'s primary keys in ascending lists of ``batch_size``.
+
+    Each list is queried after the previous one was processed, from just past
+    its last key, so deleting the rows as they come is safe.
+    """
+    last_id = 0
+    while True:
+        ids = list(queryset.filter(pk__gt=last_id).order_by('pk').values_list('pk', flat=True)[:batch_size])
+        if not ids:
+            return
+        yield ids
+        last_id = ids[-1]
+
+
+def record_tombstones(ids, using=None):
+    """
+    Record the employees ``ids`` as hard-deleted now, for the change feed.
+    """
+    now = timezone.now()
+    EmployeeTombstone.objects.using(using).bulk_create(
+        [EmployeeTombstone(employee_id=pk, deleted_at=now) for pk in ids]
+    )
+
+
+def delete_employees(queryset, batch_size=None, pause=0, tombstones=True):
+    """
+    Hard-delete the employees in ``queryset`` and their reviews, in batches.
+
+    Reviews go first, ``batch_size`` at a time, then the employees, each
+    batch in its own transaction. The employees' transaction locks them and
+    deletes reviews added in the meantime. No model signals are sent; the
+    response cache is invalidated after every employee batch.
+
+    Args:
+        queryset (QuerySet): Employees to delete, e.g. from ``Employee.all_objects``.
+        batch_size (int): Rows per statement; ``EMPLOYEE_DELETE_BATCH_SIZE`` by default.
+        pause (float): Seconds to sleep between batches, to leave room for other traffic.
+        tombstones (bool): Record each deleted employee in ``EmployeeTombstone``.
+
+    Returns:
+        tuple: ``(employees deleted, reviews deleted)``.
+    """
+    batch_size = batch_size or delete_batch_size()
+    using = router.db_for_write(Employee)
+    employees = reviews = 0
+    for ids in _id_batches(queryset.using(using), batch_size):
+        for review_ids in _id_batches(Review.objects.using(using).filter(employee_id__in=ids), batch_size):
+            # _raw_delete() is the single DELETE that QuerySet.delete() issues
+            # when it can skip the collector.
+            with transaction.atomic(using=using):
+                reviews += Review.objects.filter(pk__in=review_ids)._raw_delete(using)
+            _pause(pause)
+        with transaction.atomic(using=using):
+            # A review added since its batch ran would fail the DELETE on its
+            # foreign key. Locking the employees makes new reviews wait (and
+            # then fail), and the sweep takes the ones that got in.
+            list(Employee.all_objects.using(using).select_for_update().filter(pk__in=ids).values_list('pk', flat=True))
+            reviews += Review.objects.filter(employee_id__in=ids)._raw_delete(using)
+            employees += Employee.all_objects.filter(pk__in=ids)._raw_delete(using)
+            if tombstones:
+                record_tombstones(ids, using)
+            invalidate_all()
+        _pause(pause)
+    return employees, reviews
+
+
+def _pause(seconds):
+    if seconds:
+        time.sleep(seconds)
+
+
+def soft_delete_employees(queryset, batch_size=None):
+    """
+    Mark the live employees in ``queryset`` deleted, in batches.
+
+    Their ``version`` is bumped, so pending ``If-Match`` updates fail.
+
+    Returns:
+        int: Employees marked deleted.
+    """
+    batch_size = batch_size or delete_batch_size()
+    deleted = 0
+    for ids in _id_batches(queryset.live(), batch_size):
+        now = timezone.now()
+        with transaction.atomic():
+            deleted += Employee.objects.filter(pk__in=ids).update(
+                deleted_at=now, updated_at=now, version=F('version') + 1
+            )
+            invalidate_all()
+    return deleted
+
+
+def remove_employees(queryset, batch_size=None):
+    """
+    Delete the employees in ``queryset`` the way the API is configured to.
+
+    Returns:
+        dict: ``deleted`` employees, plus ``reviews_deleted`` unless soft-deleting.
+    """
+    if soft_delete_enabled():
+        return {'deleted': soft_delete_employees(queryset, batch_size)}
+    employees, reviews = delete_employees(queryset, batch_size)
+    return {'deleted': employees, 'reviews_deleted': reviews}
+
+
+def purge_employees(older_than, batch_size=None, pause=0):
+    """
+    Hard-delete employees soft-deleted before ``older_than`` (a datetime),
+    and drop tombstones of hard deletes made before it.
+
+    Purged employees get no new tombstone: the change feed already reported
+    their deletion, and refuses cursors older than its retention.
+
+    Returns:
+        tuple: ``(employees deleted, reviews deleted)``.
+    """
+    deleted = delete_employees(
+        Employee.all_objects.filter(deleted_at__lt=older_than), batch_size=batch_size, pause=pause, tombstones=False
+    )
+    EmployeeTombstone.objects.filter(deleted_at__lt=older_than)._raw_delete(router.db_for_write(EmployeeTombstone))
+    return deleted
@@ -0,0 +1,264 @@
+"""
+Streaming bulk export of employees with their review aggregates.
+
+Rows are produced in chunks and encoded as they arrive, so memory stays
+bounded by one chunk whatever the table size. CSV on PostgreSQL with psycopg
+3 is produced by the database itself with ``COPY (SELECT ...) TO STDOUT``;
+otherwise rows are read with ``QuerySet.iterator()`` (a server-side cursor on
+PostgreSQL). Parquet (written one row group per chunk) needs pyarrow.
+Either format can be gzipped on the fly.
+"""
+import csv
+import functools
+import io
+import logging
+import time
+import zlib
+
+from django.db import connections
+from django.db.models import OuterRef, Subquery
+
+from .models import Employee, Review
+
+logger = logging.getLogger(__name__)
+
+EXPORT_COLUMNS = [
+    'id',
+    'first_name',
+    'last_name',
+    'email',
+    'contact_number',
+    'contact_info',
+    'department',
+    'birth_date',
+    'hire_date',
+    'review_count',
+    'avg_rating',
+    'last_review_at',
+]
+EXPORT_FORMATS = ('csv', 'parquet')
+CONTENT_TYPES = {
+    'csv': 'text/csv; charset=utf-8',
+    'parquet': 'application/vnd.apache.parquet',
+}
+
+
+@functools.cache
+def import_pyarrow():
+    """
+    pyarrow with ``pyarrow.parquet`` loaded, or ``None`` if it is not installed.
+
+    pyarrow is optional and only Parquet export needs it, so it is imported on
+    first use rather than with this module: it adds ~40ms to every process start.
+    """
+    try:
+        import pyarrow
+        import pyarrow.parquet  # noqa: F401
+    except ImportError:
+        return None
+    return pyarrow
+
+
+class ExportError(Exception):
+    """
+    The requested export cannot be produced, e.g. Parquet without pyarrow.
+    """
+
+
+class ExportStats:
+    """
+    Rows and bytes produced so far, for throughput reporting.
+    """
+
+    def __init__(self):
+        self.started = time.monotonic()
+        self.rows = 0
+        self.bytes = 0
+
+    @property
+    def seconds(self):
+        return max(time.monotonic() - self.started, 1e-9)
+
+    def __str__(self):
+        return (
+            f'{self.rows} rows, {self.bytes / 1e6:.1f} MB in {self.seconds:.2f}s '
+            f'({self.rows / self.seconds:.0f} rows/s, {self.bytes / 1e6 / self.seconds:.1f} MB/s)'
+        )
+
+
+def export_queryset(queryset=None):
+    """
+    Employee rows with their review aggregates, as ``EXPORT_COLUMNS`` tuples ordered by id.
+
+    ``review_count``/``avg_rating`` are the denormalized stats; ``last_review_at``
+    is read through the ``(employee, created_at, id)`` review index.
+    """
+    queryset = Employee.objects.all() if queryset is None else queryset.prefetch_related(None)
+    last_review = Review.objects.filter(employee=OuterRef('pk')).order_by('-created_at').values('created_at')[:1]
+    return queryset.annotate(last_review_at=Subquery(last_review)).order_by('id').values_list(*EXPORT_COLUMNS)
+
+
+def iter_export(queryset=None, file_format='csv', compress=False, chunk_size=2000, stats=None):
+    """
+    Encode an export incrementally.
+
+    Args:
+        queryset (QuerySet): Employees to export (e.g. filtered); all by default.
+        file_format (str): One of ``EXPORT_FORMATS``.
+        compress (bool): Gzip the output.
+        chunk_size (int): Rows fetched and encoded per step.
+        stats (ExportStats): Updated as rows and bytes are produced.
+
+    Returns:
+        iterator: ``bytes`` pieces of the file.
+
+    Raises:
+        ExportError: If ``file_format`` is unknown or needs a missing library.
+            Raised on the call, before anything is read.
+    """
+    if file_format not in EXPORT_FORMATS:
+        raise ExportError(f"Unknown export format {file_format!r}; expected one of {', '.join(EXPORT_FORMATS)}.")
+    if file_format == 'parquet' and import_pyarrow() is None:
+        raise ExportError('Parquet export requires pyarrow (pip install pyarrow).')
+
+    stats = stats or ExportStats()
+    queryset = export_queryset(queryset)
+    if file_format == 'csv':
+        chunks = _csv_chunks(queryset, chunk_size, stats)
+    else:
+        chunks = _parquet(_row_chunks(queryset, chunk_size, stats))
+    if compress:
+        chunks = _gzip(chunks)
+    return _counted(chunks, stats)
+
+
+def logged(chunks, stats, label):
+    """
+    Pass ``chunks`` through, logging the throughput in ``stats`` once exhausted.
+    """
+    yield from chunks
+    logger.info('Exported %s: %s', label, stats)
+
+
+def _counted(chunks, stats):
+    for chunk in chunks:
+        if chunk:
+            stats.bytes += len(chunk)
+            yield chunk
+
+
+def _row_chunks(queryset, chunk_size, stats):
+    chunk = []
+    for row in queryset.iterator(chunk_size=chunk_size):
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            stats.rows += len(chunk)
+            yield chunk
+            chunk = []
+    if chunk:
+        stats.rows += len(chunk)
+        yield chunk
+
+
+def _csv(row_chunks):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_COLUMNS)
+    for rows in row_chunks:
+        writer.writerows(rows)
+        yield buffer.getvalue().encode('utf-8')
+        buffer.seek(0)
+        buffer.truncate()
+    yield buffer.getvalue().encode('utf-8')
+
+
+def _csv_chunks(queryset, chunk_size, stats):
+    connection = connections[queryset.db]
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            # psycopg 3 streams COPY output; psycopg2's copy_expert() only writes to a file.
+            if hasattr(cursor.cursor, 'copy'):
+                yield from _copy_csv(connection, cursor, queryset, stats)
+                return
+    yield from _csv(_row_chunks(queryset, chunk_size, stats))
+
+
+def _copy_csv(connection, cursor, queryset, stats):
+    """
+    CSV straight from PostgreSQL's ``COPY ... TO STDOUT``.
+
+    Values use PostgreSQL's text formats, e.g. ``2024-01-31 09:30:00+00``
+    for ``last_review_at``.
+    """
+    sql, params = queryset.query.get_compiler(connection=connection).as_sql()
+    yield (','.join(EXPORT_COLUMNS) + '\r\n').encode('utf-8')
+    raw = cursor.cursor
+    with raw.copy(f'COPY ({sql}) TO STDOUT WITH (FORMAT csv)', params) as copy:
+        for data in copy:
+            yield bytes(data)
+    stats.rows += max(raw.rowcount, 0)
+
+
+class _Sink:
+    """
+    Write-only file object collecting what pyarrow writes until drained.
+    """
+
+    closed = False
+
+    def __init__(self):
+        self.parts = []
+
+    def write(self, data):
+        self.parts.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data, self.parts = b''.join(self.parts), []
+        return data
+
+
+def _parquet_schema():
+    pyarrow = import_pyarrow()
+    return pyarrow.schema([
+        ('id', pyarrow.int64()),
+        ('first_name', pyarrow.string()),
+        ('last_name', pyarrow.string()),
+        ('email', pyarrow.string()),
+        ('contact_number', pyarrow.string()),
+        ('contact_info', pyarrow.string()),
+        ('department', pyarrow.string()),
+        ('birth_date', pyarrow.date32()),
+        ('hire_date', pyarrow.date32()),
+        ('review_count', pyarrow.int64()),
+        ('avg_rating', pyarrow.float64()),
+        ('last_review_at', pyarrow.timestamp('us', tz='UTC')),
+    ])
+
+
+def _parquet(row_chunks):
+    pyarrow = import_pyarrow()
+    schema = _parquet_schema()
+    sink = _Sink()
+    writer = pyarrow.parquet.ParquetWriter(sink, schema, compression='snappy')
+    try:
+        for rows in row_chunks:
+            columns = list(zip(*rows))
+            writer.write_table(pyarrow.Table.from_arrays(
+                [pyarrow.array(column, type=field.type) for column, field in zip(columns, schema)],
+                schema=schema,
+            ))
+            yield sink.drain()
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+def _gzip(chunks):
+    compressor = zlib.compressobj(wbits=31)  # 31: gzip container
+    for chunk in chunks:
+        yield compressor.compress(chunk)
+    yield compressor.flush()
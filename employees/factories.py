@@ -0,0 +1,61 @@
+import datetime
+
+from .cache import invalidate_all
+from .models import Employee, Review
+
+DEPARTMENTS = ['Engineering', 'Sales', 'Marketing', 'HR', 'Finance', 'Support']
+
+
+def build_employee(i):
+    """
+    Return an unsaved, deterministic ``Employee`` for sequence number ``i``.
+    """
+    return Employee(
+        first_name=f"First{i}",
+        last_name=f"Last{i}",
+        email=f"employee{i}@example.com",
+        contact_number="5550000000",
+        contact_info=f"{i} Test St",
+        department=DEPARTMENTS[i % len(DEPARTMENTS)],
+        birth_date=datetime.date(1970, 1, 1) + datetime.timedelta(days=i % 12000),
+        hire_date=datetime.date(2000, 1, 1) + datetime.timedelta(days=i % 9000),
+    )
+
+
+def seed_employees(count, reviews_per_employee=0, start=0, batch_size=5000):
+    """
+    Bulk-insert ``count`` employees, each with ``reviews_per_employee`` reviews.
+
+    Rows are written with ``bulk_create`` in batches of ``batch_size`` so that
+    seeding 100k+ employees for benchmarks takes seconds, not minutes.
+
+    Args:
+        count (int): Number of employees to create.
+        reviews_per_employee (int): Reviews created for every employee.
+        start (int): First sequence number, to keep emails unique across calls.
+        batch_size (int): Rows per INSERT.
+
+    Returns:
+        list: The created employees, with primary keys set.
+    """
+    ratings = [(n % 5) + 1 for n in range(reviews_per_employee)]
+    employees = []
+    for offset in range(start, start + count, batch_size):
+        batch = [build_employee(i) for i in range(offset, min(offset + batch_size, start + count))]
+        for employee in batch:
+            # bulk_create skips the review signals, so fill the stats in up front.
+            employee.review_count = len(ratings)
+            employee.rating_total = sum(ratings)
+            employee.avg_rating = sum(ratings) / len(ratings) if ratings else None
+        Employee.objects.bulk_create(batch)
+        Review.objects.bulk_create(
+            [
+                Review(employee=employee, rating=rating, comments=f"Review {n}")
+                for employee in batch
+                for n, rating in enumerate(ratings)
+            ],
+            batch_size=batch_size,
+        )
+        employees += batch
+    invalidate_all()
+    return employees
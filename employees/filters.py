@@ -0,0 +1,42 @@
+from django.core.exceptions import ValidationError as DjangoValidationError
+from rest_framework import filters
+from rest_framework.exceptions import ValidationError
+
+
+class QueryParameterFilter(filters.BaseFilterBackend):
+    """
+    Filters declared on the view as ``filter_params``.
+
+    ``filter_params`` maps a query parameter to an ORM lookup, e.g.
+    ``{'hire_date_after': 'hire_date__gte'}``. Values are converted with the
+    model field's ``to_python`` so a malformed value is a 400, not a 500.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        lookups = {}
+        errors = {}
+        for param, lookup in getattr(view, 'filter_params', {}).items():
+            value = request.query_params.get(param)
+            if value in (None, ''):
+                continue
+            field = queryset.model._meta.get_field(lookup.split('__')[0])
+            try:
+                lookups[lookup] = field.to_python(value)
+            except DjangoValidationError as exc:
+                errors[param] = exc.messages
+        if errors:
+            raise ValidationError(errors)
+        return queryset.filter(**lookups)
+
+
+class OrderingFilter(filters.OrderingFilter):
+    """
+    DRF's ``?ordering=`` filter with the primary key appended as a tie-breaker,
+    so orderings on non-unique columns are still total and stable.
+    """
+
+    def get_ordering(self, request, queryset, view):
+        ordering = super().get_ordering(request, queryset, view)
+        if ordering and not {'id', '-id', 'pk', '-pk'} & set(ordering):
+            ordering = [*ordering, '-id' if ordering[-1].startswith('-') else 'id']
+        return ordering
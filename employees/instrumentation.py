@@ -0,0 +1,169 @@
+"""
+Per-request SQL and timing instrumentation.
+
+``employees.middleware.RequestMetricsMiddleware`` opens a ``RequestStats`` for
+every request; the execute wrapper installed on each database connection (see
+``employees.signals``) adds every statement's time and shape to it, including
+statements run in ``sync_to_async`` threads under ASGI. When the response
+leaves, the request is folded into this process's per-route metrics, served
+by ``/metrics/requests/``.
+"""
+import logging
+import os
+import re
+import statistics
+import threading
+import time
+from collections import Counter, deque
+from contextvars import ContextVar
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+current_request = ContextVar('current_request', default=None)
+
+# Runs of placeholders in IN (...) and VALUES lists vary with the number of
+# rows, not with the query, so they are collapsed when comparing shapes.
+PLACEHOLDER_LIST = re.compile(r'%s(?:\s*,\s*%s)+')
+
+
+def sql_shape(sql):
+    """
+    ``sql`` with its placeholder lists collapsed, e.g. ``IN (%s, %s)`` to ``IN (%s...)``.
+    """
+    return PLACEHOLDER_LIST.sub('%s...', sql)
+
+
+class RequestStats:
+    """
+    Wall time, SQL count, DB time and statement shapes of one request.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.shapes = Counter()
+
+    def record_query(self, sql, seconds):
+        self.queries += 1
+        self.db_seconds += seconds
+        self.shapes[sql_shape(sql)] += 1
+
+    def repeated_shapes(self, threshold):
+        """
+        Statement shapes run at least ``threshold`` times: likely N+1 queries.
+        """
+        return {shape: count for shape, count in self.shapes.items() if count >= threshold}
+
+
+def record_query(execute, sql, params, many, context):
+    """
+    Execute wrapper timing each statement into the current request's stats.
+    """
+    stats = current_request.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    began = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.record_query(sql, time.perf_counter() - began)
+
+
+def install(connection):
+    """
+    Wrap every statement ``connection`` executes with ``record_query``; idempotent.
+    """
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+def n_plus_one_threshold():
+    return getattr(settings, 'N_PLUS_ONE_THRESHOLD', 5)
+
+
+class RouteMetrics:
+    """
+    Per-route request metrics of this process.
+
+    Keeps counters since start-up and the last ``samples`` timings per route,
+    from which percentiles are computed.
+    """
+
+    def __init__(self, samples=1000):
+        self.samples = samples
+        self.routes = {}
+        self.lock = threading.Lock()
+
+    def record(self, route, wall_seconds, stats, n_plus_one):
+        with self.lock:
+            metrics = self.routes.get(route)
+            if metrics is None:
+                metrics = self.routes[route] = {
+                    'count': 0,
+                    'n_plus_one': 0,
+                    'wall_ms': deque(maxlen=self.samples),
+                    'db_ms': deque(maxlen=self.samples),
+                    'queries': deque(maxlen=self.samples),
+                }
+            metrics['count'] += 1
+            metrics['n_plus_one'] += bool(n_plus_one)
+            metrics['wall_ms'].append(wall_seconds * 1000)
+            metrics['db_ms'].append(stats.db_seconds * 1000)
+            metrics['queries'].append(stats.queries)
+
+    def snapshot(self):
+        """
+        Returns:
+            dict: Per route (``"GET employee-list"``): requests and N+1-flagged
+            requests since start-up, and wall time, DB time and query count
+            percentiles over the retained samples.
+        """
+        with self.lock:
+            routes = {route: {key: list(value) if isinstance(value, deque) else value
+                              for key, value in metrics.items()}
+                      for route, metrics in self.routes.items()}
+        return {
+            'pid': os.getpid(),
+            'samples': self.samples,
+            'routes': {
+                route: {
+                    'count': metrics['count'],
+                    'n_plus_one': metrics['n_plus_one'],
+                    'wall_ms': percentiles(metrics['wall_ms']),
+                    'db_ms': percentiles(metrics['db_ms']),
+                    'queries': {**percentiles(metrics['queries']), 'max': max(metrics['queries'])},
+                }
+                for route, metrics in sorted(routes.items())
+            },
+        }
+
+    def reset(self):
+        with self.lock:
+            self.routes.clear()
+
+
+def percentiles(values):
+    cuts = statistics.quantiles(values, n=100, method='inclusive') if len(values) > 1 else values * 99
+    return {'p50': round(cuts[49], 3), 'p95': round(cuts[94], 3), 'p99': round(cuts[98], 3)}
+
+
+route_metrics = RouteMetrics(getattr(settings, 'REQUEST_METRICS_SAMPLES', 1000))
+
+
+def server_timing(wall_seconds, stats):
+    """
+    The ``Server-Timing`` header value for a request.
+    """
+    return (
+        f'total;dur={wall_seconds * 1000:.1f}, '
+        f'db;dur={stats.db_seconds * 1000:.1f};desc="{stats.queries} queries", '
+        f'app;dur={(wall_seconds - stats.db_seconds) * 1000:.1f}'
+    )
+
+
+def log_n_plus_one(request, route, repeated):
+    for shape, count in sorted(repeated.items(), key=lambda item: -item[1]):
+        logger.warning('Possible N+1 on %s %s (%s): %d x %s', request.method, request.path, route, count, shape)
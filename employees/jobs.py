@@ -0,0 +1,308 @@
+"""
+Database-backed background jobs.
+
+The API enqueues a ``Job`` row and returns at once; ``manage.py run_workers``
+claims queued jobs and runs them on a thread pool, recording progress and
+the result on the row for clients to poll. No broker is needed: the job
+table is the queue.
+
+A worker claims a job in one short transaction: it counts running jobs per
+kind, picks the oldest queued job of a kind below its concurrency limit and
+marks it running with a conditional ``UPDATE``. On PostgreSQL a
+transaction-level advisory lock serializes claims so limits hold across
+worker processes; SQLite serializes writers by itself.
+
+Job types are registered with :func:`job_type`. A handler receives the job
+and a progress callback and returns the JSON result.
+"""
+import io
+import logging
+import os
+import socket
+import threading
+import time
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management import call_command
+from django.db import OperationalError, connection, connections, transaction
+from django.db.models import Count
+from django.utils import timezone
+
+from .export import ExportStats, iter_export
+from .models import Employee, Job
+from .serializers import (
+    DedupeJobParamsSerializer, ExportJobParamsSerializer, ImportJobParamsSerializer, PurgeJobParamsSerializer,
+)
+
+logger = logging.getLogger(__name__)
+
+# Arbitrary key of the PostgreSQL advisory lock taken while claiming a job.
+CLAIM_LOCK_KEY = 0x6A6F6273
+
+JOB_TYPES = {}
+
+
+class JobType:
+    """
+    A registered kind of job.
+
+    Attributes:
+        name (str): Stored in ``Job.kind``.
+        handler (callable): ``handler(job, progress) -> dict``.
+        params_serializer (type): Validates ``Job.params`` on enqueue.
+        concurrency (int): Default limit of jobs of this kind running at once,
+            across all workers; ``settings.JOB_CONCURRENCY`` overrides it.
+    """
+
+    def __init__(self, name, handler, params_serializer, concurrency):
+        self.name = name
+        self.handler = handler
+        self.params_serializer = params_serializer
+        self.concurrency = concurrency
+
+    @property
+    def limit(self):
+        return getattr(settings, 'JOB_CONCURRENCY', {}).get(self.name, self.concurrency)
+
+
+def job_type(name, params_serializer, concurrency=1):
+    """
+    Register the decorated function as the handler of job kind ``name``.
+    """
+    def register(handler):
+        JOB_TYPES[name] = JobType(name, handler, params_serializer, concurrency)
+        return handler
+    return register
+
+
+def enqueue(kind, params=None):
+    """
+    Queue a job.
+
+    Raises:
+        KeyError: If ``kind`` is not registered.
+        ValidationError: If ``params`` are invalid for the job type.
+    """
+    serializer = JOB_TYPES[kind].params_serializer(data=params or {})
+    serializer.is_valid(raise_exception=True)
+    return Job.objects.create(kind=kind, params=serializer.data)
+
+
+def job_files_dir():
+    """
+    Directory holding job inputs (uploads) and outputs (exports); created on demand.
+    """
+    path = str(settings.JOB_FILES_DIR)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def job_file_path(name):
+    return os.path.join(job_files_dir(), name)
+
+
+def worker_name(index=0):
+    return f'{socket.gethostname()}:{os.getpid()}:{index}'
+
+
+def claim(worker, kinds=None):
+    """
+    Take the oldest queued job whose kind has a free slot, or return ``None``.
+
+    Args:
+        worker (str): Recorded on the job.
+        kinds (iterable): Only claim these kinds; all registered kinds by default.
+    """
+    kinds = set(JOB_TYPES) if kinds is None else set(kinds) & set(JOB_TYPES)
+    try:
+        with transaction.atomic():
+            if connection.vendor == 'postgresql':
+                with connection.cursor() as cursor:
+                    cursor.execute('SELECT pg_advisory_xact_lock(%s)', [CLAIM_LOCK_KEY])
+            running = dict(
+                Job.objects.filter(status=Job.RUNNING, kind__in=kinds)
+                .values('kind').annotate(count=Count('id')).values_list('kind', 'count')
+            )
+            open_kinds = [kind for kind in kinds if running.get(kind, 0) < JOB_TYPES[kind].limit]
+            job = Job.objects.filter(status=Job.QUEUED, kind__in=open_kinds).order_by('id').first()
+            if job is None:
+                return None
+            now = timezone.now()
+            claimed = Job.objects.filter(pk=job.pk, status=Job.QUEUED).update(
+                status=Job.RUNNING, worker=worker, started_at=now, heartbeat_at=now, attempts=job.attempts + 1,
+            )
+    except OperationalError:
+        # SQLite: another worker holds the write lock; try again on the next poll.
+        return None
+    if not claimed:
+        return None
+    job.refresh_from_db()
+    return job
+
+
+def pending(kinds=None):
+    """
+    Whether jobs of ``kinds`` (all by default) are waiting, including ones held back by their limit.
+    """
+    queued = Job.objects.filter(status=Job.QUEUED)
+    return (queued if kinds is None else queued.filter(kind__in=kinds)).exists()
+
+
+class Progress:
+    """
+    The progress callback handed to job handlers.
+
+    Calls are cheap: the row is written at most once per ``interval`` seconds,
+    which also serves as the job's heartbeat. A write that fails on a locked
+    database is skipped rather than failing the job.
+    """
+
+    def __init__(self, job, interval=1.0):
+        self.job = job
+        self.interval = interval
+        self.written = 0.0
+
+    def __call__(self, done, total=None, force=False):
+        self.job.progress_done = done
+        self.job.progress_total = total
+        if force or time.monotonic() - self.written >= self.interval:
+            self.written = time.monotonic()
+            try:
+                Job.objects.filter(pk=self.job.pk).update(
+                    progress_done=done, progress_total=total, heartbeat_at=timezone.now()
+                )
+            except OperationalError:
+                # SQLite: another job is reading while this one holds a read
+                # cursor open; progress is advisory, so skip this write.
+                logger.debug('Skipped a progress update of job %s', self.job, exc_info=True)
+
+
+class Heartbeat(threading.Thread):
+    """
+    Refreshes ``heartbeat_at`` of a running job every ``interval`` seconds, so
+    handlers that never report progress are not mistaken for dead ones.
+    """
+
+    def __init__(self, job_id, interval):
+        super().__init__(daemon=True)
+        self.job_id = job_id
+        self.interval = interval
+        self.stopped = threading.Event()
+
+    def run(self):
+        try:
+            while not self.stopped.wait(self.interval):
+                try:
+                    Job.objects.filter(pk=self.job_id, status=Job.RUNNING).update(heartbeat_at=timezone.now())
+                except OperationalError:
+                    logger.debug('Skipped a heartbeat of job %s', self.job_id, exc_info=True)
+        finally:
+            connections.close_all()
+
+    def stop(self):
+        self.stopped.set()
+
+
+def run_job(job):
+    """
+    Run a claimed job to completion and record its outcome.
+
+    Returns:
+        Job: The job, ``succeeded`` or ``failed``.
+    """
+    heartbeat = Heartbeat(job.pk, getattr(settings, 'JOB_HEARTBEAT_SECONDS', 10))
+    heartbeat.start()
+    began = time.monotonic()
+    try:
+        result = JOB_TYPES[job.kind].handler(job, Progress(job))
+    except Exception as exc:
+        logger.exception('Job %s failed', job)
+        job.status, job.error = Job.FAILED, ''.join(traceback.format_exception_only(exc)).strip()
+    else:
+        job.status, job.result = Job.SUCCEEDED, result
+    finally:
+        heartbeat.stop()
+    job.finished_at = timezone.now()
+    Job.objects.filter(pk=job.pk).update(
+        status=job.status, result=job.result, error=job.error, finished_at=job.finished_at,
+        progress_done=job.progress_done, progress_total=job.progress_total,
+    )
+    logger.info('Job %s finished in %.2fs', job, time.monotonic() - began)
+    return job
+
+
+def requeue_stale():
+    """
+    Return running jobs whose worker stopped heartbeating to the queue, or
+    fail them once they have used ``JOB_MAX_ATTEMPTS``.
+
+    Returns:
+        tuple: ``(requeued, failed)``.
+    """
+    cutoff = timezone.now() - timedelta(seconds=getattr(settings, 'JOB_STALE_SECONDS', 60))
+    stale = Job.objects.filter(status=Job.RUNNING, heartbeat_at__lt=cutoff)
+    max_attempts = getattr(settings, 'JOB_MAX_ATTEMPTS', 3)
+    failed = stale.filter(attempts__gte=max_attempts).update(
+        status=Job.FAILED, error='The worker running this job stopped responding.', finished_at=timezone.now(),
+    )
+    requeued = stale.filter(attempts__lt=max_attempts).update(status=Job.QUEUED, worker='')
+    return requeued, failed
+
+
+def run_command(name, *args, **options):
+    """
+    ``call_command`` with its output captured, for job handlers.
+    """
+    out, err = io.StringIO(), io.StringIO()
+    call_command(name, *args, stdout=out, stderr=err, **options)
+    return '\n'.join(filter(None, (out.getvalue().strip(), err.getvalue().strip())))
+
+
+@job_type('export_employees', ExportJobParamsSerializer, concurrency=2)
+def export_employees(job, progress):
+    params = job.params
+    queryset = Employee.objects.all()
+    if params.get('department'):
+        queryset = queryset.filter(department=params['department'])
+    total = queryset.count()
+    name = f"job-{job.pk}-employees.{params['file_format']}{'.gz' if params['gzip'] else ''}"
+    stats = ExportStats()
+    with open(job_file_path(name), 'wb') as handle:
+        for chunk in iter_export(queryset, params['file_format'], params['gzip'], stats=stats):
+            handle.write(chunk)
+            progress(stats.rows, total)
+    progress(stats.rows, total, force=True)
+    return {'file': name, 'rows': stats.rows, 'bytes': stats.bytes, 'seconds': round(stats.seconds, 3)}
+
+
+@job_type('import_employees', ImportJobParamsSerializer, concurrency=1)
+def import_employees(job, progress):
+    params = job.params
+    rejects = f'job-{job.pk}-rejects.ndjson'
+    try:
+        output = run_command(
+            'import_employees', job_file_path(params['file']), format=params['file_format'],
+            rejects=job_file_path(rejects),
+        )
+    finally:
+        # The upload is only needed by this job, whatever its outcome.
+        try:
+            os.remove(job_file_path(params['file']))
+        except FileNotFoundError:
+            pass
+    if not os.path.getsize(job_file_path(rejects)):
+        os.remove(job_file_path(rejects))
+        rejects = None
+    return {'output': output, 'file': rejects}
+
+
+@job_type('dedupe_employees', DedupeJobParamsSerializer, concurrency=1)
+def dedupe_employees(job, progress):
+    return {'output': run_command('dedupe_employees', **job.params)}
+
+
+@job_type('purge_employees', PurgeJobParamsSerializer, concurrency=1)
+def purge_employees(job, progress):
+    return {'output': run_command('purge_employees', **job.params)}
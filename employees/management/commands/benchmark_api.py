@@ -0,0 +1,307 @@
+import json
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from employees import urls as employee_urls
+from employees.cache import get_cache
+from employees.factories import seed_employees
+from employees.jobs import enqueue, run_job
+from employees.models import Review
+
+
+class Scenario:
+    """
+    How to exercise one (route, method) pair.
+
+    ``build(run, i)`` returns ``(url, data)`` for the ``i``-th request.
+    Scenarios that delete rows take them from the end of the seeded data so
+    reads, which walk from the start, never hit a deleted row.
+    """
+
+    def __init__(self, build, destructive=False):
+        self.build = build
+        self.destructive = destructive
+
+
+def employee_payload(run, i):
+    return {
+        'first_name': f'Bench{i}',
+        'last_name': 'Mark',
+        'email': f'bench-{run.token}-{i}@example.com',
+        'contact_number': '5550000000',
+        'contact_info': f'{i} Bench St',
+        'department': 'Engineering',
+        'birth_date': '1990-01-01',
+        'hire_date': '2020-01-01',
+    }
+
+
+SCENARIOS = {
+    ('employee-list', 'get'): Scenario(lambda run, i: (reverse('employee-list'), {'page_size': 100})),
+    ('employee-retrieve', 'get'): Scenario(
+        lambda run, i: (reverse('employee-retrieve', kwargs={'identifier': run.employee(i)}), None)
+    ),
+    ('employee-create', 'post'): Scenario(lambda run, i: (reverse('employee-create'), employee_payload(run, i))),
+    ('employee-bulk', 'post'): Scenario(
+        lambda run, i: (reverse('employee-bulk'), [employee_payload(run, f'bulk-{i}-{n}') for n in range(100)])
+    ),
+    ('employee-changes', 'get'): Scenario(lambda run, i: (reverse('employee-changes'), {'page_size': 100})),
+    ('employee-search', 'get'): Scenario(
+        lambda run, i: (reverse('employee-search'), {'q': f'first{run.employee(i) % 97} last'})
+    ),
+    ('employee-export', 'get'): Scenario(
+        lambda run, i: (reverse('employee-export'), {'department': 'HR', 'gzip': 1})
+    ),
+    ('employee-update', 'put'): Scenario(
+        lambda run, i: (
+            reverse('employee-update', kwargs={'identifier': run.employee(i)}),
+            {**employee_payload(run, f'put-{i}'), 'department': 'HR'},
+        )
+    ),
+    ('employee-update', 'patch'): Scenario(
+        lambda run, i: (reverse('employee-update', kwargs={'identifier': run.employee(i)}), {'department': 'Sales'})
+    ),
+    ('employee-delete', 'delete'): Scenario(
+        lambda run, i: (reverse('employee-delete', kwargs={'identifier': run.employee(-1 - i)}), None),
+        destructive=True,
+    ),
+    ('employee-bulk-delete', 'post'): Scenario(
+        # The middle third of the employees: reads use the first rows, employee-delete the last.
+        lambda run, i: (reverse('employee-bulk-delete'), {'ids': [run.employee(len(run.employee_ids) // 3 + i)]}),
+        destructive=True,
+    ),
+    ('review-list', 'get'): Scenario(
+        lambda run, i: (reverse('review-list'), {'employee': run.employee(i)})
+    ),
+    ('review-list', 'post'): Scenario(
+        lambda run, i: (reverse('review-list'), {'employee': run.employee(i), 'rating': 4, 'comments': 'Benchmark'})
+    ),
+    ('review-bulk', 'post'): Scenario(
+        lambda run, i: (
+            reverse('review-bulk'),
+            [{'employee': run.employee(i * 100 + n), 'rating': 1 + n % 5, 'comments': 'Benchmark'} for n in range(100)],
+        )
+    ),
+    ('employee-reviews', 'get'): Scenario(
+        lambda run, i: (reverse('employee-reviews', kwargs={'employee_pk': run.employee(i)}), {'page_size': 20})
+    ),
+    ('review-detail', 'get'): Scenario(lambda run, i: (reverse('review-detail', kwargs={'pk': run.review(i)}), None)),
+    ('review-detail', 'put'): Scenario(
+        lambda run, i: (
+            reverse('review-detail', kwargs={'pk': run.review(i)}),
+            {'employee': run.employee(i), 'rating': 3, 'comments': 'Benchmark'},
+        )
+    ),
+    ('review-detail', 'patch'): Scenario(
+        lambda run, i: (reverse('review-detail', kwargs={'pk': run.review(i)}), {'rating': 5})
+    ),
+    ('review-detail', 'delete'): Scenario(
+        lambda run, i: (reverse('review-detail', kwargs={'pk': run.review(-1 - i)}), None),
+        destructive=True,
+    ),
+    ('review-summary-employees', 'get'): Scenario(
+        lambda run, i: (reverse('review-summary-employees'), {'page_size': 100})
+    ),
+    ('review-summary-departments', 'get'): Scenario(lambda run, i: (reverse('review-summary-departments'), None)),
+    ('job-list', 'get'): Scenario(lambda run, i: (reverse('job-list'), None)),
+    ('job-list', 'post'): Scenario(
+        lambda run, i: (reverse('job-list'), {'kind': 'export_employees', 'params': {'department': 'HR'}})
+    ),
+    ('job-import', 'post'): Scenario(
+        lambda run, i: (reverse('job-import'), [employee_payload(run, f'job-{i}-{n}') for n in range(100)])
+    ),
+    ('job-detail', 'get'): Scenario(lambda run, i: (reverse('job-detail', kwargs={'pk': run.finished_job().pk}), None)),
+    ('job-download', 'get'): Scenario(
+        lambda run, i: (reverse('job-download', kwargs={'pk': run.finished_job().pk}), None)
+    ),
+    ('metrics-database', 'get'): Scenario(lambda run, i: (reverse('metrics-database'), None)),
+    ('metrics-requests', 'get'): Scenario(lambda run, i: (reverse('metrics-requests'), None)),
+}
+
+
+def routes():
+    """
+    Every ``(url name, method)`` served by ``employees/urls.py``.
+
+    ``head`` is skipped: DRF adds it to a GET route's actions on first use.
+    """
+    return [
+        (pattern.name, method)
+        for pattern in employee_urls.urlpatterns
+        for method in getattr(pattern.callback, 'actions', {})
+        if method != 'head'
+    ]
+
+
+def summarize(timings):
+    cuts = statistics.quantiles(timings, n=100) if len(timings) > 1 else timings * 99
+    return {
+        'mean_ms': round(statistics.fmean(timings), 3),
+        'p50_ms': round(cuts[49], 3),
+        'p95_ms': round(cuts[94], 3),
+        'p99_ms': round(cuts[98], 3),
+    }
+
+
+def client_host():
+    # An explicit host from ALLOWED_HOSTS; with none, DEBUG allows localhost.
+    hosts = [host for host in settings.ALLOWED_HOSTS if host != '*' and not host.startswith('.')]
+    return hosts[0] if hosts else 'localhost'
+
+
+class BenchmarkRun:
+    def __init__(self, employee_ids, review_ids):
+        self.token = uuid.uuid4().hex[:8]
+        self.employee_ids = employee_ids
+        self.review_ids = review_ids
+        self.job = None
+
+    def employee(self, i):
+        return self.employee_ids[i % len(self.employee_ids)] if i >= 0 else self.employee_ids[i]
+
+    def review(self, i):
+        return self.review_ids[i % len(self.review_ids)] if i >= 0 else self.review_ids[i]
+
+    def finished_job(self):
+        """
+        A succeeded export job, run in-process on first use.
+        """
+        if self.job is None:
+            self.job = run_job(enqueue('export_employees', {'department': 'HR'}))
+        return self.job
+
+
+class Command(BaseCommand):
+    help = (
+        'Seed a configurable volume of employees and reviews, call every route in employees/urls.py, '
+        'and report latency percentiles and SQL query counts as JSON. Everything runs in one '
+        'transaction that is rolled back. Use --compare to diff against an earlier report.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--employees', type=int, default=1000, help='Employees to seed.')
+        parser.add_argument('--reviews-per-employee', type=int, default=3, help='Reviews seeded per employee.')
+        parser.add_argument('--requests', type=int, default=50, help='Requests per route and method.')
+        parser.add_argument(
+            '--cache', choices=['cold', 'warm'], default='cold',
+            help='Clear the response cache before every request (cold) or only once (warm).',
+        )
+        parser.add_argument('--output', help='Write the JSON report here instead of stdout.')
+        parser.add_argument('--compare', help='Earlier JSON report to compare against.')
+        parser.add_argument(
+            '--max-regression', type=float, default=0.25,
+            help='With --compare, fail if a p95 grows by more than this fraction.',
+        )
+
+    def handle(self, *args, **options):
+        missing = [route for route in routes() if route not in SCENARIOS]
+        if missing:
+            raise CommandError(f'No benchmark scenario for: {missing}')
+        if options['requests'] * 3 > options['employees']:
+            raise CommandError('--employees must be at least three times --requests so deletes never reach read rows.')
+        if options['reviews_per_employee'] < 1:
+            raise CommandError('--reviews-per-employee must be at least 1 to exercise the review routes.')
+
+        with transaction.atomic():
+            self.stderr.write(f"Seeding {options['employees']} employees...")
+            employees = seed_employees(
+                options['employees'], options['reviews_per_employee'], start=int(time.time())
+            )
+            run = BenchmarkRun(
+                [employee.pk for employee in employees],
+                list(Review.objects.filter(employee__in=employees[:1000]).values_list('pk', flat=True)),
+            )
+            # One client calling every route back to back would be throttled, and
+            # job files would outlive the rolled-back job rows.
+            with tempfile.TemporaryDirectory() as job_files, override_settings(
+                THROTTLE_RATE='', THROTTLE_ROUTE_RATES={}, ADMISSION_MAX_HEAVY=0, JOB_FILES_DIR=job_files,
+            ):
+                results = self.measure(run, options)
+            transaction.set_rollback(True)
+
+        report = {
+            'meta': {
+                'created_at': timezone.now().isoformat(),
+                'vendor': connection.vendor,
+                'django': django.get_version(),
+                'python': platform.python_version(),
+                'employees': options['employees'],
+                'reviews_per_employee': options['reviews_per_employee'],
+                'requests': options['requests'],
+                'cache': options['cache'],
+            },
+            'routes': results,
+        }
+        output = json.dumps(report, indent=2, sort_keys=True)
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as handle:
+                handle.write(output + '\n')
+        else:
+            self.stdout.write(output)
+
+        if options['compare']:
+            with open(options['compare'], encoding='utf-8') as handle:
+                baseline = json.load(handle)
+            if not self.compare(baseline['routes'], results, options['max_regression']):
+                sys.exit(1)
+
+    def measure(self, run, options):
+        client = APIClient(HTTP_HOST=client_host())
+        cache = get_cache()
+        ordered = sorted(routes(), key=lambda route: SCENARIOS[route].destructive)
+        results = {}
+        for name, method in ordered:
+            scenario = SCENARIOS[(name, method)]
+            cache.clear()
+            timings, queries, statuses = [], [], set()
+            for i in range(options['requests']):
+                url, data = scenario.build(run, i)
+                if options['cache'] == 'cold':
+                    cache.clear()
+                kwargs = {} if method == 'get' else {'format': 'json'}
+                with CaptureQueriesContext(connection) as ctx:
+                    began = time.perf_counter()
+                    response = getattr(client, method)(url, data, **kwargs)
+                    if response.streaming:
+                        b''.join(response.streaming_content)
+                    timings.append((time.perf_counter() - began) * 1000)
+                queries.append(len(ctx.captured_queries))
+                statuses.add(response.status_code)
+            results[f'{method.upper()} {name}'] = {
+                **summarize(timings),
+                'queries_min': min(queries),
+                'queries_max': max(queries),
+                'statuses': sorted(statuses),
+            }
+            self.stderr.write(f"{method.upper():>6} {name}: p95={results[f'{method.upper()} {name}']['p95_ms']}ms")
+        return results
+
+    def compare(self, baseline, current, max_regression):
+        ok = True
+        for route, now in sorted(current.items()):
+            before = baseline.get(route)
+            if before is None:
+                self.stderr.write(f'NEW   {route}')
+                continue
+            problems = []
+            if now['queries_max'] > before['queries_max']:
+                problems.append(f"queries {before['queries_max']} -> {now['queries_max']}")
+            if before['p95_ms'] and now['p95_ms'] > before['p95_ms'] * (1 + max_regression):
+                problems.append(f"p95 {before['p95_ms']}ms -> {now['p95_ms']}ms")
+            if problems:
+                ok = False
+                self.stderr.write(f"WORSE {route}: {'; '.join(problems)}")
+        return ok
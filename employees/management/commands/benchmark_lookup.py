@@ -0,0 +1,55 @@
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Max
+
+from employees.factories import seed_employees
+from employees.models import Employee
+
+
+class Command(BaseCommand):
+    help = (
+        'Time Employee.objects.by_identifier() for IDs, first names and last names '
+        'at a given table size. Seeded rows are rolled back unless --keep is given.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--employees', type=int, default=100000, help='Table size to benchmark at.')
+        parser.add_argument('--lookups', type=int, default=500, help='Lookups timed per identifier kind.')
+        parser.add_argument('--keep', action='store_true', help='Commit the seeded rows instead of rolling back.')
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            existing = Employee.objects.count()
+            if existing < options['employees']:
+                start = (Employee.objects.aggregate(Max('id'))['id__max'] or 0) + 1
+                self.stdout.write(f"Seeding {options['employees'] - existing} employees...")
+                seed_employees(options['employees'] - existing, start=start)
+            if connection.vendor == 'postgresql':
+                with connection.cursor() as cursor:
+                    cursor.execute('ANALYZE employees_employee')
+
+            sample = random.sample(
+                list(Employee.objects.values_list('id', 'first_name', 'last_name')),
+                min(options['lookups'], options['employees']),
+            )
+            self.stdout.write(f"{Employee.objects.count()} employees, {len(sample)} lookups per kind")
+            for label, column in (('id', 0), ('first_name', 1), ('last_name', 2)):
+                timings = []
+                for row in sample:
+                    began = time.perf_counter()
+                    Employee.objects.by_identifier(str(row[column])).first()
+                    timings.append((time.perf_counter() - began) * 1000)
+                cuts = statistics.quantiles(timings, n=100)
+                self.stdout.write(
+                    f"{label:>10}: p50={cuts[49]:.3f}ms p95={cuts[94]:.3f}ms p99={cuts[98]:.3f}ms"
+                )
+
+            self.stdout.write('Plan for a name lookup:')
+            self.stdout.write(Employee.objects.by_identifier(sample[0][2]).explain())
+
+            if not options['keep']:
+                transaction.set_rollback(True)
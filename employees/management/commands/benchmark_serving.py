@@ -0,0 +1,211 @@
+import asyncio
+import io
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode, urlsplit
+
+import django
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+
+from employees.async_urls import ASYNC_READ_VIEWS
+from employees.factories import seed_employees
+from employees.management.commands.benchmark_api import SCENARIOS, BenchmarkRun, client_host, summarize
+from employees.models import Employee, Review
+
+
+def wsgi_get(application, host, url):
+    """
+    Call a WSGI application directly with a GET for ``url``; returns the status code.
+    """
+    parts = urlsplit(url)
+    environ = {
+        'REQUEST_METHOD': 'GET',
+        'SCRIPT_NAME': '',
+        'PATH_INFO': parts.path,
+        'QUERY_STRING': parts.query,
+        'SERVER_NAME': host,
+        'SERVER_PORT': '80',
+        'SERVER_PROTOCOL': 'HTTP/1.1',
+        'HTTP_HOST': host,
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': 'http',
+        'wsgi.input': io.BytesIO(),
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': False,
+        'wsgi.run_once': False,
+    }
+    statuses = []
+
+    def start_response(status, headers, exc_info=None):
+        statuses.append(int(status.split()[0]))
+
+    body = application(environ, start_response)
+    try:
+        for _ in body:
+            pass
+    finally:
+        if hasattr(body, 'close'):
+            body.close()
+    return statuses[0]
+
+
+async def asgi_get(application, host, url):
+    """
+    Call an ASGI application directly with a GET for ``url``; returns the status code.
+    """
+    parts = urlsplit(url)
+    scope = {
+        'type': 'http',
+        'asgi': {'version': '3.0'},
+        'http_version': '1.1',
+        'method': 'GET',
+        'scheme': 'http',
+        'path': parts.path,
+        'raw_path': parts.path.encode('ascii'),
+        'query_string': parts.query.encode('ascii'),
+        'root_path': '',
+        'headers': [(b'host', host.encode('ascii'))],
+        'client': ('127.0.0.1', 0),
+        'server': (host, 80),
+    }
+    pending = [{'type': 'http.request', 'body': b'', 'more_body': False}]
+    statuses = []
+
+    async def receive():
+        if pending:
+            return pending.pop()
+        # The client never disconnects; Django cancels this once it has responded.
+        await asyncio.Event().wait()
+
+    async def send(message):
+        if message['type'] == 'http.response.start':
+            statuses.append(message['status'])
+
+    await application(scope, receive, send)
+    return statuses[0]
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare concurrent-request throughput of the read endpoints served by the WSGI application '
+        '(synchronous DRF views) and the ASGI application (native async views). Both are called '
+        'in-process, so the numbers measure the Django/database path rather than a web server. '
+        'Seeded rows are committed (worker threads use their own connections) and deleted afterwards.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--employees', type=int, default=1000, help='Employees to seed.')
+        parser.add_argument('--reviews-per-employee', type=int, default=3, help='Reviews seeded per employee.')
+        parser.add_argument('--requests', type=int, default=200, help='Requests per route and server.')
+        parser.add_argument('--concurrency', type=int, default=20, help='Requests in flight at once.')
+        parser.add_argument('--server', choices=['wsgi', 'asgi', 'both'], default='both')
+        parser.add_argument(
+            '--cache', choices=['cold', 'warm'], default='cold',
+            help='cold gives every request a unique URL so it misses the response cache.',
+        )
+        parser.add_argument('--output', help='Write the JSON report here instead of stdout.')
+
+    def handle(self, *args, **options):
+        if connection.vendor == 'sqlite' and connection.is_in_memory_db():
+            raise CommandError('An in-memory SQLite database is not shared between threads; use a file or Postgres.')
+        servers = ['wsgi', 'asgi'] if options['server'] == 'both' else [options['server']]
+
+        self.stderr.write(f"Seeding {options['employees']} employees...")
+        employees = seed_employees(options['employees'], options['reviews_per_employee'], start=int(time.time()))
+        employee_ids = [employee.pk for employee in employees]
+        try:
+            run = BenchmarkRun(
+                employee_ids,
+                list(Review.objects.filter(employee__in=employee_ids[:1000]).values_list('pk', flat=True)),
+            )
+            results = {}
+            for name in ASYNC_READ_VIEWS:
+                route = results[f'GET {name}'] = {}
+                for server in servers:
+                    route[server] = self.measure(server, run, name, options)
+                    self.stderr.write(
+                        f"{server} GET {name}: {route[server]['requests_per_s']} req/s, p95={route[server]['p95_ms']}ms"
+                    )
+                if len(servers) == 2:
+                    route['asgi_speedup'] = round(route['asgi']['requests_per_s'] / route['wsgi']['requests_per_s'], 3)
+        finally:
+            for start in range(0, len(employee_ids), 500):
+                Employee.objects.filter(pk__in=employee_ids[start:start + 500]).delete()
+
+        report = {
+            'meta': {
+                'created_at': timezone.now().isoformat(),
+                'vendor': connection.vendor,
+                'django': django.get_version(),
+                'employees': options['employees'],
+                'reviews_per_employee': options['reviews_per_employee'],
+                'requests': options['requests'],
+                'concurrency': options['concurrency'],
+                'cache': options['cache'],
+            },
+            'routes': results,
+        }
+        output = json.dumps(report, indent=2, sort_keys=True)
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as handle:
+                handle.write(output + '\n')
+        else:
+            self.stdout.write(output)
+
+    def urls(self, server, run, name, options):
+        urls = []
+        for i in range(options['requests']):
+            url, params = SCENARIOS[(name, 'get')].build(run, i)
+            params = dict(params or {})
+            if options['cache'] == 'cold':
+                params['nocache'] = f'{server}-{run.token}-{i}'
+            urls.append(f'{url}?{urlencode(params)}' if params else url)
+        return urls
+
+    def measure(self, server, run, name, options):
+        urls = self.urls(server, run, name, options)
+        host = client_host()
+        timings, statuses = [], set()
+
+        def record(began, status_code):
+            timings.append((time.perf_counter() - began) * 1000)
+            statuses.add(status_code)
+
+        if server == 'wsgi':
+            from employee_management.wsgi import application
+
+            def call(url):
+                began = time.perf_counter()
+                record(began, wsgi_get(application, host, url))
+
+            started = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=options['concurrency']) as executor:
+                list(executor.map(call, urls))
+            elapsed = time.perf_counter() - started
+        else:
+            from employee_management.asgi import application
+
+            async def main():
+                slots = asyncio.Semaphore(options['concurrency'])
+
+                async def call(url):
+                    async with slots:
+                        began = time.perf_counter()
+                        record(began, await asgi_get(application, host, url))
+
+                await asyncio.gather(*(call(url) for url in urls))
+
+            started = time.perf_counter()
+            asyncio.run(main())
+            elapsed = time.perf_counter() - started
+
+        return {
+            **summarize(timings),
+            'requests_per_s': round(len(urls) / elapsed, 1),
+            'statuses': sorted(statuses),
+        }
@@ -0,0 +1,74 @@
+from django.core.management.base import BaseCommand
+from django.db import router, transaction
+from django.db.models import Case, Count, F, When, Window
+from django.db.models.functions import FirstValue, Lower, RowNumber
+
+from employees.cache import invalidate_all
+from employees.deletion import record_tombstones
+from employees.models import Employee, Review
+
+
+def duplicate_employees():
+    """
+    Rows whose email repeats another row's, case-insensitively.
+
+    Each row is annotated with ``survivor_id``, the lowest ID sharing its
+    ``lower(email)``, using ``ROW_NUMBER()``/``FIRST_VALUE()`` over
+    ``PARTITION BY lower(email) ORDER BY id``. The survivor itself is excluded.
+    """
+    partition = {'partition_by': Lower('email'), 'order_by': F('id').asc()}
+    return Employee.objects.annotate(
+        row_number=Window(RowNumber(), **partition),
+        survivor_id=Window(FirstValue('id'), **partition),
+    ).filter(row_number__gt=1)
+
+
+class Command(BaseCommand):
+    help = (
+        'Remove employees whose email duplicates another (case-insensitively), keeping the '
+        'lowest ID and moving the duplicates\' reviews onto it. Works in bounded batches, '
+        'each in its own transaction, so locks stay short on large tables.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='Duplicates removed per transaction.')
+        parser.add_argument('--dry-run', action='store_true', help='Report what would change without writing.')
+
+    def handle(self, *args, **options):
+        if options['dry_run']:
+            duplicates = duplicate_employees()
+            count = duplicates.count()
+            emails = Employee.objects.values(email_lower=Lower('email')).annotate(rows=Count('id')).filter(rows__gt=1).count()
+            reviews = Review.objects.filter(employee_id__in=duplicates.values('id')).count()
+            self.stdout.write(
+                f'Would remove {count} duplicate employees across {emails} emails '
+                f'and move {reviews} reviews onto the surviving employees.'
+            )
+            return
+
+        # The window scans the whole table, so it runs once rather than per
+        # batch; each duplicate is only a pair of integers to hold.
+        using = router.db_for_write(Employee)
+        pairs = list(duplicate_employees().using(using).values_list('id', 'survivor_id'))
+        removed = moved = 0
+        for start in range(0, len(pairs), options['batch_size']):
+            batch = pairs[start:start + options['batch_size']]
+            duplicate_ids = [duplicate_id for duplicate_id, _ in batch]
+            with transaction.atomic(using=using):
+                # Reviews added to a duplicate from here on wait for the
+                # lock, then fail, rather than failing the DELETE below.
+                list(Employee.all_objects.using(using).select_for_update().filter(pk__in=duplicate_ids).values_list('pk', flat=True))
+                moved += Review.objects.using(using).filter(employee_id__in=duplicate_ids).update(
+                    employee_id=Case(*(When(employee_id=duplicate_id, then=survivor_id) for duplicate_id, survivor_id in batch))
+                )
+                Employee.objects.using(using).filter(id__in={survivor_id for _, survivor_id in batch}).refresh_review_stats()
+                # One DELETE; QuerySet.delete() would load the rows and send a
+                # signal per row, each invalidating the cache again.
+                Employee.all_objects.filter(pk__in=duplicate_ids)._raw_delete(using)
+                record_tombstones(duplicate_ids, using)
+                invalidate_all()
+                removed += len(batch)
+            if options['verbosity'] >= 2:
+                self.stdout.write(f'{removed} duplicates removed so far')
+
+        self.stdout.write(f'Removed {removed} duplicate employees and moved {moved} reviews.')
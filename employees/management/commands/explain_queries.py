@@ -0,0 +1,186 @@
+import json
+import re
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Max
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from employees.cache import get_cache
+from employees.factories import seed_employees
+from employees.management.commands.benchmark_api import client_host
+from employees.models import Employee, Review
+
+
+def query_shapes(employee):
+    """
+    ``(label, url, params)`` for each way the API reads the tables.
+
+    Paginated shapes are followed to their second page too, so the keyset
+    ``WHERE`` of a cursor page is checked as well as the first page.
+    """
+    department = employee.department
+    hired = employee.hire_date
+    shapes = [
+        ('employee list', reverse('employee-list'), {'page_size': 100}),
+        ('employee list by department', reverse('employee-list'), {'page_size': 100, 'department': department}),
+        ('employee list by hire date', reverse('employee-list'), {
+            'page_size': 100,
+            'hire_date_after': hired.replace(day=1).isoformat(),
+            'hire_date_before': hired.isoformat(),
+        }),
+        ('employee list ordered by email', reverse('employee-list'), {'page_size': 100, 'ordering': 'email'}),
+        ('employee list ordered by department', reverse('employee-list'), {'page_size': 100, 'ordering': 'department'}),
+        ('employee change feed', reverse('employee-changes'), {'page_size': 100}),
+        ('employee by id', reverse('employee-retrieve', kwargs={'identifier': employee.pk}), None),
+        ('employee by name', reverse('employee-retrieve', kwargs={'identifier': employee.last_name}), None),
+        ('employee reviews', reverse('employee-reviews', kwargs={'employee_pk': employee.pk}), {'page_size': 2}),
+        ('employee reviews, newest first', reverse('employee-reviews', kwargs={'employee_pk': employee.pk}), {
+            'page_size': 2, 'ordering': '-created_at',
+        }),
+        ('reviews of an employee', reverse('review-list'), {'employee': employee.pk, 'min_rating': 2}),
+        ('review summary by department', reverse('review-summary-employees'), {
+            'page_size': 100, 'department': department,
+        }),
+        ('department summary for one department', reverse('review-summary-departments'), {'department': department}),
+    ]
+    if connection.vendor == 'postgresql':
+        # Elsewhere search reads every employee once to build its in-process index, by design.
+        shapes.append(('search', reverse('employee-search'), {'q': employee.last_name[:4]}))
+    return shapes
+
+
+class PlanChecker:
+    """
+    Finds sequential scans in query plans and sizes the tables they scan.
+    """
+
+    def __init__(self):
+        self.table_rows = {}
+
+    def rows(self, table):
+        if table not in self.table_rows:
+            with connection.cursor() as cursor:
+                if connection.vendor == 'postgresql':
+                    cursor.execute('SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass', [table])
+                else:
+                    cursor.execute(f'SELECT COUNT(*) FROM {connection.ops.quote_name(table)}')
+                self.table_rows[table] = max(cursor.fetchone()[0], 0)
+        return self.table_rows[table]
+
+    def explain(self, sql, params):
+        """
+        Returns:
+            tuple: ``(plan text, [scanned table, ...])``.
+        """
+        with connection.cursor() as cursor:
+            if connection.vendor == 'postgresql':
+                cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+                plan = cursor.fetchone()[0]
+                plan = json.loads(plan) if isinstance(plan, str) else plan
+                return json.dumps(plan, indent=2), list(self.postgresql_scans(plan[0]['Plan']))
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+            details = [row[-1] for row in cursor.fetchall()]
+        return '\n'.join(details), self.sqlite_scans(sql, details)
+
+    def postgresql_scans(self, node):
+        if node['Node Type'] == 'Seq Scan':
+            yield node['Relation Name']
+        for child in node.get('Plans', ()):
+            yield from self.postgresql_scans(child)
+
+    def sqlite_scans(self, sql, details):
+        scans = []
+        for detail in details:
+            match = re.fullmatch(r'SCAN (\w+)(?: AS \w+)?', detail)
+            if match is None:
+                continue
+            # A bare SCAN walks the rowid B-tree. Unfiltered, unsorted and
+            # limited, it stops after one page, like a pkey index scan.
+            first_page = re.search(r'\bLIMIT \d+', sql) and ' WHERE ' not in sql
+            if not first_page or any('TEMP B-TREE' in line for line in details):
+                scans.append(match[1])
+        return scans
+
+
+class Command(BaseCommand):
+    help = (
+        'Run EXPLAIN for the SQL behind each API query shape and fail if any plan sequentially '
+        'scans a table with more than --max-rows rows. Seeded rows are rolled back.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--employees', type=int, default=100000,
+            help='Seed employees up to this many first, so the planner sees a realistic table.',
+        )
+        parser.add_argument('--reviews-per-employee', type=int, default=3, help='Reviews seeded per new employee.')
+        parser.add_argument('--max-rows', type=int, default=10000, help='Largest table a query may scan.')
+        parser.add_argument('--verbose-plans', action='store_true', help='Print every plan, not just failing ones.')
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            existing = Employee.objects.count()
+            if existing < options['employees']:
+                self.stderr.write(f"Seeding {options['employees'] - existing} employees...")
+                start = (Employee.objects.aggregate(Max('id'))['id__max'] or 0) + int(time.time())
+                seed_employees(options['employees'] - existing, options['reviews_per_employee'], start=start)
+            employee = Employee.objects.order_by('id').first()
+            if employee is None:
+                raise CommandError('No employees; raise --employees.')
+            # Enough reviews for the review shapes to reach a cursor page.
+            Review.objects.bulk_create([Review(employee=employee, rating=3) for _ in range(3)])
+            if connection.vendor == 'postgresql':
+                with connection.cursor() as cursor:
+                    cursor.execute(f'ANALYZE {Employee._meta.db_table}, {Review._meta.db_table}')
+
+            failures = self.check_shapes(query_shapes(employee), options)
+            transaction.set_rollback(True)
+
+        if failures:
+            raise CommandError(f"{failures} query shape(s) scan a table of more than {options['max_rows']} rows.")
+        self.stdout.write(self.style.SUCCESS('No query shape scans a large table.'))
+
+    def check_shapes(self, shapes, options):
+        client = APIClient(HTTP_HOST=client_host())
+        checker = PlanChecker()
+        failures = 0
+        for label, url, params in shapes:
+            statements = []
+
+            def collect(execute, sql, sql_params, many, context):
+                if sql.lstrip().upper().startswith('SELECT'):
+                    statements.append((sql, sql_params))
+                return execute(sql, sql_params, many, context)
+
+            with connection.execute_wrapper(collect):
+                for page in range(2):
+                    get_cache().clear()
+                    response = client.get(url, params, HTTP_ACCEPT='application/json')
+                    if response.status_code != 200:
+                        raise CommandError(f'{label}: GET {url} returned {response.status_code}.')
+                    data = response.json()
+                    next_url = data.get('next') if isinstance(data, dict) else None
+                    if not next_url:
+                        break
+                    url, params = next_url, None
+
+            problems = []
+            for sql, sql_params in statements:
+                plan, scans = checker.explain(sql, sql_params)
+                large = [table for table in scans if checker.rows(table) > options['max_rows']]
+                if large or options['verbose_plans']:
+                    problems.append((sql, plan, large))
+            failed = any(large for _, _, large in problems)
+            failures += failed
+            status = self.style.ERROR('SCAN') if failed else self.style.SUCCESS('ok  ')
+            self.stdout.write(f'{status} {label} ({len(statements)} queries)')
+            for sql, plan, large in problems:
+                if large:
+                    tables = ', '.join(f'{table} ({checker.rows(table)} rows)' for table in large)
+                    self.stdout.write(f'     sequential scan of {tables}')
+                self.stdout.write(f'     {sql}')
+                self.stdout.write('     ' + plan.replace('\n', '\n     '))
+        return failures
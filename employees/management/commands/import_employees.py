@@ -0,0 +1,264 @@
+import csv
+import io
+import json
+import time
+from itertools import islice
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from employees.bulk import save_employees
+from employees.cache import invalidate_all
+from employees.models import Employee, Review
+from employees.serializers import EmployeeUpsertSerializer, ReviewRowSerializer, validate_row
+
+EMPLOYEE_COLUMNS = [
+    'first_name',
+    'last_name',
+    'email',
+    'contact_number',
+    'contact_info',
+    'department',
+    'birth_date',
+    'hire_date',
+]
+REVIEW_COLUMNS = ['email', 'rating', 'comments']
+
+STAGING_DDL = """
+CREATE TEMP TABLE IF NOT EXISTS import_employee_staging (
+    first_name varchar(100),
+    last_name varchar(100),
+    email varchar(254),
+    contact_number varchar(100),
+    contact_info varchar(100),
+    department varchar(100),
+    birth_date date,
+    hire_date date
+);
+CREATE TEMP TABLE IF NOT EXISTS import_review_staging (
+    email varchar(254),
+    rating integer,
+    comments text
+);
+"""
+
+MERGE_EMPLOYEES_SQL = """
+INSERT INTO {employee_table} ({columns}, created_at, updated_at)
+SELECT {columns}, now(), now() FROM import_employee_staging
+ON CONFLICT (email) DO UPDATE SET {updates}, updated_at = EXCLUDED.updated_at,
+    version = {employee_table}.version + 1, deleted_at = NULL
+RETURNING (xmax = 0)
+"""
+
+MERGE_REVIEWS_SQL = """
+INSERT INTO {review_table} (employee_id, rating, comments, created_at, updated_at)
+SELECT e.id, s.rating, s.comments, now(), now()
+FROM import_review_staging s JOIN {employee_table} e ON e.email = s.email
+"""
+
+
+def copy_rows(cursor, table, columns, rows):
+    """
+    ``COPY`` rows into ``table`` with whichever psycopg driver is installed.
+    """
+    sql = f"COPY {table} ({', '.join(columns)}) FROM STDIN"
+    raw = cursor.cursor
+    if hasattr(raw, 'copy'):
+        # psycopg 3 streams rows straight into the COPY.
+        with raw.copy(sql) as copy:
+            for row in rows:
+                copy.write_row(row)
+    else:
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(rows)
+        buffer.seek(0)
+        raw.copy_expert(f"{sql} WITH (FORMAT csv)", buffer)
+
+
+def refresh_review_stats(reviews):
+    """
+    Recompute review stats for the employees that just received ``reviews``.
+    """
+    if reviews:
+        Employee.objects.filter(email__in={email for email, _ in reviews}).refresh_review_stats()
+
+
+class PostgresCopyLoader:
+    """
+    Loads each batch with ``COPY`` into temp staging tables and two set-based
+    ``INSERT ... SELECT`` statements, instead of one statement per row.
+    """
+
+    def __init__(self):
+        employee_table = Employee._meta.db_table
+        self.merge_employees_sql = MERGE_EMPLOYEES_SQL.format(
+            employee_table=employee_table,
+            columns=', '.join(EMPLOYEE_COLUMNS),
+            updates=', '.join(f'{column} = EXCLUDED.{column}' for column in EMPLOYEE_COLUMNS if column != 'email'),
+        )
+        self.merge_reviews_sql = MERGE_REVIEWS_SQL.format(
+            employee_table=employee_table,
+            review_table=Review._meta.db_table,
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(STAGING_DDL)
+
+    def load(self, employees, reviews):
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute('TRUNCATE import_employee_staging, import_review_staging')
+            copy_rows(
+                cursor,
+                'import_employee_staging',
+                EMPLOYEE_COLUMNS,
+                ([employee[column] for column in EMPLOYEE_COLUMNS] for employee in employees),
+            )
+            cursor.execute(self.merge_employees_sql)
+            created = sum(1 for (inserted,) in cursor.fetchall() if inserted)
+
+            copy_rows(
+                cursor,
+                'import_review_staging',
+                REVIEW_COLUMNS,
+                ([email, review['rating'], review.get('comments')] for email, review in reviews),
+            )
+            cursor.execute(self.merge_reviews_sql)
+            refresh_review_stats(reviews)
+            invalidate_all()
+        return created, len(employees) - created
+
+    def close(self):
+        with connection.cursor() as cursor:
+            cursor.execute('DROP TABLE IF EXISTS import_employee_staging, import_review_staging')
+
+
+class OrmLoader:
+    """
+    Fallback for databases without ``COPY``: one upsert and one review insert per batch.
+    """
+
+    def load(self, employees, reviews):
+        with transaction.atomic():
+            instances = [Employee(**employee) for employee in employees]
+            existing = save_employees(instances)
+            ids = {instance.email: instance.pk for instance in instances}
+            Review.objects.bulk_create([Review(employee_id=ids[email], **review) for email, review in reviews])
+            refresh_review_stats(reviews)
+        return len(instances) - len(existing), len(existing)
+
+    def close(self):
+        pass
+
+
+class Command(BaseCommand):
+    help = (
+        'Stream employees, and optionally their reviews, from a CSV or NDJSON file. '
+        'Rows are validated with the EmployeeSerializer rules and upserted on email in batches; '
+        'on PostgreSQL each batch is COPYed into a staging table and merged set-based. '
+        'CSV rows may carry "rating"/"comments" columns for one review; NDJSON rows may carry a "reviews" list. '
+        'When an email repeats, the last row wins.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV or NDJSON file to import.')
+        parser.add_argument('--format', choices=['csv', 'ndjson'], help='Defaults to the file extension.')
+        parser.add_argument('--batch-size', type=int, default=5000, help='Rows per transaction.')
+        parser.add_argument('--rejects', help='Write rejected rows and their errors to this NDJSON file.')
+
+    def handle(self, path, **options):
+        file_format = options['format'] or ('csv' if path.lower().endswith('.csv') else 'ndjson')
+        self.rejected = 0
+        self.rejects_file = open(options['rejects'], 'w', encoding='utf-8') if options['rejects'] else None
+        loader = PostgresCopyLoader() if connection.vendor == 'postgresql' else OrmLoader()
+        created = updated = 0
+        began = time.monotonic()
+
+        try:
+            with open(path, newline='', encoding='utf-8') as handle:
+                rows = self.read_csv(handle) if file_format == 'csv' else self.read_ndjson(handle)
+                valid_rows = self.validate(rows)
+                while True:
+                    batch = list(islice(valid_rows, options['batch_size']))
+                    if not batch:
+                        break
+                    batch_created, batch_updated = loader.load(*self.merge_batch(batch))
+                    created += batch_created
+                    updated += batch_updated
+                    if options['verbosity'] >= 2:
+                        self.report(created, updated, began)
+        except OSError as exc:
+            raise CommandError(f'Cannot read {path}: {exc}')
+        finally:
+            loader.close()
+            if self.rejects_file:
+                self.rejects_file.close()
+
+        self.report(created, updated, began)
+
+    def report(self, created, updated, began):
+        elapsed = max(time.monotonic() - began, 1e-9)
+        loaded = created + updated
+        self.stdout.write(
+            f'{loaded} rows loaded ({created} created, {updated} updated), '
+            f'{self.rejected} rejected in {elapsed:.2f}s ({(loaded + self.rejected) / elapsed:.0f} rows/s)'
+        )
+
+    def reject(self, line_number, errors):
+        self.rejected += 1
+        if self.rejects_file:
+            self.rejects_file.write(json.dumps({'line': line_number, 'errors': errors}) + '\n')
+        elif self.rejected <= 20:
+            self.stderr.write(f'line {line_number}: {json.dumps(errors)}')
+
+    def read_csv(self, handle):
+        reader = csv.DictReader(handle)
+        for row in reader:
+            rating = row.pop('rating', None)
+            comments = row.pop('comments', None)
+            if rating:
+                row['reviews'] = [{'rating': rating, 'comments': comments or None}]
+            yield reader.line_num, row
+
+    def read_ndjson(self, handle):
+        for line_number, line in enumerate(handle, start=1):
+            if not line.strip():
+                continue
+            try:
+                yield line_number, json.loads(line)
+            except ValueError as exc:
+                self.reject(line_number, {'non_field_errors': [f'Invalid JSON: {exc}']})
+
+    def validate(self, rows):
+        """
+        Yield ``(employee_data, [review_data, ...])`` for each valid row; reject the rest.
+        """
+        employee_serializer = EmployeeUpsertSerializer()
+        review_serializer = ReviewRowSerializer()
+        for line_number, row in rows:
+            if not isinstance(row, dict):
+                self.reject(line_number, {'non_field_errors': ['Expected an object.']})
+                continue
+            reviews = row.pop('reviews', None) or []
+            employee, errors = validate_row(employee_serializer, row)
+            errors = dict(errors or {})
+            validated_reviews = []
+            for position, review in enumerate(reviews):
+                review_data, review_errors = validate_row(review_serializer, review)
+                if review_errors:
+                    errors.setdefault('reviews', {})[position] = review_errors
+                else:
+                    validated_reviews.append(review_data)
+            if errors:
+                self.reject(line_number, errors)
+                continue
+            yield employee, validated_reviews
+
+    def merge_batch(self, batch):
+        """
+        Collapse repeated emails in a batch (last row wins) and flatten reviews.
+        """
+        employees = {}
+        reviews = []
+        for employee, employee_reviews in batch:
+            employees[employee['email']] = employee
+            reviews += [(employee['email'], review) for review in employee_reviews]
+        return list(employees.values()), reviews
@@ -0,0 +1,40 @@
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from employees.deletion import delete_batch_size, purge_employees
+
+
+class Command(BaseCommand):
+    help = (
+        'Hard-delete employees soft-deleted more than --older-than-days ago, with their reviews, '
+        'in batches of short transactions. Run it from cron, or keep it running with --interval.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--older-than-days', type=float, default=getattr(settings, 'CHANGE_FEED_RETENTION_DAYS', 30),
+            help='Keep tombstones this long; CHANGE_FEED_RETENTION_DAYS by default.',
+        )
+        parser.add_argument('--batch-size', type=int, help='Rows per statement; EMPLOYEE_DELETE_BATCH_SIZE by default.')
+        parser.add_argument('--pause', type=float, default=0.05, help='Seconds to sleep between batches.')
+        parser.add_argument('--interval', type=float, help='Purge again every this many seconds, until stopped.')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size'] or delete_batch_size()
+        if batch_size < 1:
+            raise CommandError('--batch-size must be at least 1.')
+        while True:
+            began = time.monotonic()
+            older_than = timezone.now() - timedelta(days=options['older_than_days'])
+            employees, reviews = purge_employees(older_than, batch_size=batch_size, pause=options['pause'])
+            self.stdout.write(
+                f'Purged {employees} employees and {reviews} reviews deleted before {older_than:%Y-%m-%d %H:%M} '
+                f'in {time.monotonic() - began:.2f}s'
+            )
+            if options['interval'] is None:
+                return
+            time.sleep(options['interval'])
@@ -0,0 +1,89 @@
+import signal
+import threading
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from employees.jobs import JOB_TYPES, claim, pending, requeue_stale, run_job, worker_name
+
+
+class Command(BaseCommand):
+    help = (
+        'Run queued background jobs (exports, imports, dedupes, purges) on a pool of threads, '
+        'respecting the per-kind limits in JOB_CONCURRENCY. Stops after the running jobs finish '
+        'on SIGTERM or Ctrl-C.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=2, help='Jobs run at once by this process.')
+        parser.add_argument('--kinds', help=f"Comma-separated job kinds to run; all by default ({', '.join(sorted(JOB_TYPES))}).")
+        parser.add_argument('--poll-interval', type=float, default=1.0, help='Seconds to wait when the queue is empty.')
+        parser.add_argument('--burst', action='store_true', help='Exit once no jobs are queued instead of polling.')
+
+    def handle(self, *args, **options):
+        if options['threads'] < 1:
+            raise CommandError('--threads must be at least 1.')
+        kinds = None
+        if options['kinds']:
+            kinds = [kind.strip() for kind in options['kinds'].split(',') if kind.strip()]
+            unknown = set(kinds) - set(JOB_TYPES)
+            if unknown:
+                raise CommandError(f"Unknown job kinds: {', '.join(sorted(unknown))}.")
+
+        stop = threading.Event()
+        if threading.current_thread() is threading.main_thread():
+            for signum in (signal.SIGTERM, signal.SIGINT):
+                signal.signal(signum, lambda *_: stop.set())
+
+        requeued, failed = requeue_stale()
+        if requeued or failed:
+            self.stderr.write(f'Requeued {requeued} and failed {failed} stale jobs')
+
+        if options['threads'] == 1:
+            finished = self.work(0, kinds, options['poll_interval'], options['burst'], stop)
+        else:
+            results = [0] * options['threads']
+            threads = [
+                threading.Thread(
+                    target=lambda index=index: results.__setitem__(
+                        index, self.work(index, kinds, options['poll_interval'], options['burst'], stop)
+                    ),
+                    name=f'job-worker-{index}',
+                )
+                for index in range(options['threads'])
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            finished = sum(results)
+        self.stdout.write(f'Ran {finished} jobs')
+
+    def work(self, index, kinds, poll_interval, burst, stop):
+        """
+        Claim and run jobs until ``stop`` is set (or, in burst mode, the queue is empty).
+
+        Returns:
+            int: Jobs run by this worker.
+        """
+        worker = worker_name(index)
+        finished = 0
+        try:
+            while not stop.is_set():
+                job = claim(worker, kinds)
+                if job is None:
+                    if burst and not pending(kinds):
+                        return finished
+                    if index == 0:
+                        requeue_stale()
+                    stop.wait(poll_interval)
+                    continue
+                began = time.monotonic()
+                job = run_job(job)
+                finished += 1
+                self.stdout.write(f'{worker}: job {job.pk} ({job.kind}) {job.status} in {time.monotonic() - began:.2f}s')
+            return finished
+        finally:
+            if threading.current_thread() is not threading.main_thread():
+                connections.close_all()
@@ -0,0 +1,165 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Run in a fresh interpreter: the phases of a WSGI worker's cold start, as
+# wsgi.py runs them, then its first request. Prints the timings as JSON.
+CHILD = '''
+import io, json, sys, time
+began = time.perf_counter()
+phases = {}
+
+def mark(name):
+    global began
+    now = time.perf_counter()
+    phases[name] = (now - began) * 1000
+    began = now
+
+import django
+from django.conf import settings
+settings.INSTALLED_APPS
+mark('settings')
+django.setup(set_prefix=False)
+mark('setup')
+from django.core.handlers.wsgi import WSGIHandler
+application = WSGIHandler()
+mark('middleware')
+routes = 0
+if getattr(settings, 'STARTUP_WARM_UP', False):
+    from employees.startup import warm_up
+    routes = warm_up()
+mark('warm_up')
+path = sys.argv[1]
+# As benchmark_api.client_host(): an explicit allowed host, or localhost.
+host = ([host for host in settings.ALLOWED_HOSTS if host != '*' and not host.startswith('.')] or ['localhost'])[0]
+statuses = []
+body = application({
+    'REQUEST_METHOD': 'GET', 'SCRIPT_NAME': '', 'PATH_INFO': path, 'QUERY_STRING': '',
+    'SERVER_NAME': host, 'SERVER_PORT': '80', 'SERVER_PROTOCOL': 'HTTP/1.1', 'HTTP_HOST': host,
+    'wsgi.version': (1, 0), 'wsgi.url_scheme': 'http', 'wsgi.input': io.BytesIO(), 'wsgi.errors': sys.stderr,
+    'wsgi.multithread': True, 'wsgi.multiprocess': False, 'wsgi.run_once': False,
+}, lambda status, headers, exc_info=None: statuses.append(int(status.split()[0])))
+b''.join(body)
+body.close()
+mark('first_request')
+print(json.dumps({
+    'phases': phases, 'status': statuses[0], 'routes': routes,
+    'modules': sorted({name.partition('.')[0] for name in sys.modules}),
+}))
+'''
+
+PHASES = ('interpreter', 'settings', 'setup', 'middleware', 'warm_up', 'first_request')
+
+
+def package_of(module):
+    """
+    The package an import is charged to: ``django.contrib.*`` and
+    ``rest_framework.*`` by app, other modules by top-level package.
+    """
+    parts = module.split('.')
+    if parts[:2] == ['django', 'contrib'] or parts[0] == 'rest_framework':
+        depth = 3 if parts[0] == 'django' else 2
+        return '.'.join(parts[:depth])
+    if parts[0] in ('django', 'employees', 'employee_management'):
+        return '.'.join(parts[:2])
+    return parts[0]
+
+
+def parse_importtime(stderr):
+    """
+    Import time per package from ``python -X importtime`` output.
+
+    Returns:
+        list: ``(package, self ms)`` pairs, slowest first.
+    """
+    totals = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        own, _, name = line[len('import time:'):].split('|')
+        package = package_of(name.strip())
+        totals[package] = totals.get(package, 0) + int(own) / 1000
+    return sorted(totals.items(), key=lambda item: -item[1])
+
+
+class Command(BaseCommand):
+    help = (
+        'Measure the cold start of an API worker: interpreter start, settings, django.setup(), '
+        'middleware, route warm-up and the first request, in fresh processes, plus the import '
+        'time of each package. Fails when the median cold start is over STARTUP_BUDGET_MS.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--runs', type=int, default=5, help='Cold starts to time; the median is reported.')
+        parser.add_argument('--path', default='/api/v1/metrics/requests/', help='URL of the first request.')
+        parser.add_argument('--top', type=int, default=15, help='Slowest packages to list; 0 skips the import profile.')
+        parser.add_argument('--budget-ms', type=float, help='Cold start budget; STARTUP_BUDGET_MS by default.')
+        parser.add_argument('--json', action='store_true', help='Print the report as JSON.')
+
+    def handle(self, *args, **options):
+        if options['runs'] < 1:
+            raise CommandError('--runs must be at least 1.')
+        budget = options['budget_ms'] or getattr(settings, 'STARTUP_BUDGET_MS', None)
+        runs = [self.cold_start(options['path']) for _ in range(options['runs'])]
+        report = {
+            'settings': settings.SETTINGS_MODULE,
+            'runs': len(runs),
+            'phases_ms': {phase: round(statistics.median(run['phases'][phase] for run in runs), 1) for phase in PHASES},
+            'total_ms': round(statistics.median(run['total'] for run in runs), 1),
+            'budget_ms': budget,
+            'status': runs[-1]['status'],
+            'routes_warmed': runs[-1]['routes'],
+            'modules': runs[-1]['modules'],
+        }
+        if options['top']:
+            stderr = self.cold_start(options['path'], importtime=True)['stderr']
+            report['imports_ms'] = [
+                [package, round(ms, 1)] for package, ms in parse_importtime(stderr)[:options['top']]
+            ]
+
+        if options['json']:
+            self.stdout.write(json.dumps(report, indent=2))
+        else:
+            self.print_report(report)
+        if budget and report['total_ms'] > budget:
+            raise CommandError(f"Cold start took {report['total_ms']}ms, over the {budget:g}ms budget.")
+
+    def cold_start(self, path, importtime=False):
+        """
+        Start a fresh interpreter through its first request.
+
+        Returns:
+            dict: The child's report, plus ``total`` wall time and the
+            ``interpreter`` phase (time not accounted for by the others).
+        """
+        command = [sys.executable, *(['-X', 'importtime'] if importtime else []), '-c', CHILD, path]
+        env = {**os.environ, 'DJANGO_SETTINGS_MODULE': settings.SETTINGS_MODULE}
+        began = time.perf_counter()
+        result = subprocess.run(command, capture_output=True, text=True, env=env, cwd=settings.BASE_DIR)
+        total = (time.perf_counter() - began) * 1000
+        if result.returncode:
+            raise CommandError(f'The cold start failed:\n{result.stderr.strip()}')
+        report = json.loads(result.stdout.strip().splitlines()[-1])
+        report['phases']['interpreter'] = total - sum(report['phases'].values())
+        report['total'] = total
+        report['stderr'] = result.stderr
+        return report
+
+    def print_report(self, report):
+        self.stdout.write(f"Cold start with {report['settings']}, median of {report['runs']} runs:")
+        for phase, ms in report['phases_ms'].items():
+            self.stdout.write(f'  {phase:>14}: {ms:8.1f}ms')
+        self.stdout.write(f"  {'total':>14}: {report['total_ms']:8.1f}ms (budget {report['budget_ms'] or '-'}ms)")
+        self.stdout.write(
+            f"First request: HTTP {report['status']}; {report['routes_warmed']} routes warmed up at boot"
+        )
+        if report.get('imports_ms'):
+            self.stdout.write('Import time by package (self time, under -X importtime):')
+            for package, ms in report['imports_ms']:
+                self.stdout.write(f'  {package:<40} {ms:8.1f}ms')
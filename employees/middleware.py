@@ -0,0 +1,218 @@
+import math
+import time
+from functools import cache
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.http import JsonResponse
+
+from .instrumentation import (
+    RequestStats, current_request, log_n_plus_one, n_plus_one_threshold, route_metrics, server_timing,
+)
+from .routers import RoutingState, routing_state
+from .throttling import HeavyRequestSlot, is_heavy, refund, throttle
+
+REPLICA_PIN_COOKIE = 'primary_pin'
+
+
+class ASGIURLConfMiddleware:
+    """
+    Resolve requests handled asynchronously (i.e. under ASGI) against
+    ``settings.ASGI_URLCONF``, whose read endpoints are native async views.
+
+    Under WSGI the middleware chain is synchronous and this is a no-op.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.urlconf = getattr(settings, 'ASGI_URLCONF', None)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return self.get_response(request)
+
+    async def __acall__(self, request):
+        if self.urlconf:
+            request.urlconf = self.urlconf
+        return await self.get_response(request)
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Let safe-method requests read from replicas (see ``employees.routers``),
+    unless the client wrote recently.
+
+    A request that writes successfully gets a cookie pinning the client to the
+    primary for ``settings.REPLICA_PIN_SECONDS``, so it reads its own writes
+    despite replication lag.
+    """
+
+    sync_capable = True
+    async_capable = True
+    safe_methods = ('GET', 'HEAD', 'OPTIONS')
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        state, token = self.start(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            routing_state.reset(token)
+        return self.finish(state, response)
+
+    async def __acall__(self, request):
+        state, token = self.start(request)
+        try:
+            response = await self.get_response(request)
+        finally:
+            routing_state.reset(token)
+        return self.finish(state, response)
+
+    def start(self, request):
+        pinned = REPLICA_PIN_COOKIE in request.COOKIES
+        state = RoutingState(use_replica=request.method in self.safe_methods and not pinned, pinned=pinned)
+        return state, routing_state.set(state)
+
+    def finish(self, state, response):
+        if state.wrote and response.status_code < 400:
+            response.set_cookie(
+                REPLICA_PIN_COOKIE,
+                '1',
+                max_age=getattr(settings, 'REPLICA_PIN_SECONDS', 5),
+                httponly=True,
+                samesite='Lax',
+            )
+        return response
+
+
+@cache
+def route_names():
+    from .urls import urlpatterns
+    return frozenset(pattern.name for pattern in urlpatterns)
+
+
+class RequestMetricsMiddleware:
+    """
+    Time every request and count its SQL (see ``employees.instrumentation``).
+
+    Adds a ``Server-Timing`` header (total, database and application time)
+    to every response. Requests to routes in ``employees/urls.py`` are also
+    recorded in the per-route metrics, and statement shapes they repeat
+    ``settings.N_PLUS_ONE_THRESHOLD`` times or more are logged as likely N+1
+    queries.
+
+    Listed first in ``MIDDLEWARE`` so the total covers the other middleware.
+    Streaming responses are timed until their first byte.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        stats = RequestStats()
+        token = current_request.set(stats)
+        try:
+            response = self.get_response(request)
+        finally:
+            current_request.reset(token)
+        return self.finish(request, response, stats)
+
+    async def __acall__(self, request):
+        stats = RequestStats()
+        token = current_request.set(stats)
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_request.reset(token)
+        return self.finish(request, response, stats)
+
+    def finish(self, request, response, stats):
+        wall_seconds = time.perf_counter() - stats.started
+        response['Server-Timing'] = server_timing(wall_seconds, stats)
+        match = getattr(request, 'resolver_match', None)
+        if match is not None and match.url_name in route_names():
+            route = f'{request.method} {match.url_name}'
+            repeated = stats.repeated_shapes(n_plus_one_threshold())
+            if repeated:
+                log_n_plus_one(request, route, repeated)
+            route_metrics.record(route, wall_seconds, stats, repeated)
+        return response
+
+
+class AdmissionControlMiddleware:
+    """
+    Rate-limit API requests and cap heavy ones in flight (see ``employees.throttling``).
+
+    Runs in ``process_view``, once the route is known and before the view
+    touches the database. Turned-away requests cost the server a few cache
+    operations: ``429`` when the client (or route) is out of tokens, ``503``
+    when every heavy-request slot is taken. Both carry ``Retry-After``.
+
+    A heavy request's slot is released when its response is closed, which
+    for a streaming response is after its last byte.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return self.finish(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        return self.finish(request, await self.get_response(request))
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        match = request.resolver_match
+        if match is None or match.url_name not in route_names():
+            return None
+        route = f'{request.method} {match.url_name}'
+        wait, charged = throttle(request, route)
+        if wait:
+            return self.reject(429, 'Request was throttled.', wait)
+        if is_heavy(route):
+            slot = HeavyRequestSlot()
+            if not slot.acquire():
+                refund(charged)
+                return self.reject(503, 'Too many expensive requests are in progress; retry shortly.', 1)
+            request.admission_slot = slot
+        return None
+
+    def reject(self, status, detail, wait):
+        response = JsonResponse({'detail': f'{detail} Expected available in {math.ceil(wait)} seconds.'}, status=status)
+        response['Retry-After'] = str(math.ceil(wait))
+        return response
+
+    def finish(self, request, response):
+        slot = getattr(request, 'admission_slot', None)
+        if slot is not None:
+            if response.streaming:
+                response._resource_closers.append(slot.release)
+            else:
+                slot.release()
+        return response
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:32
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employees', '0003_review'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='employee',
+            index=models.Index(django.db.models.functions.text.Upper('first_name'), name='employee_first_name_upper_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='employee',
+            index=models.Index(django.db.models.functions.text.Upper('last_name'), name='employee_last_name_upper_idx'),
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:42
+
+from django.db import migrations, models
+from django.db.models import Avg, Count, FloatField, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+
+def backfill_review_stats(apps, schema_editor):
+    Employee = apps.get_model('employees', 'Employee')
+    Review = apps.get_model('employees', 'Review')
+    reviews = Review.objects.filter(employee=OuterRef('pk')).order_by().values('employee')
+    Employee.objects.update(
+        review_count=Coalesce(Subquery(reviews.annotate(n=Count('*')).values('n')), 0),
+        rating_total=Coalesce(Subquery(reviews.annotate(total=Sum('rating')).values('total')), 0),
+        avg_rating=Subquery(reviews.annotate(average=Avg('rating', output_field=FloatField())).values('average')),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employees', '0004_employee_name_upper_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='employee',
+            name='avg_rating',
+            field=models.FloatField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='employee',
+            name='rating_total',
+            field=models.PositiveIntegerField(db_default=0, default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='employee',
+            name='review_count',
+            field=models.PositiveIntegerField(db_default=0, default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_review_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,33 @@
+from django.db import migrations
+
+# employees.search.SEARCH_DOCUMENT at the time of this migration.
+SEARCH_DOCUMENT = "LOWER(first_name || ' ' || last_name || ' ' || email || ' ' || department)"
+
+
+def create_search_index(apps, schema_editor):
+    # Trigram GIN indexes are PostgreSQL-only; other databases use the
+    # in-process index in employees/search.py.
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    schema_editor.execute(
+        f'CREATE INDEX IF NOT EXISTS employee_search_trgm_idx ON employees_employee '
+        f'USING gin (({SEARCH_DOCUMENT}) gin_trgm_ops)'
+    )
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('DROP INDEX IF EXISTS employee_search_trgm_idx')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employees', '0005_employee_review_stats'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
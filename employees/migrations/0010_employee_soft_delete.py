@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:17
+
+import django.db.models.manager
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employees', '0009_employee_version'),
+    ]
+
+    operations = [
+        migrations.AlterModelManagers(
+            name='employee',
+            managers=[
+                ('all_objects', django.db.models.manager.Manager()),
+            ],
+        ),
+        migrations.AddField(
+            model_name='employee',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='employee',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['id'], name='employee_live_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='employee',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', False)), fields=['deleted_at'], name='employee_deleted_at_idx'),
+        ),
+    ]
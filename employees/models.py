@@ -1,4 +1,100 @@
 from django.db import models
+from django.db.models import Avg, Case, Count, F, FloatField, OuterRef, Q, Subquery, Sum, Value, When
+from django.db.models.functions import Cast, Coalesce, NullIf, Upper
+from django.utils import timezone
+
+
+class VersionConflict(Exception):
+    """
+    An employee row is no longer at the version an update was based on.
+    """
+
+
+class EmployeeQuerySet(models.QuerySet):
+    def live(self):
+        """
+        Employees that are not soft-deleted; see ``employees.deletion``.
+        """
+        return self.filter(deleted_at__isnull=True)
+
+    def by_identifier(self, identifier):
+        """
+        Filter by ID, or by first name / last name (case-insensitive).
+
+        Name lookups are a single query over both columns comparing
+        ``UPPER(column) = UPPER(value)``, which is exactly the expression of the
+        functional indexes in ``Meta.indexes``. A first-name match wins over a
+        last-name match, as before.
+        """
+        if identifier.isdigit():
+            return self.filter(id=identifier)
+        value = Upper(Value(identifier))
+        return self.alias(
+            first_name_upper=Upper('first_name'),
+            last_name_upper=Upper('last_name'),
+        ).filter(
+            Q(first_name_upper=value) | Q(last_name_upper=value)
+        ).order_by(
+            Case(When(first_name_upper=value, then=Value(0)), default=Value(1)),
+            'id',
+        )
+
+    def apply_review_delta(self, count, rating):
+        """
+        Adjust the denormalized review stats in place with a single ``UPDATE``.
+
+        Like every write that changes how an employee renders (its reviews
+        are nested in it), this moves ``updated_at``, for the change feed.
+
+        Args:
+            count (int): Change in number of reviews (e.g. ``1`` on create).
+            rating (int): Change in the sum of ratings.
+
+        Returns:
+            int: Number of employees updated.
+        """
+        review_count = F('review_count') + count
+        rating_total = F('rating_total') + rating
+        return self.update(
+            review_count=review_count,
+            rating_total=rating_total,
+            avg_rating=Cast(rating_total, FloatField()) / NullIf(review_count, 0),
+            updated_at=timezone.now(),
+        )
+
+    def refresh_review_stats(self):
+        """
+        Recompute the denormalized review stats from the ``Review`` table.
+
+        Used after set-based writes that bypass the model signals (bulk
+        inserts, ``QuerySet.update``) and to backfill.
+
+        Returns:
+            int: Number of employees updated.
+        """
+        reviews = Review.objects.filter(employee=OuterRef('pk')).order_by().values('employee')
+        return self.update(
+            review_count=Coalesce(Subquery(reviews.annotate(n=Count('*')).values('n')), 0),
+            rating_total=Coalesce(Subquery(reviews.annotate(total=Sum('rating')).values('total')), 0),
+            avg_rating=Subquery(reviews.annotate(average=Avg('rating', output_field=FloatField())).values('average')),
+            updated_at=timezone.now(),
+        )
+
+    def touch(self):
+        """
+        Mark the employees changed for the change feed, e.g. after an edit to
+        one of their reviews that leaves the stats alone.
+
+        Returns:
+            int: Number of employees updated.
+        """
+        return self.update(updated_at=timezone.now())
+
+
+class LiveEmployeeManager(models.Manager.from_queryset(EmployeeQuerySet)):
+    def get_queryset(self):
+        return super().get_queryset().live()
+
 
 class Employee(models.Model):
     first_name = models.CharField(max_length=100)
@@ -10,11 +106,103 @@ class Employee(models.Model):
     birth_date = models.DateField()
     hire_date = models.DateField()
     created_at = models.DateTimeField(auto_now_add=True)
+    # Also moved by writes to the employee's reviews; the change feed pages on it.
     updated_at = models.DateTimeField(auto_now=True)
+    # Denormalized from Review; maintained by employees.signals and
+    # EmployeeQuerySet.refresh_review_stats().
+    review_count = models.PositiveIntegerField(default=0, db_default=0, editable=False)
+    rating_total = models.PositiveIntegerField(default=0, db_default=0, editable=False)
+    avg_rating = models.FloatField(null=True, editable=False)
+    # Bumped by every write to the employee's own fields, not by review stats; see save_versioned().
+    version = models.PositiveIntegerField(default=1, db_default=1, editable=False)
+    # Set when soft-deleted; the row is purged later (employees.deletion).
+    deleted_at = models.DateTimeField(null=True, blank=True, editable=False)
+
+    # The default manager sees soft-deleted rows, so uniqueness checks still
+    # count their emails; ``objects`` is what every read goes through.
+    all_objects = EmployeeQuerySet.as_manager()
+    objects = LiveEmployeeManager()
+
+    class Meta:
+        indexes = [
+            models.Index(Upper('first_name'), name='employee_first_name_upper_idx'),
+            models.Index(Upper('last_name'), name='employee_last_name_upper_idx'),
+            # ?department= filters (ordered by id), ?ordering=department pages and the department summary.
+            models.Index(fields=['department', 'id'], name='employee_department_idx'),
+            # ?hire_date_after= / ?hire_date_before= ranges.
+            models.Index(fields=['hire_date'], name='employee_hire_date_idx'),
+            # Unfiltered pages of live employees skip tombstones without reading them.
+            models.Index(fields=['id'], condition=Q(deleted_at__isnull=True), name='employee_live_idx'),
+            # purge_employees finds expired tombstones without scanning live rows.
+            models.Index(fields=['deleted_at'], condition=Q(deleted_at__isnull=False), name='employee_deleted_at_idx'),
+            # Pages of the change feed (?since=).
+            models.Index(fields=['updated_at', 'id'], name='employee_updated_at_idx'),
+        ]
 
     def __str__(self):
         return f"{self.first_name} {self.last_name}"
 
+    def save_versioned(self, update_fields):
+        """
+        Save ``update_fields`` only if the row is still at ``self.version``.
+
+        The check and the write are the single statement
+        ``UPDATE ... SET <fields>, version = version + 1 WHERE id = %s AND version = %s``,
+        so concurrent writers never lock each other out; the loser gets
+        ``VersionConflict`` and can re-read and retry, or report it.
+
+        Args:
+            update_fields (list): Names of the changed fields.
+
+        Raises:
+            VersionConflict: If another write got there first.
+        """
+        self._expected_version = self.version
+        self._version_conflict = False
+        self.version += 1
+        try:
+            self.save(update_fields=[*update_fields, 'version', 'updated_at'])
+        finally:
+            self._expected_version = None
+        if self._version_conflict:
+            self.version -= 1
+            raise VersionConflict(f'Employee {self.pk} is no longer at version {self.version}.')
+
+    def _do_update(self, base_qs, using, pk_val, values, update_fields, forced_update):
+        expected_version = getattr(self, '_expected_version', None)
+        if expected_version is None:
+            return super()._do_update(base_qs, using, pk_val, values, update_fields, forced_update)
+        base_qs = base_qs.filter(version=expected_version)
+        # Report the conflict after save() returns: raising inside it would
+        # break the caller's transaction, and a missed update_fields save raises.
+        self._version_conflict = not super()._do_update(base_qs, using, pk_val, values, update_fields, forced_update)
+        return True
+
+
+class EmployeeTombstone(models.Model):
+    """
+    Records a hard-deleted employee for the change feed.
+
+    Soft-deleted employees are their own tombstones; these rows stand in for
+    employees whose row is gone. They are pruned with the soft-deleted
+    employees by ``purge_employees``.
+
+    Attributes:
+        employee_id (int): ID of the deleted employee.
+        deleted_at (datetime): When it was deleted.
+    """
+
+    employee_id = models.PositiveBigIntegerField()
+    deleted_at = models.DateTimeField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['deleted_at', 'employee_id'], name='tombstone_deleted_at_idx'),
+        ]
+
+    def __str__(self):
+        return f"Employee {self.employee_id} deleted at {self.deleted_at}"
+
 
 class Review(models.Model):
     """
@@ -42,6 +230,25 @@ class Review(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            # Serves one employee's reviews in creation order (EmployeeReviewPagination).
+            models.Index(fields=['employee', 'created_at', 'id'], name='review_employee_created_idx'),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance.remember_stats_values()
+        return instance
+
+    def remember_stats_values(self):
+        """
+        Snapshot the fields that feed ``Employee`` review stats, so a later
+        save or delete can apply the difference without re-reading the row.
+        """
+        self._stats_values = (self.__dict__.get('employee_id'), self.__dict__.get('rating'))
+
     def __str__(self):
         """
         Returns a string representation of the review object.
@@ -52,3 +259,54 @@ class Review(models.Model):
             str: The string representation of the review object.
         """
         return f"Review for {self.employee} - Rating: {self.rating}"
+
+
+class Job(models.Model):
+    """
+    A unit of background work, run by ``manage.py run_workers``.
+
+    Attributes:
+        kind (str): Name of the registered job type (see ``employees.jobs``).
+        status (str): ``queued``, ``running``, ``succeeded`` or ``failed``.
+        params (dict): Validated parameters for the job type.
+        progress_done / progress_total (int): Work done so far, in the job type's units.
+        result (dict): What the job produced, once it succeeded.
+        error (str): Why it failed.
+        attempts (int): Times a worker has started it.
+        worker (str): The worker running it, or that last ran it.
+        heartbeat_at (datetime): Refreshed while it runs; a stale one means its worker died.
+    """
+
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    SUCCEEDED = 'succeeded'
+    FAILED = 'failed'
+    STATUS_CHOICES = [
+        (QUEUED, 'Queued'),
+        (RUNNING, 'Running'),
+        (SUCCEEDED, 'Succeeded'),
+        (FAILED, 'Failed'),
+    ]
+
+    kind = models.CharField(max_length=50)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=QUEUED)
+    params = models.JSONField(default=dict)
+    progress_done = models.PositiveBigIntegerField(default=0)
+    progress_total = models.PositiveBigIntegerField(null=True)
+    result = models.JSONField(null=True)
+    error = models.TextField(blank=True)
+    attempts = models.PositiveIntegerField(default=0)
+    worker = models.CharField(max_length=100, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True)
+    heartbeat_at = models.DateTimeField(null=True)
+    finished_at = models.DateTimeField(null=True)
+
+    class Meta:
+        indexes = [
+            # Workers claim the oldest queued job of a kind and count running ones.
+            models.Index(fields=['status', 'kind', 'id'], name='job_status_kind_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} #{self.pk} ({self.status})"
@@ -0,0 +1,365 @@
+import json
+from base64 import b64decode, b64encode
+from datetime import timedelta
+from functools import partial, reduce
+from operator import or_
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework import status
+from rest_framework.exceptions import APIException, NotFound
+from rest_framework.pagination import BasePagination, LimitOffsetPagination
+from rest_framework.response import Response
+from rest_framework.utils.encoders import JSONEncoder
+from rest_framework.utils.urls import replace_query_param
+
+
+def keyset_filter(keys, position):
+    """
+    Build the lexicographic ``(k1, k2, ...) > (v1, v2, ...)`` filter.
+
+    Descending keys (``-k``) compare with ``<`` instead. The redundant
+    ``k1 >= v1`` bound lets the database seek into the index on the keys
+    rather than walk it from the start.
+
+    Args:
+        keys (tuple): Field names, optionally prefixed with ``-``.
+        position (list): The key values of the last row of the previous page.
+
+    Returns:
+        Q: ``k1 >= v1 AND (k1 > v1 OR (k1 = v1 AND k2 > v2) OR ...)``
+    """
+    clauses = []
+    for i, key in enumerate(keys):
+        equal = {k.lstrip('-'): v for k, v in zip(keys[:i], position[:i])}
+        lookup = f"{key.lstrip('-')}__{'lt' if key.startswith('-') else 'gt'}"
+        clauses.append(Q(**equal, **{lookup: position[i]}))
+    if len(clauses) == 1:
+        return clauses[0]
+    first = keys[0]
+    bound = Q(**{f"{first.lstrip('-')}__{'lte' if first.startswith('-') else 'gte'}": position[0]})
+    return bound & reduce(or_, clauses)
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset (cursor) pagination over a unique, indexed ordering.
+
+    Each page is fetched with ``WHERE (keys) > (last row's keys) ORDER BY keys
+    LIMIT page_size + 1``, so the cost of a page does not depend on how deep
+    into the table it is, unlike ``OFFSET``. Unless ``paginate_by_default`` is
+    set, pagination is opt-in: it is only applied when the request carries
+    ``page_size`` or ``cursor``, so existing clients of the unpaginated list
+    keep working.
+
+    Query parameters:
+        page_size: Number of rows per page (capped at ``max_page_size``).
+        cursor: Opaque token taken from the previous page's ``next`` link.
+        ordering: One of ``orderings``; a leading ``-`` pages in descending
+            order. The cursor only ever moves forward.
+    """
+
+    page_size = 100
+    max_page_size = 1000
+    page_size_query_param = 'page_size'
+    cursor_query_param = 'cursor'
+    ordering_query_param = 'ordering'
+    orderings = {
+        'id': ('id',),
+        '-id': ('-id',),
+        'email': ('email',),
+        '-email': ('-email',),
+        'department': ('department', 'id'),
+        '-department': ('-department', '-id'),
+    }
+    default_ordering = 'id'
+    paginate_by_default = False
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        queryset = self.get_page_queryset(queryset, request)
+        if queryset is None:
+            return None
+        return self.get_page(list(queryset))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """
+        ``paginate_queryset`` for async views, fetching the page with the async ORM.
+        """
+        queryset = self.get_page_queryset(queryset, request)
+        if queryset is None:
+            return None
+        return self.get_page([row async for row in queryset])
+
+    def get_page_queryset(self, queryset, request):
+        """
+        The unevaluated query for the requested page plus one look-ahead row,
+        or ``None`` if the request is not paginated.
+        """
+        params = request.query_params
+        paginated = self.page_size_query_param in params or self.cursor_query_param in params
+        if not (paginated or self.paginate_by_default):
+            return None
+
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.keys = self.get_keys(request)
+
+        queryset = queryset.order_by(*self.keys)
+        cursor = self.decode_cursor(request, queryset.model)
+        if cursor is not None:
+            queryset = queryset.filter(self.after(cursor))
+        return queryset[:self.page_size + 1]
+
+    def get_page(self, rows):
+        """
+        Trim the look-ahead row and remember where the next page starts.
+
+        ``rows`` are model instances or ``values()`` dicts that include the keys.
+        """
+        self.has_next = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        self.next_position = None
+        if self.has_next:
+            last = rows[-1]
+            get = last.__getitem__ if isinstance(last, dict) else partial(getattr, last)
+            self.next_position = [get(name) for name in self.get_key_names()]
+        return rows
+
+    def get_key_names(self):
+        return [key.lstrip('-') for key in self.keys]
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params.get(self.page_size_query_param, self.page_size))
+        except (TypeError, ValueError):
+            return self.page_size
+        return max(1, min(page_size, self.max_page_size))
+
+    def get_keys(self, request):
+        ordering = request.query_params.get(self.ordering_query_param, self.default_ordering)
+        return self.orderings.get(ordering, self.orderings[self.default_ordering])
+
+    def after(self, position):
+        """
+        The filter selecting rows after ``position``; see :func:`keyset_filter`.
+        """
+        return keyset_filter(self.keys, position)
+
+    def decode_cursor(self, request, model=None):
+        """
+        The position in the request's cursor, or ``None`` without one.
+
+        With ``model``, each value is converted by its key field's ``to_python()``.
+
+        Raises:
+            NotFound: If the cursor is malformed or was tampered with.
+        """
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            position = json.loads(b64decode(encoded.encode('ascii'), altchars=b'-_', validate=True))
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(position, list) or len(position) != len(self.keys):
+            raise NotFound(self.invalid_cursor_message)
+        if model is None:
+            return position
+        try:
+            position = [
+                model._meta.get_field(name).to_python(value) for name, value in zip(self.get_key_names(), position)
+            ]
+        except (ValidationError, TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        if None in position:
+            # Every ordering key is non-null.
+            raise NotFound(self.invalid_cursor_message)
+        return position
+
+    def encode_cursor(self, position):
+        return b64encode(json.dumps(position, cls=JSONEncoder).encode('utf-8'), altchars=b'-_').decode('ascii')
+
+    def get_next_link(self):
+        if self.next_position is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.next_position))
+
+
+class EmployeeReviewPagination(KeysetPagination):
+    """
+    Keyset pages of one employee's reviews by creation time, always paginated.
+
+    Pages are range scans of the ``(employee, created_at, id)`` index on
+    ``Review``; ``id`` breaks ties between reviews created together.
+    """
+
+    orderings = {
+        'created_at': ('created_at', 'id'),
+        '-created_at': ('-created_at', '-id'),
+    }
+    default_ordering = 'created_at'
+    paginate_by_default = True
+
+
+class JobPagination(KeysetPagination):
+    """
+    Keyset pages of background jobs, newest first, always paginated.
+    """
+
+    orderings = {
+        'id': ('id',),
+        '-id': ('-id',),
+    }
+    default_ordering = '-id'
+    paginate_by_default = True
+
+
+class ChangeFeedPagination(KeysetPagination):
+    """
+    Pages of the employee change feed, in ``(updated_at, id)`` order.
+
+    The cursor is ``?since=``. Every page, including the last, returns
+    ``since``: the cursor to resume from, which the consumer stores and
+    sends back on its next poll. ``since`` may also be an ISO 8601
+    timestamp, to start after a full export taken at that time.
+
+    Raises ``410 Gone`` for a cursor older than ``CHANGE_FEED_RETENTION_DAYS``:
+    deletions made since then may have been purged, so the consumer must
+    resynchronize from a full export.
+    """
+
+    cursor_query_param = 'since'
+    orderings = {
+        'updated_at': ('updated_at', 'id'),
+    }
+    default_ordering = 'updated_at'
+    paginate_by_default = True
+
+    def paginate_changes(self, fetch, request):
+        """
+        Fetch a page of changes.
+
+        Args:
+            fetch (callable): ``fetch(position, limit)`` returns up to ``limit``
+                changes after ``position`` (``None`` for the start), as dicts
+                with ``updated_at`` and ``id``.
+
+        Returns:
+            list: The page's changes.
+        """
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.keys = self.get_keys(request)
+        self.position = self.decode_cursor(request)
+        if self.position is not None and self.position[0] < timezone.now() - retention():
+            raise CursorExpired()
+        rows = self.get_page(fetch(self.position, self.page_size + 1))
+        if rows:
+            self.position = [rows[-1]['updated_at'], rows[-1]['id']]
+        return rows
+
+    def decode_cursor(self, request, model=None):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            moment = parse_datetime(encoded)
+        except ValueError:
+            raise NotFound(self.invalid_cursor_message)
+        if moment is not None:
+            return [moment if timezone.is_aware(moment) else timezone.make_aware(moment), 0]
+        updated_at, pk = super().decode_cursor(request)
+        try:
+            moment = parse_datetime(updated_at) if isinstance(updated_at, str) else None
+        except ValueError:
+            moment = None
+        if moment is None or not isinstance(pk, int):
+            raise NotFound(self.invalid_cursor_message)
+        return [moment, pk]
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'since': self.encode_cursor(self.position) if self.position is not None else None,
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        response = super().get_paginated_response_schema(schema)
+        response['properties']['since'] = {'type': 'string', 'nullable': True}
+        return response
+
+
+class CursorExpired(APIException):
+    status_code = status.HTTP_410_GONE
+    default_detail = 'This cursor is older than the change feed keeps deletions; resynchronize from a full export.'
+    default_code = 'cursor_expired'
+
+
+def retention():
+    return timedelta(days=getattr(settings, 'CHANGE_FEED_RETENTION_DAYS', 30))
+
+
+class RankedPagination(LimitOffsetPagination):
+    """
+    ``?limit=`` / ``?offset=`` pages over a ranked result sequence.
+
+    Relevance-ranked results have no stable key to page on, and are rarely
+    read past the first few pages, so this pages by offset. The total is never
+    counted: one extra row is fetched to tell whether there is a next page.
+    The response has the same ``{"next", "results"}`` shape as ``KeysetPagination``.
+    """
+
+    default_limit = 20
+    max_limit = 100
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.limit = self.get_limit(request)
+        self.offset = self.get_offset(request)
+        rows = list(queryset[self.offset:self.offset + self.limit + 1])
+        self.has_next = len(rows) > self.limit
+        return rows[:self.limit]
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        url = replace_query_param(self.request.build_absolute_uri(), self.limit_query_param, self.limit)
+        return replace_query_param(url, self.offset_query_param, self.offset + self.limit)
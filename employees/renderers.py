@@ -0,0 +1,37 @@
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to DRF's encoder.
+    orjson = None
+
+from rest_framework.renderers import JSONRenderer
+
+ORJSON_OPTIONS = (orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME) if orjson else 0
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    ``JSONRenderer`` that encodes with orjson when it is installed.
+
+    The output is byte-for-byte what ``JSONRenderer`` produces for the data our
+    serializers return: compact separators, raw UTF-8, U+2028/U+2029 escaped,
+    and dates, decimals and other non-JSON types converted by DRF's encoder.
+    The one known difference is float formatting outside [1e-4, 1e16)
+    (``1e-05`` vs ``0.00001``), which parses to the same number. Indented
+    output, ``UNICODE_JSON = False`` and values orjson rejects (such as
+    integers wider than 64 bits) are rendered by ``JSONRenderer``.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (
+            orjson is None
+            or data is None
+            or self.ensure_ascii
+            or not self.compact
+            or self.get_indent(accepted_media_type, renderer_context or {}) is not None
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(data, default=self.encoder_class().default, option=ORJSON_OPTIONS)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        return ret.replace('\u2028'.encode(), b'\\u2028').replace('\u2029'.encode(), b'\\u2029')
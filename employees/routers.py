@@ -0,0 +1,78 @@
+"""
+Primary/replica database routing.
+
+Reads made while serving a safe-method request (GET, HEAD, OPTIONS) go to a
+replica from ``settings.DATABASE_REPLICAS``; everything else goes to
+``default``. ``employees.middleware.ReplicaRoutingMiddleware`` decides per
+request and provides read-your-writes: a client that has just written is
+pinned to the primary for ``REPLICA_PIN_SECONDS``, and within a request, reads
+after a write or inside a transaction also go to the primary. All replica reads
+of one request go to the same replica. Work outside a
+request (management commands, shells) always uses the primary.
+"""
+import random
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+class RoutingState:
+    """
+    Whether the current request may read from a replica.
+
+    Shared by reference, so a write seen in a worker thread (``sync_to_async``)
+    is also seen by the request's later reads.
+    """
+
+    def __init__(self, use_replica, pinned=False):
+        self.use_replica = use_replica
+        self.pinned = pinned
+        self.wrote = False
+        # Picked on the first read, so every read of the request sees one replica's state.
+        self.replica = None
+
+
+routing_state = ContextVar('routing_state', default=None)
+
+
+def pinned_to_primary():
+    """
+    Whether the current request is from a client pinned to the primary after a write.
+    """
+    state = routing_state.get()
+    return state is not None and state.pinned
+
+
+def get_replicas():
+    return list(getattr(settings, 'DATABASE_REPLICAS', []))
+
+
+class PrimaryReplicaRouter:
+    def db_for_read(self, model, **hints):
+        state = routing_state.get()
+        replicas = get_replicas()
+        if state is None or not state.use_replica or state.wrote or not replicas:
+            return DEFAULT_DB_ALIAS
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            # Reads inside a transaction must see its own writes.
+            return DEFAULT_DB_ALIAS
+        if state.replica not in replicas:
+            state.replica = random.choice(replicas)
+        return state.replica
+
+    def db_for_write(self, model, **hints):
+        state = routing_state.get()
+        if state is not None:
+            state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *get_replicas()}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas receive schema changes through replication.
+        return db not in get_replicas()
@@ -0,0 +1,180 @@
+"""
+Ranked, typo-tolerant employee search over first name, last name, email and
+department.
+
+On PostgreSQL the query runs against a ``pg_trgm`` GIN index on
+``SEARCH_DOCUMENT`` (see migration 0006): rows match on substring or word
+similarity and rank by ``word_similarity``. Other databases use an in-process
+inverted index that matches whole words, prefixes and, for terms of three or
+more characters, words with similar trigrams. It is built on first use and
+rebuilt after employees change (tracked with the ``employees:search`` cache
+generation).
+"""
+import heapq
+import re
+import threading
+from bisect import bisect_left
+from collections import Counter, defaultdict
+from functools import cached_property
+
+from django.db import connection
+from django.db.models import BooleanField
+from django.db.models.expressions import RawSQL
+
+from .cache import SEARCH_NAMESPACE, get_generation
+from .models import Employee
+
+SEARCH_FIELDS = ('first_name', 'last_name', 'email', 'department')
+
+# Must match the expression of employee_search_trgm_idx exactly for the index to be used.
+SEARCH_DOCUMENT = "LOWER(first_name || ' ' || last_name || ' ' || email || ' ' || department)"
+
+# Minimum trigram similarity for a fuzzy (misspelt) word match in the in-process index.
+FUZZY_THRESHOLD = 0.3
+
+
+def search_employees(query):
+    """
+    Employees matching ``query``, best first.
+
+    Args:
+        query (str): Free text; every word must match on the in-process index.
+
+    Returns:
+        A sliceable sequence of ``(pk, score)`` pairs ordered by descending
+        score, then id. Slice it to fetch one page.
+    """
+    if connection.vendor == 'postgresql':
+        return postgres_search(query)
+    return get_index().search(query)
+
+
+def postgres_search(query):
+    text = query.lower()
+    pattern = '%' + re.sub(r'([\\%_])', r'\\\1', text) + '%'
+    return Employee.objects.annotate(
+        score=RawSQL(f'word_similarity(%s, {SEARCH_DOCUMENT})', (text,)),
+    ).filter(
+        RawSQL(f'({SEARCH_DOCUMENT} LIKE %s OR %s <%% {SEARCH_DOCUMENT})', (pattern, text), output_field=BooleanField()),
+    ).order_by('-score', 'id').values_list('pk', 'score')
+
+
+def tokenize(*texts):
+    return re.findall(r'[a-z0-9]+', ' '.join(texts).lower())
+
+
+def trigrams(word):
+    padded = f'  {word} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class SearchIndex:
+    """
+    Inverted index from lower-cased words to employee ids.
+
+    A query word scores 1 against an identical word and between 0.5 and 1
+    against a word it is a prefix of (closer to 1 the more of the word it
+    covers). A query word with neither matches misspelt words by trigram
+    similarity, scoring half the similarity. An employee's score is the mean
+    over query words of its best match; employees missing a query word are
+    excluded.
+    """
+
+    def __init__(self, rows):
+        self.postings = defaultdict(set)
+        self.documents = {}
+        for pk, *texts in rows:
+            tokens = tuple(set(tokenize(*texts)))
+            self.documents[pk] = tokens
+            for token in tokens:
+                self.postings[token].add(pk)
+        self.tokens = sorted(self.postings)
+
+    @cached_property
+    def trigram_tokens(self):
+        # Only needed for fuzzy matches, so built on the first one.
+        trigram_tokens = defaultdict(list)
+        for token in self.tokens:
+            for gram in trigrams(token):
+                trigram_tokens[gram].append(token)
+        return trigram_tokens
+
+    def match_tokens(self, term):
+        """
+        Score the indexed words that match one query word.
+        """
+        start = bisect_left(self.tokens, term)
+        scores = {
+            token: 1.0 if token == term else 0.5 + 0.5 * len(term) / len(token)
+            for token in self.tokens[start:bisect_left(self.tokens, term + '\uffff', lo=start)]
+        }
+        if scores or len(term) < 3:
+            return scores
+        grams = trigrams(term)
+        shared = Counter()
+        for gram in grams:
+            shared.update(self.trigram_tokens.get(gram, ()))
+        for token, common in shared.items():
+            similarity = common / (len(grams) + len(trigrams(token)) - common)
+            if similarity >= FUZZY_THRESHOLD:
+                scores[token] = similarity / 2
+        return scores
+
+    def search(self, query):
+        matches = [self.match_tokens(term) for term in dict.fromkeys(tokenize(query))]
+        if not matches or not all(matches):
+            return RankedHits({})
+        # Walk the postings of the most selective word only; check the other
+        # words against each surviving employee's own words.
+        matches.sort(key=lambda scores: sum(len(self.postings[token]) for token in scores))
+        totals = {}
+        for token, score in matches[0].items():
+            for pk in self.postings[token]:
+                if score > totals.get(pk, 0):
+                    totals[pk] = score
+        for scores in matches[1:]:
+            narrowed = {}
+            for pk, total in totals.items():
+                best = max((scores.get(token, 0) for token in self.documents[pk]), default=0)
+                if best:
+                    narrowed[pk] = total + best
+            totals = narrowed
+        return RankedHits({pk: total / len(matches) for pk, total in totals.items()})
+
+
+class RankedHits:
+    """
+    ``(pk, score)`` hits ordered by descending score, then id; only the
+    requested slice is ever sorted.
+    """
+
+    def __init__(self, scores):
+        self.scores = scores
+
+    def __len__(self):
+        return len(self.scores)
+
+    def __getitem__(self, index):
+        if not isinstance(index, slice) or index.step not in (None, 1):
+            raise TypeError('RankedHits only supports slicing.')
+        start, stop, _ = index.indices(len(self.scores))
+        top = heapq.nsmallest(stop, self.scores.items(), key=lambda hit: (-hit[1], hit[0]))
+        return top[start:]
+
+
+_index = None
+_index_generation = None
+_index_lock = threading.Lock()
+
+
+def get_index():
+    """
+    This process's ``SearchIndex``, rebuilt if employees changed since it was built.
+    """
+    global _index, _index_generation
+    generation = get_generation(SEARCH_NAMESPACE)
+    with _index_lock:
+        if _index is None or _index_generation != generation:
+            rows = Employee.objects.values_list('pk', *SEARCH_FIELDS).iterator(chunk_size=5000)
+            _index, _index_generation = SearchIndex(rows), generation
+        return _index
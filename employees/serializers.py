@@ -1,14 +1,275 @@
+import os
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
 from rest_framework import serializers
-from .models import Employee, Review
+from rest_framework.reverse import reverse
+from .export import EXPORT_FORMATS
+from .models import Employee, Job, Review
+
+
+class EagerLoadingMixin:
+    """
+    Lets a serializer build the queryset it needs to render without extra queries.
+
+    The relations are read off the declared fields: a nested ``many=True``
+    serializer becomes a ``Prefetch`` (recursively eager-loaded with the nested
+    serializer's own plan), a nested single serializer becomes a
+    ``select_related``, and every concrete model column the serializer reads
+    goes into ``only()``. ``PrimaryKeyRelatedField`` reads the ``*_id`` column
+    directly, so it never needs a join.
+    """
+
+    @classmethod
+    def setup_eager_loading(cls, queryset, required_fields=(), fields=None):
+        """
+        Apply ``select_related``/``prefetch_related``/``only`` for this serializer.
+
+        Args:
+            queryset (QuerySet): A queryset over ``Meta.model``.
+            required_fields (iterable): Extra model fields to load even if the
+                serializer does not render them.
+            fields (list): Sparse fieldset the serializer will be built with;
+                relations outside it are neither joined nor prefetched.
+
+        Returns:
+            QuerySet: The same queryset with the eager-loading plan applied.
+        """
+        model = cls.Meta.model
+        only = {model._meta.pk.name, *required_fields}
+        select_related = []
+        prefetches = []
+
+        for field in cls(fields=fields).fields.values():
+            if field.source == '*':
+                continue
+            source = field.source.split('.')[0]
+            try:
+                model_field = model._meta.get_field(source)
+            except FieldDoesNotExist:
+                continue
+
+            if isinstance(field, serializers.ListSerializer) and isinstance(field.child, EagerLoadingMixin):
+                # The prefetch joins children back on the FK column, so it must be loaded.
+                related_qs = field.child.setup_eager_loading(
+                    model_field.related_model._default_manager.all(),
+                    required_fields=[model_field.field.name] if model_field.one_to_many else (),
+                )
+                prefetches.append(Prefetch(source, queryset=related_qs))
+            elif isinstance(field, EagerLoadingMixin):
+                select_related.append(source)
+                only.add(source)
+            elif model_field.concrete:
+                only.add(model_field.name)
+
+        if select_related:
+            queryset = queryset.select_related(*select_related)
+        if prefetches:
+            queryset = queryset.prefetch_related(*prefetches)
+        return queryset.only(*only)
+
+
+def validate_row(serializer, data):
+    """
+    Validate ``data`` with an already-built serializer instance.
+
+    Building a ``ModelSerializer``'s fields is most of the cost of validating
+    one row, so bulk paths build a single instance and reuse it for every row,
+    the way ``ListSerializer`` reuses its child.
+
+    Args:
+        serializer (Serializer): An unbound serializer instance.
+        data: The incoming row.
+
+    Returns:
+        tuple: ``(validated_data, None)`` when valid, ``(None, errors)`` otherwise.
+    """
+    try:
+        return serializer.run_validation(data), None
+    except serializers.ValidationError as exc:
+        return None, exc.detail
+
 
+class SparseFieldsMixin:
+    """
+    Accepts a ``fields`` keyword limiting which declared fields are rendered.
+    """
 
-class ReviewSerializer(serializers.ModelSerializer):
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            unknown = set(fields) - set(self.fields)
+            if unknown:
+                raise serializers.ValidationError({'fields': [f"Unknown field(s): {', '.join(sorted(unknown))}."]})
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+
+class ReviewSerializer(SparseFieldsMixin, EagerLoadingMixin, serializers.ModelSerializer):
     class Meta:
         model = Review
         fields = '__all__'
+        # Soft-deleted employees take no new reviews.
+        extra_kwargs = {'employee': {'queryset': Employee.objects.all()}}
 
-class EmployeeSerializer(serializers.ModelSerializer):
+class EmployeeSerializer(SparseFieldsMixin, EagerLoadingMixin, serializers.ModelSerializer):
     reviews = ReviewSerializer(many=True, read_only=True)
     class Meta:
         model = Employee
-        fields = '__all__'
+        # Always null on the live employees the API serves.
+        exclude = ['deleted_at']
+
+    def update(self, instance, validated_data):
+        """
+        Write only the fields whose values change, conditioned on the version
+        ``instance`` was read at (see ``Employee.save_versioned``).
+
+        Raises:
+            VersionConflict: If the employee was written since it was read.
+        """
+        changed = [name for name, value in validated_data.items() if getattr(instance, name) != value]
+        if changed:
+            for name in changed:
+                setattr(instance, name, validated_data[name])
+            instance.save_versioned(changed)
+        return instance
+
+
+class EmployeeUpsertSerializer(EmployeeSerializer):
+    """
+    Validates incoming rows for bulk upsert.
+
+    Same rules as ``EmployeeSerializer`` except that email uniqueness is not
+    checked per row: an existing email means "update that employee", and the
+    caller resolves it with one query per batch.
+    """
+    class Meta(EmployeeSerializer.Meta):
+        extra_kwargs = {'email': {'validators': []}}
+
+
+class EmployeeChangeSerializer(serializers.Serializer):
+    """
+    One entry of the change feed (``employees.changes``): an upsert carrying
+    the employee as ``EmployeeSerializer`` renders it, or a deletion.
+    """
+    op = serializers.CharField()
+    id = serializers.IntegerField()
+    updated_at = serializers.DateTimeField()
+    employee = EmployeeSerializer(allow_null=True)
+
+
+class ReviewRowSerializer(ReviewSerializer):
+    """
+    Validates a review carried inline on an imported employee row.
+
+    The employee is the one described by the row, so only the review's own
+    fields are checked here.
+    """
+    class Meta(ReviewSerializer.Meta):
+        fields = ['rating', 'comments']
+
+
+class ReviewBulkSerializer(ReviewSerializer):
+    """
+    Validates incoming rows for bulk review creation.
+
+    ``employee`` is only checked to be a positive integer here; the caller
+    checks that the employees exist with one ``id__in`` query per batch
+    instead of one query per row.
+    """
+    employee = serializers.IntegerField(min_value=1)
+
+    class Meta(ReviewSerializer.Meta):
+        fields = ['employee', 'rating', 'comments']
+
+
+class EmployeeBulkDeleteSerializer(serializers.Serializer):
+    """
+    Selects the employees to delete: an ``ids`` list or a whole ``department``.
+    """
+    ids = serializers.ListField(child=serializers.IntegerField(min_value=1), required=False, allow_empty=False)
+    department = serializers.CharField(required=False, max_length=100)
+
+    def validate(self, attrs):
+        if ('ids' in attrs) == ('department' in attrs):
+            raise serializers.ValidationError('Give either "ids" or "department".')
+        return attrs
+
+
+class EmployeeReviewSummarySerializer(SparseFieldsMixin, EagerLoadingMixin, serializers.ModelSerializer):
+    """
+    Per-employee review stats, read from the denormalized ``Employee`` columns.
+    """
+    class Meta:
+        model = Employee
+        fields = ['id', 'first_name', 'last_name', 'department', 'review_count', 'avg_rating']
+
+
+class EmployeeSearchResultSerializer(SparseFieldsMixin, EagerLoadingMixin, serializers.ModelSerializer):
+    """
+    A search hit: the searched fields plus its relevance ``score``.
+    """
+    score = serializers.FloatField(read_only=True)
+
+    class Meta:
+        model = Employee
+        fields = ['id', 'first_name', 'last_name', 'email', 'department', 'score']
+
+
+class JobSerializer(serializers.ModelSerializer):
+    """
+    A background job as clients poll it; ``download`` links to its output file.
+    """
+    progress = serializers.SerializerMethodField()
+    download = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Job
+        fields = [
+            'id', 'kind', 'status', 'params', 'progress', 'result', 'error', 'attempts',
+            'created_at', 'started_at', 'finished_at', 'download',
+        ]
+
+    def get_progress(self, job):
+        return {'done': job.progress_done, 'total': job.progress_total}
+
+    def get_download(self, job):
+        if job.status != Job.SUCCEEDED or not (job.result or {}).get('file'):
+            return None
+        return reverse('job-download', kwargs={'pk': job.pk}, request=self.context.get('request'))
+
+
+class JobCreateSerializer(serializers.Serializer):
+    kind = serializers.CharField()
+    params = serializers.DictField(required=False, default=dict)
+
+
+class ExportJobParamsSerializer(serializers.Serializer):
+    file_format = serializers.ChoiceField(choices=EXPORT_FORMATS, default='csv')
+    gzip = serializers.BooleanField(default=False)
+    department = serializers.CharField(required=False, max_length=100)
+
+
+class ImportJobParamsSerializer(serializers.Serializer):
+    """
+    ``file`` names an upload in ``JOB_FILES_DIR``, as saved by the import endpoint.
+    """
+    file = serializers.CharField()
+    file_format = serializers.ChoiceField(choices=['csv', 'ndjson'])
+
+    def validate_file(self, value):
+        if os.path.basename(value) != value or not os.path.isfile(os.path.join(str(settings.JOB_FILES_DIR), value)):
+            raise serializers.ValidationError('No such upload.')
+        return value
+
+
+class DedupeJobParamsSerializer(serializers.Serializer):
+    batch_size = serializers.IntegerField(min_value=1, default=1000)
+    dry_run = serializers.BooleanField(default=False)
+
+
+class PurgeJobParamsSerializer(serializers.Serializer):
+    older_than_days = serializers.FloatField(min_value=0, required=False)
+    batch_size = serializers.IntegerField(min_value=1, required=False)
+    pause = serializers.FloatField(min_value=0, default=0.05)
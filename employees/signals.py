@@ -0,0 +1,80 @@
+from django.db import models
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .cache import (
+    EMPLOYEE_LIST_NAMESPACE, REVIEW_LIST_NAMESPACE, SEARCH_NAMESPACE, employee_namespace, invalidate, review_namespace,
+)
+from .db import record_connect
+from .instrumentation import install
+from .models import Employee, Review
+
+
+@receiver(post_save, sender=Employee)
+@receiver(post_delete, sender=Employee)
+def employee_changed(sender, instance, **kwargs):
+    """
+    Drop cached responses that render this employee, and the search index.
+    """
+    invalidate(employee_namespace(instance.pk), EMPLOYEE_LIST_NAMESPACE, SEARCH_NAMESPACE)
+
+
+@receiver(post_save, sender=Review)
+def review_saved(sender, instance, created, **kwargs):
+    """
+    Keep ``Employee.review_count``/``rating_total``/``avg_rating`` current on
+    review writes, move the employee's ``updated_at`` for the change feed, and
+    drop cached responses that render the review.
+    """
+    old_employee_id, old_rating = (None, None) if created else getattr(instance, '_stats_values', (None, None))
+    if created:
+        Employee.objects.filter(pk=instance.employee_id).apply_review_delta(1, instance.rating)
+    elif old_employee_id is None or old_rating is None:
+        # Saved from an instance that was never loaded from the database.
+        Employee.objects.filter(pk=instance.employee_id).refresh_review_stats()
+    elif old_employee_id != instance.employee_id:
+        Employee.objects.filter(pk=old_employee_id).apply_review_delta(-1, -old_rating)
+        Employee.objects.filter(pk=instance.employee_id).apply_review_delta(1, instance.rating)
+    elif old_rating != instance.rating:
+        Employee.objects.filter(pk=instance.employee_id).apply_review_delta(0, instance.rating - old_rating)
+    else:
+        # The stats are unchanged, but the employee renders this review.
+        Employee.objects.filter(pk=instance.employee_id).touch()
+
+    employee_ids = {instance.employee_id, old_employee_id} - {None}
+    invalidate_review(instance.pk, employee_ids)
+    instance.remember_stats_values()
+
+
+@receiver(post_delete, sender=Review)
+def review_deleted(sender, instance, origin=None, **kwargs):
+    """
+    Subtract a deleted review from its employee's stats and drop cached
+    responses that render it.
+
+    Stats are left alone when the review is being cascaded away with its employee.
+    """
+    origin_model = origin.model if isinstance(origin, models.QuerySet) else type(origin)
+    if origin_model is not Employee:
+        employee_id, rating = getattr(instance, '_stats_values', (None, None))
+        if employee_id is None or rating is None:
+            Employee.objects.filter(pk=instance.employee_id).refresh_review_stats()
+        else:
+            Employee.objects.filter(pk=employee_id).apply_review_delta(-1, -rating)
+    invalidate_review(instance.pk, {instance.employee_id})
+
+
+def invalidate_review(pk, employee_ids):
+    invalidate(
+        review_namespace(pk),
+        REVIEW_LIST_NAMESPACE,
+        EMPLOYEE_LIST_NAMESPACE,
+        *(employee_namespace(employee_id) for employee_id in employee_ids),
+    )
+
+
+@receiver(connection_created)
+def connection_opened(sender, connection, **kwargs):
+    record_connect(connection.alias)
+    install(connection)
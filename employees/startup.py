@@ -0,0 +1,65 @@
+"""
+Process start-up: work moved from a worker's first request to its boot.
+
+Django imports the URLconf, and with it every view, serializer and DRF
+module, on the first request a process serves, and compiles each route's
+regex the first time it is tried. A freshly scaled-out worker therefore
+answers its first request a few hundred milliseconds late. With
+``settings.STARTUP_WARM_UP``, ``wsgi.py`` and ``asgi.py`` call
+:func:`warm_up` before returning the application, so that cost is paid
+before the worker takes traffic (and, under ``gunicorn --preload``, once in
+the master rather than in every worker).
+
+``manage.py startup_profile`` measures these phases in a fresh interpreter.
+"""
+from django.conf import settings
+from django.urls import URLResolver, get_resolver
+from rest_framework.settings import api_settings
+
+# DRF settings imported lazily on a view's first request.
+API_SETTINGS = (
+    'DEFAULT_AUTHENTICATION_CLASSES',
+    'DEFAULT_PERMISSION_CLASSES',
+    'DEFAULT_THROTTLE_CLASSES',
+    'DEFAULT_CONTENT_NEGOTIATION_CLASS',
+    'DEFAULT_PARSER_CLASSES',
+    'DEFAULT_VERSIONING_CLASS',
+    'EXCEPTION_HANDLER',
+)
+
+
+def served_urlconfs():
+    """
+    The URLconfs a process may serve: ``ROOT_URLCONF`` and, if set, ``ASGI_URLCONF``.
+    """
+    return [urlconf for urlconf in (settings.ROOT_URLCONF, getattr(settings, 'ASGI_URLCONF', None)) if urlconf]
+
+
+def compile_routes(resolver):
+    """
+    Compile the regex of every route under ``resolver`` and build its reverse lookup tables.
+
+    Returns:
+        int: Routes compiled.
+    """
+    compiled = 0
+    for pattern in resolver.url_patterns:
+        pattern.pattern.regex
+        compiled += 1
+        if isinstance(pattern, URLResolver):
+            compiled += compile_routes(pattern)
+    resolver.reverse_dict
+    return compiled
+
+
+def warm_up(urlconfs=None):
+    """
+    Import the views of, and compile, every route in ``urlconfs`` (:func:`served_urlconfs` by default).
+
+    Returns:
+        int: Routes compiled.
+    """
+    compiled = sum(compile_routes(get_resolver(urlconf)) for urlconf in urlconfs or served_urlconfs())
+    for name in API_SETTINGS:
+        getattr(api_settings, name)
+    return compiled
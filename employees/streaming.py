@@ -0,0 +1,83 @@
+
+from django.http import StreamingHttpResponse
+from rest_framework.utils.encoders import JSONEncoder
+
+
+def iter_json_array(queryset, serializer_class, chunk_size=500):
+    """
+    Serialize a queryset as a JSON array, one chunk of rows at a time.
+
+    Rows are read with ``QuerySet.iterator()`` (a server-side cursor on
+    PostgreSQL), and any ``prefetch_related`` lookups are resolved per chunk,
+    so memory stays bounded by ``chunk_size`` rather than the table size.
+
+    Args:
+        queryset (QuerySet): The rows to serialize; should be ordered.
+        serializer_class (type): Serializer used for each chunk.
+        chunk_size (int): Rows fetched and serialized per step.
+
+    Yields:
+        str: Pieces of the JSON document.
+    """
+    encode = _chunk_encoder(serializer_class)
+    yield '['
+    separator = ''
+    batch = []
+    for obj in queryset.iterator(chunk_size=chunk_size):
+        batch.append(obj)
+        if len(batch) >= chunk_size:
+            yield separator + encode(batch)
+            separator = ','
+            batch = []
+    if batch:
+        yield separator + encode(batch)
+    yield ']'
+
+
+async def aiter_json_array(queryset, serializer_class, chunk_size=500):
+    """
+    :func:`iter_json_array` for async views, reading rows with ``QuerySet.aiterator()``.
+    """
+    encode = _chunk_encoder(serializer_class)
+    yield '['
+    separator = ''
+    batch = []
+    async for obj in queryset.aiterator(chunk_size=chunk_size):
+        batch.append(obj)
+        if len(batch) >= chunk_size:
+            yield separator + encode(batch)
+            separator = ','
+            batch = []
+    if batch:
+        yield separator + encode(batch)
+    yield ']'
+
+
+def _chunk_encoder(serializer_class):
+    encoder = JSONEncoder(ensure_ascii=False, separators=(',', ':'))
+
+    def encode(rows):
+        return ','.join(encoder.encode(item) for item in serializer_class(rows, many=True).data)
+
+    return encode
+
+
+def streaming_json_response(queryset, serializer_class, chunk_size=500):
+    """
+    Wrap :func:`iter_json_array` in a chunked ``StreamingHttpResponse``.
+    """
+    return StreamingHttpResponse(
+        iter_json_array(queryset, serializer_class, chunk_size=chunk_size),
+        content_type='application/json',
+    )
+
+
+def astreaming_json_response(queryset, serializer_class, chunk_size=500):
+    """
+    Wrap :func:`aiter_json_array` in a ``StreamingHttpResponse`` that ASGI
+    serves without buffering.
+    """
+    return StreamingHttpResponse(
+        aiter_json_array(queryset, serializer_class, chunk_size=chunk_size),
+        content_type='application/json',
+    )
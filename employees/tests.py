@@ -1,9 +1,67 @@
 
+import csv
+import datetime
+import gzip
+import io
+import json
+import os
+import tempfile
+from decimal import Decimal
+from io import StringIO
+from unittest import mock, skipUnless
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.core.management import call_command
+from django.db import connection, connections, router
+from django.db.models import F
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
-from rest_framework import status
+from django.utils import timezone
+from rest_framework import serializers, status
+from rest_framework.renderers import JSONRenderer
 from rest_framework.test import APITestCase
-from .models import Employee
+from .pagination import KeysetPagination
+from .middleware import REPLICA_PIN_COOKIE, ReplicaRoutingMiddleware
+from .models import Employee, EmployeeTombstone, Job
 from .models import Review
+from .cache import get_cache
+from .deletion import delete_employees, purge_employees
+from .export import EXPORT_COLUMNS, import_pyarrow, iter_export
+from .factories import seed_employees
+from .instrumentation import route_metrics, sql_shape
+from .jobs import claim, enqueue, job_file_path, requeue_stale, run_job
+from .management.commands.explain_queries import PlanChecker
+from .renderers import ORJSONRenderer
+from .serializers import ReviewSerializer
+from .throttling import HeavyRequestSlot, TokenBucket, get_throttle_cache
+from .values_serializers import ValuesSerializer
+from .views import EmployeeViewSet, PerformanceReviewViewSet, ReviewSummaryViewSet
+
+
+class QueryCountAssertionMixin:
+    """
+    Test helper for catching N+1 regressions on list/detail endpoints.
+    """
+
+    def assertConstantQueries(self, url, sizes=(1, 10), reviews_per_employee=2):
+        """
+        Assert that GET ``url`` issues the same number of queries as the table grows.
+
+        ``url`` may be a callable taking the employees seeded so far, for
+        endpoints whose URL depends on a created row.
+        """
+        counts = []
+        seeded = []
+        for size in sizes:
+            seeded += seed_employees(size - len(seeded), reviews_per_employee, start=len(seeded))
+            target = url(seeded) if callable(url) else url
+            with CaptureQueriesContext(connection) as ctx:
+                response = self.client.get(target)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            counts.append(len(ctx.captured_queries))
+        self.assertEqual(len(set(counts)), 1, f"query count grew with row count: {dict(zip(sizes, counts))}")
 
 class EmployeeAPITestCase(APITestCase):
     def setUp(self):
@@ -102,6 +160,1413 @@ class PerformanceReviewAPITestCase(APITestCase):
         self.assertEqual(Review.objects.count(), 2)
 
 
+class QueryCountTestCase(QueryCountAssertionMixin, APITestCase):
+    def test_list_employees_constant_queries(self):
+        """Listing employees prefetches reviews instead of querying per row."""
+        self.assertConstantQueries(reverse('employee-list'))
+
+    def test_retrieve_employee_constant_queries(self):
+        """Retrieving an employee loads its reviews in a single prefetch."""
+        self.assertConstantQueries(
+            lambda employees: reverse('employee-retrieve', kwargs={'identifier': employees[0].id}),
+            reviews_per_employee=5,
+        )
+
+    def test_list_reviews_constant_queries(self):
+        """Listing reviews does not join or query the employee per review."""
+        self.assertConstantQueries(reverse('review-list'))
+
+    def test_retrieve_review_constant_queries(self):
+        """Retrieving a review is a single query."""
+        self.assertConstantQueries(
+            lambda employees: reverse('review-detail', kwargs={'pk': employees[0].reviews.first().pk})
+        )
+
+
+class EmployeeListPaginationTestCase(APITestCase):
+    def setUp(self):
+        self.employees = seed_employees(7, reviews_per_employee=1)
+        self.list_url = reverse('employee-list')
+
+    def collect_pages(self, url):
+        ids = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            ids += [row['id'] for row in response.data['results']]
+            url = response.data['next']
+        return ids
+
+    def test_cursor_walks_every_employee_once(self):
+        """Following ``next`` links visits each employee exactly once, in id order."""
+        ids = self.collect_pages(f"{self.list_url}?page_size=3")
+        self.assertEqual(ids, sorted(employee.id for employee in self.employees))
+
+    def test_cursor_by_department(self):
+        """``ordering=department`` pages on (department, id)."""
+        ids = self.collect_pages(f"{self.list_url}?page_size=2&ordering=department")
+        expected = Employee.objects.order_by('department', 'id').values_list('id', flat=True)
+        self.assertEqual(ids, list(expected))
+
+    def test_invalid_cursor(self):
+        """A tampered cursor is rejected instead of silently restarting."""
+        response = self.client.get(f"{self.list_url}?cursor=not-a-cursor")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        for position in (['abc'], [None], [[1]]):
+            cursor = KeysetPagination().encode_cursor(position)
+            response = self.client.get(self.list_url, {'page_size': 2, 'cursor': cursor})
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND, position)
+
+    def test_stream_matches_list(self):
+        """The streamed array has the same content as the regular list."""
+        response = self.client.get(f"{self.list_url}?stream=1")
+        self.assertTrue(response.streaming)
+        streamed = json.loads(b''.join(response.streaming_content))
+        self.assertEqual(streamed, json.loads(self.client.get(self.list_url).content))
+
+
+class EmployeeIdentifierLookupTestCase(APITestCase):
+    def setUp(self):
+        self.surname_smith = Employee.objects.create(
+            first_name="Ada", last_name="Smith", email="ada.smith@example.com",
+            contact_number="1", contact_info="1 St", department="HR",
+            birth_date="1990-01-01", hire_date="2020-01-01",
+        )
+        self.given_smith = Employee.objects.create(
+            first_name="Smith", last_name="Lovelace", email="smith.lovelace@example.com",
+            contact_number="2", contact_info="2 St", department="HR",
+            birth_date="1990-01-01", hire_date="2020-01-01",
+        )
+
+    def test_lookup_is_case_insensitive_on_last_name(self):
+        """A last name resolves regardless of case."""
+        response = self.client.get(reverse('employee-retrieve', kwargs={'identifier': 'LOVELACE'}))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['id'], self.given_smith.id)
+
+    def test_first_name_match_wins_in_a_single_query(self):
+        """First-name matches take precedence and both columns are searched at once."""
+        with CaptureQueriesContext(connection) as ctx:
+            employee = Employee.objects.by_identifier('smith').first()
+        self.assertEqual(employee, self.given_smith)
+        self.assertEqual(len(ctx.captured_queries), 1)
+
+    def test_unknown_name_is_404(self):
+        """An identifier that matches nobody is a 404, not an empty employee."""
+        response = self.client.get(reverse('employee-retrieve', kwargs={'identifier': 'nobody'}))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_delete_by_last_name(self):
+        """Delete accepts a last name, like retrieve and update."""
+        response = self.client.delete(reverse('employee-delete', kwargs={'identifier': 'lovelace'}))
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertFalse(Employee.objects.filter(id=self.given_smith.id).exists())
+
+
+class EmployeeBulkUpsertTestCase(APITestCase):
+    def setUp(self):
+        self.bulk_url = reverse('employee-bulk')
+        self.existing = seed_employees(1)[0]
+
+    def row(self, i, **overrides):
+        return {
+            "first_name": f"Bulk{i}",
+            "last_name": "Row",
+            "email": f"bulk{i}@example.com",
+            "contact_number": "1234567890",
+            "contact_info": "1 Bulk St",
+            "department": "Engineering",
+            "birth_date": "1990-01-01",
+            "hire_date": "2020-01-01",
+            **overrides,
+        }
+
+    def test_json_array_creates_updates_and_reports_errors(self):
+        """Rows are upserted on email and each gets its own result."""
+        rows = [
+            self.row(1),
+            self.row(2, email=self.existing.email, department="HR"),
+            self.row(3, email="not-an-email"),
+            self.row(4, email="bulk1@example.com"),
+        ]
+        response = self.client.post(self.bulk_url, rows, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual((response.data['created'], response.data['updated'], response.data['error']), (1, 1, 2))
+        self.assertEqual([r['status'] for r in response.data['results']], ['created', 'updated', 'error', 'error'])
+        self.assertEqual(response.data['results'][1]['id'], self.existing.id)
+        self.existing.refresh_from_db()
+        self.assertEqual(self.existing.department, "HR")
+        self.assertEqual(Employee.objects.count(), 2)
+
+    def test_ndjson_body(self):
+        """An NDJSON body is accepted line by line."""
+        body = "\n".join(json.dumps(self.row(i)) for i in range(3)) + "\n"
+        response = self.client.post(self.bulk_url, body, content_type='application/x-ndjson')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['created'], 3)
+
+    def test_uniqueness_checked_once_per_batch(self):
+        """Validation does not query per row; a batch costs a fixed number of queries."""
+        rows = [self.row(i) for i in range(50)]
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.post(self.bulk_url, rows, format='json')
+        self.assertEqual(response.data['created'], 50)
+        self.assertLess(len(ctx.captured_queries), 10)
+
+    def test_rejects_non_list_body(self):
+        """A single object is not a bulk payload."""
+        response = self.client.post(self.bulk_url, self.row(1), format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class ImportEmployeesCommandTestCase(TestCase):
+    def write(self, suffix, content):
+        handle = tempfile.NamedTemporaryFile('w', suffix=suffix, delete=False, encoding='utf-8')
+        self.addCleanup(os.remove, handle.name)
+        with handle:
+            handle.write(content)
+        return handle.name
+
+    def test_csv_import_with_reviews_and_rejects(self):
+        """CSV rows are upserted, a rating column becomes a review, bad rows are rejected."""
+        path = self.write('.csv', (
+            "first_name,last_name,email,contact_number,contact_info,department,birth_date,hire_date,rating,comments\n"
+            "Ann,Lee,ann@example.com,1,1 St,HR,1990-01-01,2020-01-01,5,Great\n"
+            "Bob,Ray,bob@example.com,2,2 St,HR,1990-01-01,2020-01-01,,\n"
+            "Bad,Row,not-an-email,3,3 St,HR,1990-01-01,2020-01-01,,\n"
+        ))
+        out, err = StringIO(), StringIO()
+        call_command('import_employees', path, stdout=out, stderr=err)
+        self.assertIn('2 rows loaded (2 created, 0 updated), 1 rejected', out.getvalue())
+        self.assertIn('line 4', err.getvalue())
+        self.assertEqual(Review.objects.get().employee.email, 'ann@example.com')
+
+    def test_ndjson_import_last_row_wins(self):
+        """A repeated email updates the same employee and keeps every review."""
+        seed_employees(1)
+        rows = [
+            {"first_name": "Old", "last_name": "Name", "email": "employee0@example.com", "contact_number": "1",
+             "contact_info": "1 St", "department": "HR", "birth_date": "1990-01-01", "hire_date": "2020-01-01",
+             "reviews": [{"rating": 3}]},
+            {"first_name": "New", "last_name": "Name", "email": "employee0@example.com", "contact_number": "1",
+             "contact_info": "1 St", "department": "HR", "birth_date": "1990-01-01", "hire_date": "2020-01-01",
+             "reviews": [{"rating": 4, "comments": "Better"}]},
+        ]
+        path = self.write('.ndjson', "\n".join(json.dumps(row) for row in rows) + "\nnot json\n")
+        out = StringIO()
+        call_command('import_employees', path, '--batch-size', '10', stdout=out, stderr=StringIO())
+        self.assertIn('1 rows loaded (0 created, 1 updated), 1 rejected', out.getvalue())
+        employee = Employee.objects.get()
+        self.assertEqual(employee.first_name, 'New')
+        self.assertEqual(sorted(employee.reviews.values_list('rating', flat=True)), [3, 4])
+        self.assertEqual(employee.avg_rating, 3.5)
+
+
+class DedupeEmployeesCommandTestCase(TestCase):
+    def setUp(self):
+        self.survivor, *self.duplicates = seed_employees(3, reviews_per_employee=1)
+        for employee, email in zip(self.duplicates, ["EMPLOYEE0@example.com", "Employee0@Example.com"]):
+            employee.email = email
+            employee.save()
+        self.other = seed_employees(1, start=10)[0]
+
+    def test_dry_run_changes_nothing(self):
+        """--dry-run reports the duplicates but leaves the table alone."""
+        out = StringIO()
+        call_command('dedupe_employees', '--dry-run', stdout=out)
+        self.assertIn('Would remove 2 duplicate employees across 1 emails and move 2 reviews', out.getvalue())
+        self.assertEqual(Employee.objects.count(), 4)
+
+    def test_keeps_lowest_id_and_moves_reviews(self):
+        """Duplicates are deleted in batches and their reviews move to the survivor."""
+        out = StringIO()
+        call_command('dedupe_employees', '--batch-size', '1', stdout=out)
+        self.assertIn('Removed 2 duplicate employees and moved 2 reviews', out.getvalue())
+        self.assertEqual(set(Employee.objects.all()), {self.survivor, self.other})
+        self.assertEqual(self.survivor.reviews.count(), 3)
+        self.survivor.refresh_from_db()
+        self.assertEqual(self.survivor.review_count, 3)
+        self.assertEqual(self.other.reviews.count(), 0)
+
+    def test_finds_duplicates_once(self):
+        """The window query runs once; each batch is one DELETE of employees, with tombstones."""
+        with CaptureQueriesContext(connection) as ctx:
+            call_command('dedupe_employees', '--batch-size', '1', stdout=StringIO())
+        sql = [query['sql'] for query in ctx.captured_queries]
+        self.assertEqual(len([query for query in sql if 'ROW_NUMBER' in query]), 1)
+        self.assertEqual(len([query for query in sql if query.startswith('DELETE FROM "employees_employee"')]), 2)
+        self.assertEqual(
+            set(EmployeeTombstone.objects.values_list('employee_id', flat=True)),
+            {employee.id for employee in self.duplicates},
+        )
+
+
+class ListFilteringTestCase(APITestCase):
+    def setUp(self):
+        self.employees = seed_employees(12, reviews_per_employee=2)
+        self.list_url = reverse('employee-list')
+        self.list_reviews_url = reverse('review-list')
+
+    def test_filter_by_department_and_hire_date_range(self):
+        """Filters combine and are applied in SQL."""
+        response = self.client.get(self.list_url, {
+            'department': 'Sales', 'hire_date_after': '2000-01-02', 'hire_date_before': '2000-01-08',
+        })
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        expected = Employee.objects.filter(
+            department='Sales', hire_date__range=('2000-01-02', '2000-01-08')
+        ).values_list('id', flat=True)
+        self.assertEqual(sorted(row['id'] for row in response.data), sorted(expected))
+
+    def test_malformed_filter_value(self):
+        """A bad date is a validation error naming the parameter."""
+        response = self.client.get(self.list_url, {'hire_date_after': 'yesterday'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('hire_date_after', response.data)
+
+    def test_ordering(self):
+        """``?ordering=-id`` sorts descending."""
+        response = self.client.get(self.list_url, {'ordering': '-id'})
+        ids = [row['id'] for row in response.data]
+        self.assertEqual(ids, sorted(ids, reverse=True))
+
+    def test_sparse_fields_skip_reviews(self):
+        """``?fields=`` narrows the payload and never touches the reviews table."""
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(self.list_url, {'fields': 'id,first_name,department'})
+        self.assertEqual(set(response.data[0]), {'id', 'first_name', 'department'})
+        self.assertEqual(len(ctx.captured_queries), 1)
+        self.assertNotIn('employees_review', ctx.captured_queries[0]['sql'])
+        self.assertNotIn('contact_info', ctx.captured_queries[0]['sql'])
+
+    def test_unknown_sparse_field(self):
+        """Asking for a field that does not exist is a 400."""
+        response = self.client.get(self.list_url, {'fields': 'id,salary'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_review_rating_filters(self):
+        """Review lists filter by employee and rating range."""
+        employee = self.employees[0]
+        response = self.client.get(self.list_reviews_url, {'employee': employee.id, 'min_rating': 2})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([row['rating'] for row in response.data], [2])
+
+
+class ReviewSummaryTestCase(APITestCase):
+    def setUp(self):
+        self.employee, self.other = seed_employees(2)
+        self.list_reviews_url = reverse('review-list')
+
+    def assertStats(self, employee, count, average):
+        employee.refresh_from_db()
+        self.assertEqual(employee.review_count, count)
+        self.assertEqual(employee.avg_rating, average)
+
+    def test_stats_follow_review_writes(self):
+        """Creating, re-rating, moving and deleting reviews keeps the stats exact."""
+        for rating in (2, 4):
+            self.client.post(self.list_reviews_url, {"employee": self.employee.id, "rating": rating}, format='json')
+        self.assertStats(self.employee, 2, 3.0)
+
+        review = self.employee.reviews.get(rating=2)
+        detail_url = reverse('review-detail', kwargs={'pk': review.pk})
+        self.client.patch(detail_url, {"rating": 5}, format='json')
+        self.assertStats(self.employee, 2, 4.5)
+
+        self.client.patch(detail_url, {"employee": self.other.id}, format='json')
+        self.assertStats(self.employee, 1, 4.0)
+        self.assertStats(self.other, 1, 5.0)
+
+        self.client.delete(detail_url)
+        self.assertStats(self.other, 0, None)
+
+    def test_refresh_matches_incremental(self):
+        """A full recompute agrees with the incrementally maintained values."""
+        Review.objects.create(employee=self.employee, rating=1)
+        Review.objects.create(employee=self.employee, rating=4)
+        before = Employee.objects.values_list('review_count', 'rating_total', 'avg_rating').get(pk=self.employee.pk)
+        Employee.objects.update(review_count=0, rating_total=0, avg_rating=None)
+        Employee.objects.refresh_review_stats()
+        after = Employee.objects.values_list('review_count', 'rating_total', 'avg_rating').get(pk=self.employee.pk)
+        self.assertEqual(before, after)
+
+    def test_summary_endpoints(self):
+        """Per-employee and per-department summaries read the denormalized stats."""
+        Review.objects.create(employee=self.employee, rating=5)
+        Review.objects.create(employee=self.employee, rating=3)
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse('review-summary-employees'), {'department': self.employee.department})
+        self.assertEqual(len(ctx.captured_queries), 1)
+        self.assertEqual(response.data, [{
+            'id': self.employee.id, 'first_name': self.employee.first_name, 'last_name': self.employee.last_name,
+            'department': self.employee.department, 'review_count': 2, 'avg_rating': 4.0,
+        }])
+
+        response = self.client.get(reverse('review-summary-departments'))
+        by_department = {row['department']: row for row in response.data}
+        self.assertEqual(by_department[self.employee.department]['review_count'], 2)
+        self.assertEqual(by_department[self.employee.department]['avg_rating'], 4.0)
+        self.assertIsNone(by_department[self.other.department]['avg_rating'])
+
+
+class ResponseCacheTestCase(APITestCase):
+    def setUp(self):
+        get_cache().clear()
+        self.employee, self.other = seed_employees(2, reviews_per_employee=1)
+        self.detail_url = reverse('employee-retrieve', kwargs={'identifier': self.employee.id})
+        self.other_url = reverse('employee-retrieve', kwargs={'identifier': self.other.id})
+
+    def get_counting_queries(self, url, **headers):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url, headers=headers)
+        return response, len(ctx.captured_queries)
+
+    def test_repeat_read_is_served_from_cache(self):
+        """The second GET does not touch the database and carries the same ETag."""
+        first, first_queries = self.get_counting_queries(self.detail_url)
+        second, second_queries = self.get_counting_queries(self.detail_url)
+        self.assertGreater(first_queries, 0)
+        self.assertEqual(second_queries, 0)
+        self.assertEqual(first.data, second.data)
+        self.assertEqual(first['ETag'], second['ETag'])
+
+    def test_if_none_match(self):
+        """A matching If-None-Match is answered with 304 and no body."""
+        etag = self.client.get(self.detail_url)['ETag']
+        response = self.client.get(self.detail_url, headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertFalse(response.content)
+
+    def test_review_write_invalidates_only_its_employee(self):
+        """A new review refreshes its employee's entry and leaves other employees cached."""
+        self.client.get(self.detail_url)
+        self.client.get(self.other_url)
+        self.client.post(reverse('review-list'), {"employee": self.employee.id, "rating": 5}, format='json')
+        # Read as another client; the writer itself is pinned and bypasses the cache.
+        del self.client.cookies[REPLICA_PIN_COOKIE]
+
+        response, queries = self.get_counting_queries(self.detail_url)
+        self.assertGreater(queries, 0)
+        self.assertEqual(len(response.data['reviews']), 2)
+        _, other_queries = self.get_counting_queries(self.other_url)
+        self.assertEqual(other_queries, 0)
+
+    def test_pinned_client_bypasses_cache(self):
+        """A client that just wrote is served from the primary, not a possibly stale entry."""
+        self.client.get(self.detail_url)
+        self.client.cookies[REPLICA_PIN_COOKIE] = '1'
+        _, queries = self.get_counting_queries(self.detail_url)
+        self.assertGreater(queries, 0)
+
+    def test_employee_update_invalidates_list(self):
+        """Updating an employee is visible in the next list response."""
+        list_url = reverse('employee-list')
+        self.client.get(list_url)
+        self.client.patch(
+            reverse('employee-update', kwargs={'identifier': self.employee.id}), {"department": "Legal"}, format='json'
+        )
+        departments = {row['id']: row['department'] for row in self.client.get(list_url).data}
+        self.assertEqual(departments[self.employee.id], "Legal")
+
+
+class EmployeeSearchTestCase(APITestCase):
+    def setUp(self):
+        get_cache().clear()
+        self.url = reverse('employee-search')
+        for first, last, email, department in [
+            ("Jonathan", "Smithers", "jsmithers@example.com", "Engineering"),
+            ("Jon", "Smith", "jon.smith@example.com", "Sales"),
+            ("Alice", "Jonas", "alice@example.com", "Engineering"),
+            ("Bob", "Stone", "bob@example.com", "HR"),
+        ]:
+            Employee.objects.create(
+                first_name=first, last_name=last, email=email, department=department,
+                contact_number="1", contact_info="1 St", birth_date="1990-01-01", hire_date="2020-01-01",
+            )
+
+    def names(self, response):
+        return [f"{row['first_name']} {row['last_name']}" for row in response.data['results']]
+
+    def test_exact_then_prefix_ranking(self):
+        response = self.client.get(self.url, {'q': 'jon'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.names(response), ["Jon Smith", "Alice Jonas", "Jonathan Smithers"])
+        self.assertEqual(response.data['results'][0]['score'], 1.0)
+
+    def test_every_word_must_match(self):
+        response = self.client.get(self.url, {'q': 'jon smithers'})
+        self.assertEqual(self.names(response), ["Jonathan Smithers"])
+        response = self.client.get(self.url, {'q': 'engineering alice'})
+        self.assertEqual(self.names(response), ["Alice Jonas"])
+
+    def test_misspelling(self):
+        response = self.client.get(self.url, {'q': 'smyth'})
+        self.assertEqual(self.names(response), ["Jon Smith"])
+
+    def test_pages_and_fields(self):
+        response = self.client.get(self.url, {'q': 'example', 'limit': 3, 'fields': 'id,email'})
+        self.assertEqual(len(response.data['results']), 3)
+        self.assertEqual(set(response.data['results'][0]), {'id', 'email'})
+        rest = self.client.get(response.data['next'])
+        self.assertEqual(len(rest.data['results']), 1)
+        self.assertIsNone(rest.data['next'])
+
+    def test_sees_writes(self):
+        self.client.get(self.url, {'q': 'stone'})
+        Employee.objects.filter(last_name="Stone").delete()
+        Employee.objects.create(
+            first_name="Carol", last_name="Stoner", email="carol@example.com", department="HR",
+            contact_number="1", contact_info="1 St", birth_date="1990-01-01", hire_date="2020-01-01",
+        )
+        self.assertEqual(self.names(self.client.get(self.url, {'q': 'stone'})), ["Carol Stoner"])
+
+    def test_query_required(self):
+        response = self.client.get(self.url, {'q': ' '})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('q', response.data)
+
+
+class BenchmarkApiCommandTestCase(TestCase):
+    def test_every_route_has_a_scenario(self):
+        from employees.management.commands.benchmark_api import SCENARIOS, routes
+        self.assertCountEqual(routes(), SCENARIOS)
+
+    def test_report_and_rollback(self):
+        """A small run reports every route, succeeds on each call, and leaves no rows behind."""
+        from employees.management.commands.benchmark_api import SCENARIOS
+        out = StringIO()
+        call_command('benchmark_api', employees=20, requests=3, stdout=out, stderr=StringIO())
+        report = json.loads(out.getvalue())
+        self.assertEqual(report['meta']['employees'], 20)
+        self.assertEqual(len(report['routes']), len(SCENARIOS))
+        for route, result in report['routes'].items():
+            self.assertTrue(all(200 <= code < 300 for code in result['statuses']), route)
+            self.assertLessEqual(result['p50_ms'], result['p99_ms'])
+        self.assertFalse(Employee.objects.exists())
+
+
+class DatabaseMetricsTestCase(APITestCase):
+    def test_connection_stats(self):
+        """The metrics endpoint reports this worker's connection settings and usage."""
+        response = self.client.get(reverse('metrics-database'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['vendor'], connection.vendor)
+        self.assertEqual(response.data['pid'], os.getpid())
+        self.assertGreaterEqual(response.data['connects'], 1)
+        self.assertIsNone(response.data['pool'])
+
+
+@override_settings(DATABASE_REPLICAS=['replica'])
+class ReplicaRoutingTestCase(SimpleTestCase):
+    """Which database each read goes to, as seen from inside a request."""
+
+    def serve(self, request, write=False):
+        seen = []
+
+        def view(request):
+            seen.append(router.db_for_read(Employee))
+            if write:
+                router.db_for_write(Employee)
+                seen.append(router.db_for_read(Employee))
+            return HttpResponse()
+
+        response = ReplicaRoutingMiddleware(view)(request)
+        return response, seen
+
+    def test_safe_request_reads_from_replica_until_it_writes(self):
+        response, seen = self.serve(RequestFactory().get('/'), write=True)
+        self.assertEqual(seen, ['replica', 'default'])
+        self.assertIn(REPLICA_PIN_COOKIE, response.cookies)
+
+    def test_write_pins_client_to_primary(self):
+        response, seen = self.serve(RequestFactory().post('/'), write=True)
+        self.assertEqual(seen, ['default', 'default'])
+        self.assertEqual(response.cookies[REPLICA_PIN_COOKIE]['max-age'], 5)
+
+        request = RequestFactory().get('/')
+        request.COOKIES[REPLICA_PIN_COOKIE] = '1'
+        _, seen = self.serve(request)
+        self.assertEqual(seen, ['default'])
+
+    def test_outside_a_request_uses_primary(self):
+        self.assertEqual(router.db_for_read(Employee), 'default')
+
+    @override_settings(DATABASE_REPLICAS=['replica1', 'replica2', 'replica3'])
+    def test_one_replica_per_request(self):
+        def view(request):
+            seen.update(router.db_for_read(Employee) for _ in range(20))
+            return HttpResponse()
+
+        for _ in range(5):
+            seen = set()
+            ReplicaRoutingMiddleware(view)(RequestFactory().get('/'))
+            self.assertEqual(len(seen), 1)
+
+
+@override_settings(DATABASE_REPLICAS=['replica'])
+class ReplicaDatabaseTestCase(TransactionTestCase):
+    """
+    Reads, writes and the post-write pin through the API, with a second
+    database alias for the replica. Like ``'TEST': {'MIRROR': 'default'}``
+    (which settings.py sets for DATABASE_REPLICA_HOSTS), the alias connects to
+    the test database, so the "replica" has no replication lag.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        # Added here rather than in settings: the test runner would try to create its database.
+        connections.settings['replica'] = {**connections['default'].settings_dict}
+        cls.databases = {'default', 'replica'}
+        cls.addClassCleanup(cls.remove_replica)
+        super().setUpClass()
+
+    @classmethod
+    def remove_replica(cls):
+        connections['replica'].close()
+        del connections['replica']
+        del connections.settings['replica']
+
+    def setUp(self):
+        get_cache().clear()
+        self.employee = seed_employees(1)[0]
+
+    def queries(self, method, url, data=None):
+        """The response, and the number of queries it made on the primary and on the replica."""
+        with CaptureQueriesContext(connections['default']) as primary, \
+                CaptureQueriesContext(connections['replica']) as replica:
+            response = getattr(self.client, method)(url, data, format='json')
+        return response, len(primary.captured_queries), len(replica.captured_queries)
+
+    def test_reads_writes_and_pin(self):
+        list_url = reverse('employee-list')
+        response, primary, replica = self.queries('get', list_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual((primary, bool(replica)), (0, True))
+
+        payload = {
+            'first_name': 'Ann', 'last_name': 'Lee', 'email': 'ann@example.com', 'contact_number': '1',
+            'contact_info': '1 St', 'department': 'HR', 'birth_date': '1990-01-01', 'hire_date': '2020-01-01',
+        }
+        response, primary, replica = self.queries('post', reverse('employee-create'), payload)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual((bool(primary), replica), (True, 0))
+        self.assertIn(REPLICA_PIN_COOKIE, response.cookies)
+
+        # The pinned client reads its write from the primary...
+        response, primary, replica = self.queries('get', list_url)
+        self.assertEqual((bool(primary), replica), (True, 0))
+        self.assertIn('ann@example.com', [row['email'] for row in response.data])
+
+        # ...and from the replica once the pin has expired.
+        del self.client.cookies[REPLICA_PIN_COOKIE]
+        get_cache().clear()
+        response, primary, replica = self.queries('get', list_url)
+        self.assertEqual((primary, bool(replica)), (0, True))
+        self.assertIn('ann@example.com', [row['email'] for row in response.data])
+
+
+class AsyncReadEndpointsTestCase(TestCase):
+    """The async (ASGI) read views return what the sync (WSGI) views return."""
+
+    def setUp(self):
+        get_cache().clear()
+        self.employees = seed_employees(3, reviews_per_employee=2)
+        self.employee = self.employees[0]
+
+    async def assertSameResponse(self, url, **params):
+        sync_response = await sync_to_async(self.client.get)(url, params)
+        await sync_to_async(get_cache().clear)()
+        async_response = await self.async_client.get(url, params)
+        self.assertEqual(async_response.status_code, sync_response.status_code)
+        self.assertEqual(async_response.json(), sync_response.json())
+        return async_response
+
+    async def test_matches_sync_views(self):
+        employee_url = reverse('employee-retrieve', kwargs={'identifier': self.employee.id})
+        review = await self.employee.reviews.afirst()
+        await self.assertSameResponse(employee_url)
+        await self.assertSameResponse(reverse('employee-retrieve', kwargs={'identifier': 'last1'}))
+        await self.assertSameResponse(reverse('employee-retrieve', kwargs={'identifier': 'nobody'}))
+        await self.assertSameResponse(reverse('employee-list'))
+        await self.assertSameResponse(reverse('employee-list'), page_size=2, ordering='-id', fields='id,email')
+        await self.assertSameResponse(reverse('employee-list'), page_size=2)
+        await self.assertSameResponse(reverse('employee-list'), fields='nope')
+        await self.assertSameResponse(reverse('review-list'), employee=self.employee.id)
+        await self.assertSameResponse(reverse('review-detail', kwargs={'pk': review.pk}))
+
+    async def test_served_by_async_views(self):
+        """Under ASGI the read routes resolve to coroutine views; writes still work."""
+        response = await self.async_client.get(reverse('employee-list'), {'stream': 1})
+        content = b''.join([chunk async for chunk in response])
+        self.assertEqual(len(json.loads(content)), 3)
+        self.assertTrue(response.is_async)
+        self.assertTrue(iscoroutinefunction(response.resolver_match.func))
+
+        response = await self.async_client.post(
+            reverse('review-list'), {"employee": self.employee.id, "rating": 5}, content_type='application/json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        response = await self.async_client.get(reverse('employee-retrieve', kwargs={'identifier': self.employee.id}))
+        self.assertEqual(response.json()['review_count'], 3)
+
+
+class FastPathSerializationTestCase(APITestCase):
+    def setUp(self):
+        get_cache().clear()
+        self.employees = seed_employees(3, reviews_per_employee=2)
+        Employee.objects.filter(pk=self.employees[0].pk).update(first_name='Zoë', last_name='Ünal\u2028')
+        Review.objects.filter(pk=self.employees[1].reviews.first().pk).update(comments=None)
+
+    def assertSameBytes(self, viewset, url, params=None):
+        """The values() fast path renders exactly what the serializer and JSONRenderer do."""
+        responses = []
+        for fast in (True, False):
+            get_cache().clear()
+            renderers = viewset.renderer_classes if fast else [JSONRenderer]
+            with mock.patch.object(viewset, 'values_serialization', fast), \
+                    mock.patch.object(viewset, 'renderer_classes', renderers):
+                response = self.client.get(url, params, HTTP_ACCEPT='application/json')
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            responses.append(response.content)
+        self.assertEqual(responses[0], responses[1])
+
+    def test_employee_list_matches_serializer(self):
+        url = reverse('employee-list')
+        self.assertSameBytes(EmployeeViewSet, url)
+        self.assertSameBytes(EmployeeViewSet, url, {'fields': 'email,id'})
+        self.assertSameBytes(EmployeeViewSet, url, {'page_size': 2, 'ordering': '-department'})
+
+    def test_review_endpoints_match_serializer(self):
+        self.assertSameBytes(PerformanceReviewViewSet, reverse('review-list'))
+        self.assertSameBytes(PerformanceReviewViewSet, reverse('review-list'), {'fields': 'created_at,rating'})
+        self.assertSameBytes(ReviewSummaryViewSet, reverse('review-summary-employees'), {'page_size': 2})
+
+    def test_employee_list_queries(self):
+        """Nested reviews cost one extra query, as with prefetch_related."""
+        render = mock.patch.object(ValuesSerializer, 'to_representation', autospec=True,
+                                   side_effect=ValuesSerializer.to_representation)
+        with render as to_representation, CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse('employee-list'), HTTP_ACCEPT='application/json')
+        self.assertTrue(to_representation.called)
+        self.assertEqual(len(ctx.captured_queries), 2)
+        self.assertEqual(len(response.data[0]['reviews']), 2)
+
+    def test_uncompilable_serializer_falls_back(self):
+        class ReviewWithNameSerializer(ReviewSerializer):
+            employee_name = serializers.CharField(source='employee.first_name')
+
+        self.assertIsNone(ValuesSerializer.for_serializer(ReviewWithNameSerializer))
+        self.assertIsNotNone(ValuesSerializer.for_serializer(ReviewSerializer, ['rating']))
+
+    def test_fieldsets_share_a_plan(self):
+        """Repeated or reordered ``?fields=`` names do not compile (and cache) new plans."""
+        plan = ValuesSerializer.for_serializer(ReviewSerializer, ['id', 'rating'])
+        self.assertIs(ValuesSerializer.for_serializer(ReviewSerializer, ['rating', 'id', 'rating']), plan)
+        response = self.client.get(reverse('review-list'), {'fields': 'rating,id,id'})
+        self.assertEqual(list(response.data[0]), ['id', 'rating'])
+
+    def test_orjson_renderer_matches_json_renderer(self):
+        data = {
+            'text': 'Zoë \u2028\u2029 "quoted" </script>',
+            'when': timezone.now(),
+            'day': datetime.date(2024, 2, 29),
+            'amount': Decimal('1.50'),
+            'nested': [{'none': None, 'flag': True, 'n': 2 ** 40, 'x': 0.1}],
+        }
+        self.assertEqual(ORJSONRenderer().render(data), JSONRenderer().render(data))
+        self.assertEqual(ORJSONRenderer().render({'big': 2 ** 70}), JSONRenderer().render({'big': 2 ** 70}))
+
+
+class BulkReviewTestCase(APITestCase):
+    def setUp(self):
+        get_cache().clear()
+        self.employee, self.other = seed_employees(2)
+        self.url = reverse('review-bulk')
+
+    def test_bulk_create(self):
+        """Valid rows are created and stats updated; bad rows are reported by index."""
+        rows = [
+            {'employee': self.employee.id, 'rating': 5, 'comments': 'Great'},
+            {'employee': self.other.id, 'rating': 2},
+            {'employee': 999999, 'rating': 3},
+            {'employee': self.employee.id, 'rating': 9},
+            {'employee': self.employee.id, 'rating': 3},
+        ]
+        response = self.client.post(self.url, rows, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual((response.data['created'], response.data['error']), (3, 2))
+        self.assertEqual([result['status'] for result in response.data['results']],
+                         ['created', 'created', 'error', 'error', 'created'])
+        self.assertIn('employee', response.data['results'][2]['errors'])
+        self.assertIn('rating', response.data['results'][3]['errors'])
+        self.assertEqual(Review.objects.get(pk=response.data['results'][0]['id']).comments, 'Great')
+
+        self.employee.refresh_from_db()
+        self.assertEqual((self.employee.review_count, self.employee.avg_rating), (2, 4.0))
+
+    def test_employee_lookup_is_one_query(self):
+        """Employee IDs are checked once per batch, not once per row."""
+        counts = []
+        for size in (2, 20):
+            rows = [{'employee': (self.employee, self.other)[n % 2].id, 'rating': 4} for n in range(size)]
+            with CaptureQueriesContext(connection) as ctx:
+                response = self.client.post(self.url, rows, format='json')
+            self.assertEqual(response.data['created'], size)
+            counts.append(len(ctx.captured_queries))
+        self.assertEqual(counts[0], counts[1])
+
+    def test_ndjson_body(self):
+        body = f'{{"employee": {self.employee.id}, "rating": 4}}\n\n{{"employee": {self.other.id}, "rating": 1}}\n'
+        response = self.client.post(self.url, body, content_type='application/x-ndjson')
+        self.assertEqual(response.data['created'], 2)
+
+    def test_invalidates_cached_reviews(self):
+        reviews_url = reverse('employee-reviews', kwargs={'employee_pk': self.employee.id})
+        self.assertEqual(self.client.get(reviews_url).data['results'], [])
+        self.client.post(self.url, [{'employee': self.employee.id, 'rating': 4}], format='json')
+        self.assertEqual(len(self.client.get(reviews_url).data['results']), 1)
+
+
+class EmployeeReviewsTestCase(APITestCase):
+    def setUp(self):
+        get_cache().clear()
+        self.employee, self.other = seed_employees(2, reviews_per_employee=5)
+        self.url = reverse('employee-reviews', kwargs={'employee_pk': self.employee.id})
+
+    def collect(self, params):
+        ids = []
+        response = self.client.get(self.url, params)
+        while True:
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            ids += [row['id'] for row in response.data['results']]
+            if not response.data['next']:
+                return ids
+            response = self.client.get(response.data['next'])
+
+    def test_pages_in_creation_order(self):
+        """Pages walk the employee's reviews by (created_at, id), ties included."""
+        tied = self.employee.reviews.order_by('id').values_list('id', flat=True)[:3]
+        Review.objects.filter(pk__in=list(tied)).update(created_at=timezone.now())
+        expected = list(self.employee.reviews.order_by('created_at', 'id').values_list('id', flat=True))
+        self.assertEqual(self.collect({'page_size': 2}), expected)
+        self.assertEqual(self.collect({'page_size': 2, 'ordering': '-created_at'}), expected[::-1])
+
+    def test_paginated_by_default(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(self.url, {'fields': 'id,rating'})
+        self.assertEqual(len(ctx.captured_queries), 1)
+        self.assertEqual(len(response.data['results']), 5)
+        self.assertEqual(set(response.data['results'][0]), {'id', 'rating'})
+        self.assertIsNone(response.data['next'])
+
+    def test_unknown_employee(self):
+        response = self.client.get(reverse('employee-reviews', kwargs={'employee_pk': 999999}))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_invalid_cursor(self):
+        for position in (['x', 'y'], [None, 1], ['2024-01-01T00:00:00Z']):
+            response = self.client.get(self.url, {'cursor': KeysetPagination().encode_cursor(position)})
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND, position)
+
+
+class ExplainQueriesCommandTestCase(TestCase):
+    def test_every_shape_uses_an_index(self):
+        out = StringIO()
+        call_command('explain_queries', employees=50, max_rows=0, stdout=out, stderr=StringIO())
+        self.assertIn('No query shape scans a large table.', out.getvalue())
+        self.assertFalse(Employee.objects.exists())
+
+    def test_sequential_scan_detected(self):
+        seed_employees(3)
+        checker = PlanChecker()
+        _, scans = checker.explain('SELECT id FROM employees_employee WHERE contact_number = %s', ['5550000000'])
+        self.assertEqual(scans, ['employees_employee'])
+        self.assertEqual(checker.rows('employees_employee'), 3)
+        _, scans = checker.explain('SELECT id FROM employees_employee WHERE department = %s', ['Sales'])
+        self.assertEqual(scans, [])
+
+
+class RequestMetricsTestCase(APITestCase):
+    def setUp(self):
+        get_cache().clear()
+        route_metrics.reset()
+        seed_employees(6, reviews_per_employee=1)
+
+    def test_server_timing_counts_queries(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse('employee-list'))
+        self.assertRegex(
+            response['Server-Timing'],
+            rf'^total;dur=[\d.]+, db;dur=[\d.]+;desc="{len(ctx.captured_queries)} queries", app;dur=[\d.]+$',
+        )
+
+    def test_metrics_per_route(self):
+        for _ in range(3):
+            get_cache().clear()
+            self.client.get(reverse('employee-list'))
+        self.client.get(reverse('review-list'))
+        self.client.get('/api/v1/no-such-route/')
+
+        routes = self.client.get(reverse('metrics-requests')).data['routes']
+        self.assertEqual(set(routes), {'GET employee-list', 'GET review-list'})
+        employee_list = routes['GET employee-list']
+        self.assertEqual((employee_list['count'], employee_list['n_plus_one']), (3, 0))
+        self.assertEqual(employee_list['queries'], {'p50': 2, 'p95': 2, 'p99': 2, 'max': 2})
+        self.assertLessEqual(employee_list['db_ms']['p50'], employee_list['wall_ms']['p50'])
+
+    def test_n_plus_one_flagged(self):
+        """Without eager loading, one query per employee's reviews is reported."""
+        with mock.patch.object(EmployeeViewSet, 'values_serialization', False), \
+                mock.patch.object(EmployeeViewSet, 'get_queryset', lambda view: Employee.objects.all()), \
+                self.assertLogs('employees.instrumentation', 'WARNING') as logs:
+            self.client.get(reverse('employee-list'))
+        self.assertIn('6 x SELECT', logs.output[0])
+        routes = self.client.get(reverse('metrics-requests')).data['routes']
+        self.assertEqual(routes['GET employee-list']['n_plus_one'], 1)
+
+    async def test_async_views_are_counted(self):
+        """Queries run in sync_to_async threads under ASGI count towards the request."""
+        response = await self.async_client.get(reverse('review-list'))
+        self.assertIn('desc="1 queries"', response['Server-Timing'])
+        routes = (await sync_to_async(route_metrics.snapshot)())['routes']
+        self.assertEqual(routes['GET review-list']['queries']['max'], 1)
+
+    def test_sql_shape_collapses_placeholder_lists(self):
+        self.assertEqual(sql_shape('SELECT id FROM t WHERE id IN (%s, %s,%s)'), 'SELECT id FROM t WHERE id IN (%s...)')
+        self.assertEqual(sql_shape('SELECT id FROM t WHERE a = %s AND b = %s'), 'SELECT id FROM t WHERE a = %s AND b = %s')
+
+
+class ExportTestCase(APITestCase):
+    def setUp(self):
+        self.employees = seed_employees(3, reviews_per_employee=2)
+        self.url = reverse('employee-export')
+
+    def read(self, response):
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return b''.join(response.streaming_content)
+
+    def test_csv(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename="employees.csv"')
+        rows = list(csv.DictReader(io.StringIO(self.read(response).decode('utf-8'))))
+        self.assertEqual([int(row['id']) for row in rows], [employee.id for employee in self.employees])
+        employee = self.employees[0]
+        employee.refresh_from_db()
+        last_review = employee.reviews.order_by('-created_at').first()
+        self.assertEqual(rows[0]['email'], employee.email)
+        self.assertEqual((rows[0]['review_count'], float(rows[0]['avg_rating'])), ('2', employee.avg_rating))
+        self.assertEqual(rows[0]['last_review_at'], str(last_review.created_at))
+
+    def test_gzip_and_filters(self):
+        response = self.client.get(self.url, {'gzip': 1, 'department': self.employees[1].department})
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename="employees.csv.gz"')
+        lines = gzip.decompress(self.read(response)).decode('utf-8').splitlines()
+        self.assertEqual(len(lines), 2)
+        self.assertTrue(lines[1].startswith(f'{self.employees[1].id},'))
+
+    def test_constant_queries(self):
+        """Rows are streamed by one query whatever the table size."""
+        counts = []
+        for start in (100, 200):
+            with CaptureQueriesContext(connection) as ctx:
+                self.read(self.client.get(self.url))
+            counts.append(len(ctx.captured_queries))
+            seed_employees(20, start=start, reviews_per_employee=1)
+        self.assertEqual(counts, [1, 1])
+
+    @skipUnless(import_pyarrow(), 'pyarrow is not installed')
+    def test_parquet(self):
+        pyarrow = import_pyarrow()
+        chunks = iter_export(file_format='parquet', chunk_size=2)
+        table = pyarrow.parquet.read_table(io.BytesIO(b''.join(chunks)))
+        self.assertEqual(table.column_names, EXPORT_COLUMNS)
+        self.assertEqual(table.column('id').to_pylist(), [employee.id for employee in self.employees])
+        self.assertEqual(table.column('review_count').to_pylist(), [2, 2, 2])
+        self.assertEqual(pyarrow.parquet.ParquetFile(io.BytesIO(b''.join(iter_export(
+            file_format='parquet', chunk_size=2)))).num_row_groups, 2)
+
+    def test_unknown_format(self):
+        response = self.client.get(self.url, {'file_format': 'xlsx'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('file_format', response.data)
+
+    def test_command(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'employees.csv.gz')
+            err = StringIO()
+            call_command('export_employees', path, stdout=StringIO(), stderr=err)
+            with gzip.open(path, 'rt', encoding='utf-8') as handle:
+                self.assertEqual(len(handle.read().splitlines()), 4)
+        self.assertRegex(err.getvalue(), r'Exported 3 rows, [\d.]+ MB in [\d.]+s \(\d+ rows/s')
+
+
+class OptimisticConcurrencyTestCase(APITestCase):
+    def setUp(self):
+        get_cache().clear()
+        self.employee, = seed_employees(1, reviews_per_employee=1)
+        self.retrieve_url = reverse('employee-retrieve', kwargs={'identifier': self.employee.id})
+        self.url = reverse('employee-update', kwargs={'identifier': self.employee.id})
+
+    def test_if_match(self):
+        etag = self.client.get(self.retrieve_url)['ETag']
+        self.assertRegex(etag, r'^"1-[0-9a-f]{32}"$')
+        response = self.client.patch(self.url, {'department': 'Legal'}, format='json', HTTP_IF_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['version'], 2)
+        self.assertEqual(response['ETag'], self.client.get(self.retrieve_url)['ETag'])
+
+        response = self.client.patch(self.url, {'department': 'Sales'}, format='json', HTTP_IF_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_412_PRECONDITION_FAILED)
+        self.assertEqual(Employee.objects.get(pk=self.employee.pk).department, 'Legal')
+
+    def test_patch_writes_changed_fields_once(self):
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.patch(self.url, {'department': 'Legal', 'first_name': self.employee.first_name}, format='json')
+        updates = [query['sql'] for query in ctx.captured_queries if query['sql'].startswith('UPDATE')]
+        self.assertEqual(len(updates), 1)
+        assignments = updates[0].split(' SET ')[1].split(' WHERE ')[0]
+        self.assertEqual(sorted(column.split(' = ')[0] for column in assignments.split(', ')),
+                         ['"department"', '"updated_at"', '"version"'])
+        self.assertIn('"version" = 1', updates[0].split(' WHERE ')[1])
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.patch(self.url, {'department': 'Legal'}, format='json')
+        self.assertEqual(response.data['version'], 2)
+        self.assertFalse(any(query['sql'].startswith('UPDATE') for query in ctx.captured_queries))
+
+    def test_lost_race(self):
+        """Without If-Match a lost race is retried on fresh data; with it, it fails."""
+        get_employee = EmployeeViewSet.get_employee
+        raced = []
+
+        def racing_get_employee(view, identifier, queryset=None):
+            employee = get_employee(view, identifier, queryset)
+            if not raced:
+                raced.append(True)
+                Employee.objects.filter(pk=employee.pk).update(version=F('version') + 1, last_name='Other')
+            return employee
+
+        with mock.patch.object(EmployeeViewSet, 'get_employee', racing_get_employee):
+            response = self.client.patch(self.url, {'department': 'Legal'}, format='json')
+        self.assertEqual((response.status_code, response.data['version']), (200, 3))
+        self.assertEqual(response.data['last_name'], 'Other')
+
+        raced.clear()
+        with mock.patch.object(EmployeeViewSet, 'get_employee', racing_get_employee):
+            response = self.client.patch(self.url, {'department': 'Sales'}, format='json', HTTP_IF_MATCH='"3-x"')
+        self.assertEqual(response.status_code, status.HTTP_412_PRECONDITION_FAILED)
+        self.assertEqual(Employee.objects.get(pk=self.employee.pk).department, 'Legal')
+
+    def test_bulk_upsert_bumps_version(self):
+        row = {field: getattr(self.employee, field) for field in (
+            'first_name', 'last_name', 'email', 'contact_number', 'contact_info', 'department', 'birth_date', 'hire_date'
+        )}
+        self.client.post(reverse('employee-bulk'), [{**row, 'department': 'HR'}], format='json')
+        self.assertEqual(Employee.objects.get(pk=self.employee.pk).version, 2)
+
+
+class EmployeeDeletionTestCase(APITestCase):
+    def setUp(self):
+        get_cache().clear()
+        self.employees = seed_employees(6, reviews_per_employee=3)
+
+    def delete_url(self, employee):
+        return reverse('employee-delete', kwargs={'identifier': employee.id})
+
+    def test_delete_without_loading_reviews(self):
+        """Deleting reviews is set-based: the query count does not grow with them."""
+        first, second = self.employees[:2]
+        Review.objects.bulk_create([Review(employee=second, rating=4) for _ in range(30)])
+        counts = []
+        for employee in (first, second):
+            with CaptureQueriesContext(connection) as ctx:
+                response = self.client.delete(self.delete_url(employee))
+            self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+            counts.append(len(ctx.captured_queries))
+        self.assertEqual(counts[0], counts[1])
+        self.assertFalse(Review.objects.filter(employee__in=[first, second]).exists())
+        self.assertEqual(Employee.all_objects.count(), 4)
+
+    def test_deleted_employee_is_not_served_from_cache(self):
+        employee = self.employees[0]
+        self.assertEqual(self.client.get(reverse('employee-retrieve', kwargs={'identifier': employee.id})).status_code, 200)
+        self.client.delete(self.delete_url(employee))
+        self.assertEqual(self.client.get(reverse('employee-retrieve', kwargs={'identifier': employee.id})).status_code, 404)
+
+    def test_batches(self):
+        with CaptureQueriesContext(connection) as ctx:
+            deleted = delete_employees(Employee.objects.all(), batch_size=4)
+        self.assertEqual(deleted, (6, 18))
+        deletes = [query['sql'] for query in ctx.captured_queries if query['sql'].startswith('DELETE')]
+        # Employees 1-4 (12 reviews, 3 batches), then 5-6 (6 reviews, 2
+        # batches), each followed by a sweep of late reviews.
+        self.assertEqual(len(deletes), 9)
+        self.assertFalse(Review.objects.exists())
+
+    def test_review_added_during_delete(self):
+        employee = self.employees[0]
+        added = []
+
+        def add_review(seconds):
+            # One review posted between the reviews' and the employee's deletes.
+            if not added:
+                added.append(Review.objects.create(employee=employee, rating=5))
+
+        with mock.patch('employees.deletion._pause', side_effect=add_review):
+            deleted = delete_employees(Employee.objects.filter(pk=employee.pk))
+        self.assertEqual(deleted, (1, 4))
+        self.assertFalse(Employee.all_objects.filter(pk=employee.pk).exists())
+        self.assertFalse(Review.objects.filter(employee_id=employee.pk).exists())
+
+    def test_bulk_delete(self):
+        url = reverse('employee-bulk-delete')
+        response = self.client.post(url, {'ids': [self.employees[0].id, 999999]}, format='json')
+        self.assertEqual(response.data, {'deleted': 1, 'reviews_deleted': 3})
+
+        department = self.employees[1].department
+        remaining = Employee.objects.filter(department=department).count()
+        response = self.client.post(url, {'department': department}, format='json')
+        self.assertEqual(response.data['deleted'], remaining)
+        self.assertFalse(Employee.objects.filter(department=department).exists())
+
+        for body in ({}, {'ids': [1], 'department': 'Sales'}, {'ids': []}):
+            self.assertEqual(self.client.post(url, body, format='json').status_code, status.HTTP_400_BAD_REQUEST)
+
+    @override_settings(EMPLOYEE_SOFT_DELETE=True)
+    def test_soft_delete_and_purge(self):
+        employee = self.employees[0]
+        self.assertEqual(self.client.delete(self.delete_url(employee)).status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(self.client.get(reverse('employee-retrieve', kwargs={'identifier': employee.id})).status_code, 404)
+        self.assertNotIn(employee.id, [row['id'] for row in self.client.get(reverse('employee-list')).data])
+        self.assertEqual(self.client.delete(self.delete_url(employee)).status_code, status.HTTP_404_NOT_FOUND)
+        self.assertIsNotNone(Employee.all_objects.get(pk=employee.pk).deleted_at)
+        self.assertEqual(Review.objects.filter(employee=employee).count(), 3)
+
+        # Tombstones keep their emails until purged.
+        payload = {field: str(getattr(employee, field)) for field in (
+            'first_name', 'last_name', 'email', 'contact_number', 'contact_info', 'department', 'birth_date', 'hire_date'
+        )}
+        self.assertEqual(self.client.post(reverse('employee-create'), payload, format='json').status_code, 400)
+
+        out = StringIO()
+        call_command('purge_employees', pause=0, stdout=out)
+        self.assertIn('Purged 0 employees', out.getvalue())
+        Employee.all_objects.filter(pk=employee.pk).update(deleted_at=timezone.now() - datetime.timedelta(days=31))
+        call_command('purge_employees', pause=0, stdout=out)
+        self.assertIn('Purged 1 employees and 3 reviews', out.getvalue())
+        self.assertFalse(Employee.all_objects.filter(pk=employee.pk).exists())
+
+    @override_settings(EMPLOYEE_SOFT_DELETE=True)
+    def test_bulk_upsert_restores_soft_deleted(self):
+        employee = self.employees[0]
+        self.client.delete(self.delete_url(employee))
+        deleted_version = Employee.all_objects.get(pk=employee.pk).version
+        payload = {field: str(getattr(employee, field)) for field in (
+            'first_name', 'last_name', 'email', 'contact_number', 'contact_info', 'department', 'birth_date', 'hire_date'
+        )}
+        response = self.client.post(reverse('employee-bulk'), [payload], format='json')
+        self.assertEqual(response.data['results'][0]['id'], employee.id)
+        self.assertEqual(response.data['results'][0]['status'], 'updated')
+        self.assertTrue(Employee.objects.filter(pk=employee.pk).exists())
+        self.assertEqual(Employee.objects.get(pk=employee.pk).version, deleted_version + 1)
+
+    @override_settings(EMPLOYEE_SOFT_DELETE=True)
+    def test_reviews_of_soft_deleted_employee_are_hidden(self):
+        employee = self.employees[0]
+        review = Review.objects.filter(employee=employee).first()
+        for url in (reverse('review-detail', kwargs={'pk': review.pk}), reverse('employee-reviews', kwargs={'employee_pk': employee.pk})):
+            self.assertEqual(self.client.get(url).status_code, 200)
+        self.client.delete(self.delete_url(employee))
+        for url in (reverse('review-detail', kwargs={'pk': review.pk}), reverse('employee-reviews', kwargs={'employee_pk': employee.pk})):
+            self.assertEqual(self.client.get(url).status_code, 404, url)
+        listed = [row['employee'] for row in self.client.get(reverse('review-list')).data]
+        self.assertNotIn(employee.pk, listed)
+
+
+class JobQueueTestCase(APITestCase):
+    def setUp(self):
+        get_cache().clear()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        settings_override = override_settings(JOB_FILES_DIR=directory.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.employees = seed_employees(3)
+
+    def run_workers(self):
+        out = StringIO()
+        call_command('run_workers', burst=True, threads=1, stdout=out, stderr=StringIO())
+        return out.getvalue()
+
+    def test_export_job(self):
+        response = self.client.post(reverse('job-list'), {'kind': 'export_employees', 'params': {'gzip': True}}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data['status'], Job.QUEUED)
+        self.assertTrue(response['Location'].endswith(reverse('job-detail', kwargs={'pk': response.data['id']})))
+        self.assertIn('Ran 1 jobs', self.run_workers())
+
+        job = self.client.get(response['Location']).data
+        self.assertEqual(job['status'], Job.SUCCEEDED)
+        self.assertEqual(job['progress'], {'done': 3, 'total': 3})
+        self.assertEqual(job['result']['rows'], 3)
+        download = self.client.get(job['download'])
+        self.assertEqual(download.status_code, status.HTTP_200_OK)
+        lines = gzip.decompress(b''.join(download.streaming_content)).decode('utf-8').splitlines()
+        self.assertEqual(len(lines), 4)
+
+    def test_import_job(self):
+        rows = [
+            {'first_name': 'Ann', 'last_name': 'Lee', 'email': 'ann@example.com', 'contact_number': '1',
+             'contact_info': '1 St', 'department': 'HR', 'birth_date': '1990-01-01', 'hire_date': '2020-01-01'},
+            {'first_name': 'Bad', 'last_name': 'Row', 'email': 'not-an-email'},
+        ]
+        response = self.client.post(reverse('job-import'), rows, format='json')
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.run_workers()
+        job = Job.objects.get(pk=response.data['id'])
+        self.assertEqual(job.status, Job.SUCCEEDED, job.error)
+        self.assertIn('1 rejected', job.result['output'])
+        self.assertTrue(Employee.objects.filter(email='ann@example.com').exists())
+        rejects = self.client.get(reverse('job-download', kwargs={'pk': job.pk}))
+        self.assertEqual(json.loads(b''.join(rejects.streaming_content))['line'], 2)
+
+    def test_csv_upload(self):
+        body = (
+            "first_name,last_name,email,contact_number,contact_info,department,birth_date,hire_date\n"
+            "Ann,Lee,ann@example.com,1,1 St,HR,1990-01-01,2020-01-01\n"
+        )
+        response = self.client.generic('POST', reverse('job-import'), body, content_type='text/csv')
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data['params']['file_format'], 'csv')
+        upload = job_file_path(response.data['params']['file'])
+        self.assertTrue(os.path.exists(upload))
+        self.run_workers()
+        self.assertTrue(Employee.objects.filter(email='ann@example.com').exists())
+        self.assertFalse(os.path.exists(upload))
+
+    def test_empty_upload(self):
+        for content_type in ('text/csv', 'application/x-ndjson'):
+            response = self.client.generic('POST', reverse('job-import'), '', content_type=content_type)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Job.objects.exists())
+
+    def test_invalid_jobs(self):
+        response = self.client.post(reverse('job-list'), {'kind': 'reindex'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('kind', response.data)
+        response = self.client.post(
+            reverse('job-list'), {'kind': 'export_employees', 'params': {'file_format': 'xlsx'}}, format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('file_format', response.data)
+        self.assertFalse(Job.objects.exists())
+
+    @override_settings(JOB_CONCURRENCY={'export_employees': 1})
+    def test_concurrency_limit(self):
+        first, second = enqueue('export_employees'), enqueue('export_employees')
+        dedupe = enqueue('dedupe_employees', {'dry_run': True})
+        self.assertEqual(claim('a').pk, first.pk)
+        # The second export waits for a slot; other kinds are not held up.
+        self.assertEqual(claim('b').pk, dedupe.pk)
+        self.assertIsNone(claim('b'))
+        run_job(Job.objects.get(pk=first.pk))
+        self.assertEqual(claim('b').pk, second.pk)
+
+    @override_settings(JOB_MAX_ATTEMPTS=2)
+    def test_requeue_stale(self):
+        job = enqueue('dedupe_employees')
+        claim('a')
+        Job.objects.update(heartbeat_at=timezone.now() - datetime.timedelta(minutes=5))
+        self.assertEqual(requeue_stale(), (1, 0))
+        claim('b')
+        Job.objects.update(heartbeat_at=timezone.now() - datetime.timedelta(minutes=5))
+        self.assertEqual(requeue_stale(), (0, 1))
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), (Job.FAILED, 2))
+
+    def test_list(self):
+        jobs = [enqueue('dedupe_employees') for _ in range(3)]
+        response = self.client.get(reverse('job-list'), {'status': Job.QUEUED})
+        self.assertEqual([job['id'] for job in response.data['results']], [job.pk for job in reversed(jobs)])
+
+
+@override_settings(CHANGE_FEED_SETTLE_SECONDS=0)
+class ChangeFeedTestCase(APITestCase):
+    def setUp(self):
+        get_cache().clear()
+        self.employees = seed_employees(4, reviews_per_employee=1)
+        self.url = reverse('employee-changes')
+
+    def changes(self, since=None, **params):
+        response = self.client.get(self.url, {**params, **({'since': since} if since else {})})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def test_initial_sync_in_pages(self):
+        # Rows written together share updated_at; id orders them.
+        Employee.objects.update(updated_at=timezone.now() - datetime.timedelta(minutes=1))
+        seen, since = [], None
+        while True:
+            page = self.changes(since, page_size=3)
+            seen += [(change['op'], change['id']) for change in page['results']]
+            since = page['since']
+            if page['next'] is None:
+                break
+        self.assertEqual(seen, [('upsert', employee.id) for employee in self.employees])
+        self.assertEqual(self.changes(since)['results'], [])
+        self.assertEqual(self.changes(since)['since'], since)
+
+    def test_updates_and_review_edits(self):
+        since = self.changes()['since']
+        first, second = self.employees[:2]
+        self.client.patch(reverse('employee-update', kwargs={'identifier': first.id}), {'department': 'Sales'}, format='json')
+        review = second.reviews.get()
+        self.client.patch(reverse('review-detail', kwargs={'pk': review.id}), {'comments': 'Edited'}, format='json')
+        page = self.changes(since)
+        self.assertEqual([change['id'] for change in page['results']], [first.id, second.id])
+        self.assertEqual(page['results'][0]['employee']['department'], 'Sales')
+        self.assertEqual(page['results'][1]['employee']['reviews'][0]['comments'], 'Edited')
+
+    def test_deletions(self):
+        since = self.changes()['since']
+        hard, soft = self.employees[:2]
+        self.client.delete(reverse('employee-delete', kwargs={'identifier': hard.id}))
+        with override_settings(EMPLOYEE_SOFT_DELETE=True):
+            self.client.delete(reverse('employee-delete', kwargs={'identifier': soft.id}))
+        results = self.changes(since)['results']
+        self.assertEqual([(change['op'], change['id'], change['employee']) for change in results],
+                         [('delete', hard.id, None), ('delete', soft.id, None)])
+
+        purge_employees(timezone.now() + datetime.timedelta(seconds=1))
+        self.assertFalse(EmployeeTombstone.objects.exists())
+        self.assertFalse(Employee.all_objects.filter(pk=soft.pk).exists())
+
+    @override_settings(CHANGE_FEED_SETTLE_SECONDS=60)
+    def test_recent_changes_are_held_back(self):
+        self.assertEqual(self.changes()['results'], [])
+
+    def test_since_timestamp_and_bad_cursors(self):
+        Employee.objects.filter(pk=self.employees[0].pk).update(updated_at=timezone.now() - datetime.timedelta(days=1))
+        since = (timezone.now() - datetime.timedelta(hours=1)).isoformat().replace('+00:00', 'Z')
+        self.assertEqual(len(self.changes(since)['results']), 3)
+        expired = (timezone.now() - datetime.timedelta(days=90)).isoformat().replace('+00:00', 'Z')
+        self.assertEqual(self.client.get(self.url, {'since': expired}).status_code, status.HTTP_410_GONE)
+        self.assertEqual(self.client.get(self.url, {'since': 'bogus'}).status_code, status.HTTP_404_NOT_FOUND)
+
+
+@override_settings(THROTTLE_RATE='10/s', THROTTLE_BURST=10)
+class AdmissionControlTestCase(APITestCase):
+    def setUp(self):
+        get_throttle_cache().clear()
+        self.addCleanup(get_throttle_cache().clear)
+        self.employee, = seed_employees(1)
+        self.clock = 1_000_000.0
+        patcher = mock.patch('employees.throttling.time.time', lambda: self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_token_bucket(self):
+        bucket = TokenBucket('throttle:test', rate=2, burst=4)
+        self.assertEqual([bucket.take(1) for _ in range(5)], [0, 0, 0, 0, 0.5])
+        self.clock += 1
+        self.assertEqual([bucket.take(1) for _ in range(3)], [0, 0, 0.5])
+        # Idle time beyond a full bucket is not banked.
+        self.clock += 60
+        self.assertEqual(bucket.take(4), 0)
+        self.assertEqual(bucket.take(1), 0.5)
+
+    def test_token_bucket_concurrent_refill(self):
+        # Two requests find the bucket refilled at once: however their cache
+        # calls interleave, both are charged, and the idle time only once.
+        cache = get_throttle_cache()
+        add = cache.add
+        for step in range(2):
+            with self.subTest(step=step):
+                cache.clear()
+                first, second, third = (TokenBucket('throttle:test', rate=10, burst=3) for _ in range(3))
+                self.assertEqual(first.take(3), 0)
+                # Full again, but before the key expires.
+                self.clock += 1.5
+                calls = []
+
+                def interleave(*args, **kwargs):
+                    # The second request runs whole before the first's ``step``th marker.
+                    calls.append(args)
+                    if len(calls) == step + 1:
+                        self.assertEqual(second.take(1), 0)
+                    return add(*args, **kwargs)
+
+                with mock.patch.object(cache, 'add', interleave):
+                    self.assertEqual(first.take(1), 0)
+                self.assertEqual([third.take(1), third.take(1)], [0, 0.1])
+
+    def test_costs_and_retry_after(self):
+        # The list costs 5 tokens, a retrieve 1: two lists empty the bucket.
+        url = reverse('employee-list')
+        self.assertEqual([self.client.get(url).status_code for _ in range(3)], [200, 200, 429])
+        response = self.client.get(reverse('employee-retrieve', kwargs={'identifier': self.employee.id}))
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(response['Retry-After'], '1')
+        # Other clients have their own bucket; this one refills with time.
+        self.assertEqual(self.client.get(url, REMOTE_ADDR='10.0.0.2').status_code, 200)
+        self.clock += 0.5
+        self.assertEqual(self.client.get(url).status_code, 200)
+
+    @override_settings(THROTTLE_RATE='', THROTTLE_ROUTE_RATES={'GET employee-export': '50/s'})
+    def test_route_bucket_is_shared(self):
+        url = reverse('employee-export')
+        self.assertEqual(self.client.get(url).status_code, 200)
+        self.assertEqual(self.client.get(url, REMOTE_ADDR='10.0.0.2').status_code, 429)
+        self.assertEqual(self.client.get(reverse('employee-list')).status_code, 200)
+
+    @override_settings(THROTTLE_RATE='', ADMISSION_MAX_HEAVY=1)
+    def test_heavy_requests_in_flight(self):
+        held = HeavyRequestSlot()
+        self.assertTrue(held.acquire())
+        response = self.client.get(reverse('employee-list'))
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertEqual(response['Retry-After'], '1')
+        # Cheap routes are never held up.
+        self.assertEqual(self.client.get(reverse('employee-retrieve', kwargs={'identifier': self.employee.id})).status_code, 200)
+        held.release()
+
+        # A streamed response keeps its slot until it has been sent.
+        response = self.client.get(reverse('employee-export'))
+        self.assertFalse(HeavyRequestSlot().acquire())
+        b''.join(response.streaming_content)
+        self.assertTrue(HeavyRequestSlot().acquire())
+
+    @override_settings(THROTTLE_RATE='')
+    def test_off_by_default(self):
+        url = reverse('employee-list')
+        self.assertEqual({self.client.get(url).status_code for _ in range(5)}, {200})
+
+
+class StartupTestCase(SimpleTestCase):
+    def test_warm_up_compiles_every_route(self):
+        from employees.management.commands.benchmark_api import routes
+        from employees.startup import warm_up
+        self.assertGreaterEqual(warm_up(), len(routes()))
+
+    def test_optional_modules_not_loaded_at_start(self):
+        out = StringIO()
+        with mock.patch.dict(os.environ, {'STARTUP_WARM_UP': 'true'}):
+            call_command('startup_profile', runs=1, top=0, budget_ms=float('inf'), json=True, stdout=out)
+        report = json.loads(out.getvalue())
+        self.assertEqual(report['status'], 200)
+        self.assertGreater(report['routes_warmed'], 0)
+        self.assertNotIn('pyarrow', report['modules'])
+
+    @skipUnless(os.getenv('STARTUP_BUDGET_TEST'), 'timing test; set STARTUP_BUDGET_TEST=1 to run it')
+    @mock.patch.dict(os.environ, {'STARTUP_WARM_UP': 'true'})
+    def test_cold_start_within_budget(self):
+        """A fresh worker boots and serves its first request under STARTUP_BUDGET_MS."""
+        out = StringIO()
+        call_command('startup_profile', runs=1, top=0, json=True, stdout=out)
+        report = json.loads(out.getvalue())
+        self.assertLessEqual(report['total_ms'], report['budget_ms'])
+
+
 """   def test_retrieve_review(self):
   
         Ensure we can retrieve a review by ID.
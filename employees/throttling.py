@@ -0,0 +1,236 @@
+"""
+Rate limiting and admission control for the API.
+
+``employees.middleware.AdmissionControlMiddleware`` charges every request to
+a route in ``employees/urls.py`` its cost (``route_cost``) against two kinds
+of token bucket, kept in the shared cache so every worker process sees the
+same balance:
+
+* one per client (user, or IP address for anonymous requests), refilled at
+  ``THROTTLE_RATE`` and holding up to ``THROTTLE_BURST`` tokens;
+* optionally one per route, shared by all clients, refilled at its rate in
+  ``THROTTLE_ROUTE_RATES`` and holding one second's worth.
+
+A request the buckets cannot pay for gets ``429 Too Many Requests`` with
+``Retry-After``. Requests to heavy routes (cost of at least
+``ADMISSION_HEAVY_COST``) must also take one of ``ADMISSION_MAX_HEAVY``
+in-flight slots, or get ``503 Service Unavailable`` at once rather than
+queueing behind the queries already running.
+
+The buckets use the generic cell rate algorithm: a bucket is a single
+integer, the time (in microseconds) at which it will be full again, moved
+with the cache's atomic ``incr``, so concurrent requests never lose updates.
+"""
+import math
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.throttling import BaseThrottle
+
+# Tokens a request costs, by "METHOD route name"; other requests cost 1.
+# Extended or overridden by settings.THROTTLE_COSTS.
+ROUTE_COSTS = {
+    'GET employee-list': 5,
+    'GET employee-search': 3,
+    'GET employee-changes': 5,
+    'GET employee-export': 50,
+    'POST employee-bulk': 20,
+    'POST employee-bulk-delete': 20,
+    'GET review-list': 5,
+    'POST review-bulk': 20,
+    'GET employee-reviews': 2,
+    'GET review-summary-employees': 5,
+    'GET review-summary-departments': 5,
+    'POST job-list': 5,
+    'POST job-import': 20,
+    'GET job-download': 10,
+}
+
+PERIODS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+
+def parse_rate(rate):
+    """
+    Tokens per second of a rate like ``"100/s"`` or ``"3000/min"``, or ``None`` when unset.
+    """
+    if not rate:
+        return None
+    count, _, period = str(rate).partition('/')
+    return float(count) / PERIODS[(period or 's')[0]]
+
+
+def get_throttle_cache():
+    return caches[getattr(settings, 'THROTTLE_CACHE_ALIAS', 'default')]
+
+
+def route_cost(route):
+    return {**ROUTE_COSTS, **getattr(settings, 'THROTTLE_COSTS', {})}.get(route, 1)
+
+
+class TokenBucket:
+    """
+    A token bucket in the cache, refilled at ``rate`` tokens per second up to ``burst``.
+
+    A request costing more than ``burst`` takes the whole bucket.
+    """
+
+    def __init__(self, key, rate, burst, cache=None):
+        self.key = key
+        self.interval = 1e6 / rate  # microseconds per token
+        self.capacity = burst * self.interval
+        self.cache = cache or get_throttle_cache()
+        # The key outlives the longest time the bucket can take to refill.
+        self.timeout = math.ceil(self.capacity / 1e6) + 1
+
+    def take(self, cost):
+        """
+        Take ``cost`` tokens if the bucket holds them.
+
+        Returns:
+            float: ``0`` if taken, otherwise the seconds until they will be there.
+        """
+        now = int(time.time() * 1e6)
+        increment = int(min(cost * self.interval, self.capacity))
+        try:
+            full_at = self.cache.incr(self.key, increment)
+        except ValueError:
+            # No bucket yet (or it expired): it is full.
+            if self.cache.add(self.key, now + increment, self.timeout):
+                return 0
+            full_at = self.cache.incr(self.key, increment)
+        if full_at - increment < now:
+            # The bucket had refilled completely; time spent full earns nothing.
+            self.catch_up(full_at - increment, full_at, now)
+        elif full_at - now > self.capacity:
+            self.cache.decr(self.key, increment)
+            self.cache.touch(self.key, self.timeout)
+            return (full_at - now - self.capacity) / 1e6
+        elif full_at - now > self.capacity / 2:
+            # Keep a draining bucket from expiring, which would refill it.
+            self.cache.touch(self.key, self.timeout)
+        return 0
+
+    def catch_up(self, before, after, now):
+        """
+        Move a bucket that had refilled, and that ``incr`` took from ``before`` to ``after``, up to ``now``.
+
+        Other requests may find the same refilled bucket at the same time,
+        and between them the bucket must move up once, without overwriting
+        their ``incr``. Each value ``incr`` returns is where exactly one
+        later ``incr`` starts, so a marker per value, taken with ``add``,
+        settles which request moves it: one does not start from a value
+        another refilled request returned, and takes back the move of a
+        request that already started from the value it returned.
+        """
+        move = 0
+        if self.cache.add(f'{self.key}:{before}', now - before, self.timeout):
+            move = now - before
+        if not self.cache.add(f'{self.key}:{after}', 0, self.timeout):
+            move -= self.cache.get(f'{self.key}:{after}', 0)
+        try:
+            if move:
+                self.cache.incr(self.key, move)
+        except ValueError:
+            pass
+        self.cache.touch(self.key, self.timeout)
+
+    def give_back(self, cost):
+        """
+        Return tokens taken for a request that was then turned away.
+        """
+        try:
+            self.cache.decr(self.key, int(min(cost * self.interval, self.capacity)))
+        except ValueError:
+            pass
+
+
+def client_ident(request):
+    """
+    The client a request is charged to: its user, or its address for anonymous requests.
+
+    The address honours ``X-Forwarded-For`` as DRF's throttles do (``NUM_PROXIES``).
+    """
+    user = getattr(request, 'user', None)
+    if user is not None and user.is_authenticated:
+        return f'user:{user.pk}'
+    return f'ip:{BaseThrottle().get_ident(request)}'
+
+
+def buckets_for(request, route):
+    """
+    The buckets charged for ``request`` to ``route``: the client's, then the route's if it has a rate.
+    """
+    buckets = []
+    client_rate = parse_rate(getattr(settings, 'THROTTLE_RATE', None))
+    if client_rate:
+        burst = getattr(settings, 'THROTTLE_BURST', None) or client_rate
+        buckets.append(TokenBucket(f'throttle:{client_ident(request)}', client_rate, burst))
+    route_rate = parse_rate(getattr(settings, 'THROTTLE_ROUTE_RATES', {}).get(route))
+    if route_rate:
+        buckets.append(TokenBucket(f"throttle:route:{route.replace(' ', ':')}", route_rate, route_rate))
+    return buckets
+
+
+def throttle(request, route):
+    """
+    Charge ``request`` to its buckets.
+
+    Returns:
+        tuple: ``(wait, charged)``: seconds the client must wait (``0`` if
+        admitted) and the ``(bucket, cost)`` pairs charged, for refunds.
+    """
+    cost = route_cost(route)
+    charged = []
+    for bucket in buckets_for(request, route):
+        wait = bucket.take(cost)
+        if wait:
+            refund(charged)
+            return wait, []
+        charged.append((bucket, cost))
+    return 0, charged
+
+
+def refund(charged):
+    for bucket, cost in charged:
+        bucket.give_back(cost)
+
+
+def is_heavy(route):
+    limit = getattr(settings, 'ADMISSION_MAX_HEAVY', 0)
+    return bool(limit) and route_cost(route) >= getattr(settings, 'ADMISSION_HEAVY_COST', 5)
+
+
+class HeavyRequestSlot:
+    """
+    One of ``ADMISSION_MAX_HEAVY`` in-flight slots for heavy requests, shared
+    by all processes through the cache.
+
+    Slots are cache keys taken with ``add``, which is atomic, and expire
+    after ``ADMISSION_SLOT_TIMEOUT`` seconds, so a process that dies holding
+    one does not leak it.
+    """
+
+    def __init__(self, cache=None):
+        self.cache = cache or get_throttle_cache()
+        self.key = None
+        self.token = uuid.uuid4().hex
+
+    def acquire(self):
+        """
+        Returns:
+            bool: Whether a slot was free.
+        """
+        timeout = getattr(settings, 'ADMISSION_SLOT_TIMEOUT', 300)
+        for index in range(getattr(settings, 'ADMISSION_MAX_HEAVY', 0)):
+            key = f'admission:slot:{index}'
+            if self.cache.add(key, self.token, timeout):
+                self.key = key
+                return True
+        return False
+
+    def release(self):
+        if self.key is not None and self.cache.get(self.key) == self.token:
+            self.cache.delete(self.key)
+        self.key = None
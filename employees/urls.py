@@ -1,22 +1,40 @@
 from django.urls import re_path
-from .views import EmployeeViewSet, PerformanceReviewViewSet
+from .views import EmployeeViewSet, JobViewSet, MetricsViewSet, PerformanceReviewViewSet, ReviewSummaryViewSet
 from rest_framework import generics, mixins
 
 urlpatterns = [
-    # Employee routes
-    re_path(r'^employees/create/?$', EmployeeViewSet.as_view({'post': 'create_employee'}), name='employee-create'),
-    re_path(r'^employees/(?P<identifier>\w+)/?$', EmployeeViewSet.as_view({'get': 'retrieve_employee'}), name='employee-retrieve'),
-    re_path(r'^employees/?$', EmployeeViewSet.as_view({'get': 'list'}), name='employee-list'),
-    re_path(r'^employees/(?P<identifier>\w+)/update/?$', EmployeeViewSet.as_view({'put': 'update_employee', 'patch': 'update_employee'}), name='employee-update'),
-    re_path(r'^employees/delete/(?P<identifier>\w+)/?$', EmployeeViewSet.as_view({'delete': 'delete_employee'}), name='employee-delete'),
-
-    # Review routes
-    # Review routes
+    # Review routes (before the employee identifier catch-all, which would match 'reviews')
     re_path(r'^employees/reviews/(?P<pk>\d+)/?$', PerformanceReviewViewSet.as_view({
         'get': 'retrieve',
         'put': 'update',
         'patch': 'partial_update',
         'delete': 'destroy'
     }), name='review-detail'),
+    re_path(r'^employees/reviews/summary/employees/?$', ReviewSummaryViewSet.as_view({'get': 'employees'}), name='review-summary-employees'),
+    re_path(r'^employees/reviews/summary/departments/?$', ReviewSummaryViewSet.as_view({'get': 'departments'}), name='review-summary-departments'),
+    re_path(r'^employees/reviews/bulk/?$', PerformanceReviewViewSet.as_view({'post': 'bulk_create_reviews'}, **PerformanceReviewViewSet.bulk_create_reviews.kwargs), name='review-bulk'),
     re_path(r'^employees/reviews/?$', PerformanceReviewViewSet.as_view({'get': 'list', 'post': 'create'}), name='review-list'),
+    re_path(r'^employees/(?P<employee_pk>\d+)/reviews/?$', PerformanceReviewViewSet.as_view({'get': 'employee_reviews'}, **PerformanceReviewViewSet.employee_reviews.kwargs), name='employee-reviews'),
+
+    # Employee routes
+    re_path(r'^employees/create/?$', EmployeeViewSet.as_view({'post': 'create_employee'}), name='employee-create'),
+    re_path(r'^employees/changes/?$', EmployeeViewSet.as_view({'get': 'changes'}), name='employee-changes'),
+    re_path(r'^employees/search/?$', EmployeeViewSet.as_view({'get': 'search'}), name='employee-search'),
+    re_path(r'^employees/export/?$', EmployeeViewSet.as_view({'get': 'export'}), name='employee-export'),
+    re_path(r'^employees/bulk/delete/?$', EmployeeViewSet.as_view({'post': 'bulk_delete'}), name='employee-bulk-delete'),
+    re_path(r'^employees/bulk/?$', EmployeeViewSet.as_view({'post': 'bulk_upsert'}, **EmployeeViewSet.bulk_upsert.kwargs), name='employee-bulk'),
+    re_path(r'^employees/(?P<identifier>\w+)/?$', EmployeeViewSet.as_view({'get': 'retrieve_employee'}), name='employee-retrieve'),
+    re_path(r'^employees/?$', EmployeeViewSet.as_view({'get': 'list'}), name='employee-list'),
+    re_path(r'^employees/(?P<identifier>\w+)/update/?$', EmployeeViewSet.as_view({'put': 'update_employee', 'patch': 'update_employee'}), name='employee-update'),
+    re_path(r'^employees/delete/(?P<identifier>\w+)/?$', EmployeeViewSet.as_view({'delete': 'delete_employee'}), name='employee-delete'),
+
+    # Background jobs
+    re_path(r'^jobs/?$', JobViewSet.as_view({'get': 'list', 'post': 'create'}), name='job-list'),
+    re_path(r'^jobs/import/?$', JobViewSet.as_view({'post': 'import_employees'}, **JobViewSet.import_employees.kwargs), name='job-import'),
+    re_path(r'^jobs/(?P<pk>\d+)/?$', JobViewSet.as_view({'get': 'retrieve'}), name='job-detail'),
+    re_path(r'^jobs/(?P<pk>\d+)/download/?$', JobViewSet.as_view({'get': 'download'}), name='job-download'),
+
+    # Operational metrics
+    re_path(r'^metrics/db/?$', MetricsViewSet.as_view({'get': 'database'}), name='metrics-database'),
+    re_path(r'^metrics/requests/?$', MetricsViewSet.as_view({'get': 'requests'}), name='metrics-requests'),
 ]
\ No newline at end of file
@@ -0,0 +1,201 @@
+"""
+Read-only list serialization straight from ``values()`` rows.
+
+A ``ValuesSerializer`` is compiled once from a ``ModelSerializer`` class (and
+sparse fieldset): it records, in the serializer's field order, which column
+feeds each field and how the field converts it. Rendering a row is then a
+loop over that plan, skipping DRF's per-field ``get_attribute``/validation
+machinery and model instantiation. Nested ``many=True`` serializers are
+fetched with one extra ``values()`` query each, as ``prefetch_related`` would.
+The output is equal to the serializer's ``.data``.
+"""
+from collections import defaultdict
+from functools import lru_cache
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import F
+from django.utils import timezone
+from rest_framework import ISO_8601, serializers
+from rest_framework.settings import api_settings
+
+from .serializers import EagerLoadingMixin
+
+# Fields whose to_representation() returns database values unchanged.
+PASSTHROUGH_FIELDS = (
+    serializers.CharField,
+    serializers.EmailField,
+    serializers.IntegerField,
+    serializers.FloatField,
+    serializers.BooleanField,
+)
+
+PARENT_KEY = '_values_parent'
+
+
+def get_converter(field):
+    """
+    The function rendering a database value for ``field``, or ``None`` if the
+    value is rendered as is.
+
+    ``DateTimeField`` looks up the current time zone for every value; here it
+    is looked up once, so call this once per response, not once per value.
+    """
+    if field is None or type(field) in PASSTHROUGH_FIELDS:
+        return None
+    if not isinstance(field, serializers.DateTimeField):
+        return field.to_representation
+    output_format = getattr(field, 'format', api_settings.DATETIME_FORMAT)
+    field_timezone = field.timezone if hasattr(field, 'timezone') else field.default_timezone()
+    if output_format is None or output_format.lower() != ISO_8601 or field_timezone is None:
+        return field.to_representation
+
+    def convert(value):
+        if not timezone.is_aware(value):
+            return field.to_representation(value)
+        try:
+            text = value.astimezone(field_timezone).isoformat()
+        except OverflowError:
+            return field.to_representation(value)
+        return text[:-6] + 'Z' if text.endswith('+00:00') else text
+    return convert
+
+
+class ValuesSerializer:
+    """
+    The compiled rendering plan of one serializer class.
+
+    Use :meth:`for_serializer`, which returns ``None`` for serializers this
+    plan cannot reproduce exactly (method fields, dotted sources, nested
+    single objects, ...) so callers can fall back to the serializer.
+    """
+
+    def __init__(self, model, columns, plan, nested):
+        self.model = model
+        self.columns = columns
+        self.plan = plan
+        self.nested = nested
+
+    @classmethod
+    def for_serializer(cls, serializer_class, fields=None):
+        """
+        Args:
+            serializer_class (type): A ``ModelSerializer`` subclass.
+            fields (list): Sparse fieldset, as accepted by ``SparseFieldsMixin``.
+
+        Returns:
+            ValuesSerializer or None.
+
+        Raises:
+            ValidationError: If ``fields`` names an unknown field.
+        """
+        # Rendered fields follow the serializer's declared order whatever the
+        # request's, so ``?fields=b,a,a`` shares the plan of ``?fields=a,b``.
+        return _compile(serializer_class, tuple(sorted(set(fields))) if fields is not None else None)
+
+    def rows(self, queryset, *extra):
+        """
+        ``queryset`` as ``values()`` dicts with the columns this plan reads,
+        plus ``extra`` (e.g. pagination keys).
+        """
+        columns = list(dict.fromkeys([*self.columns, *extra]))
+        return queryset.prefetch_related(None).values(*columns)
+
+    def to_representation(self, rows):
+        """
+        Render ``values()`` rows from :meth:`rows`, fetching nested lists.
+
+        Returns:
+            list: One dict per row, as the serializer's ``many=True`` ``.data``.
+        """
+        rows = list(rows)
+        children = {}
+        for name, child, child_rows in self.nested_rows(rows):
+            child_rows = list(child_rows)
+            children[name] = self.group(child_rows, child.to_representation(child_rows))
+        return self.render(rows, children)
+
+    async def ato_representation(self, rows):
+        """
+        :meth:`to_representation` for async views: ``rows`` may be an unevaluated
+        queryset, and it and the nested lists are fetched with the async ORM.
+        """
+        rows = [row async for row in rows] if hasattr(rows, '__aiter__') else list(rows)
+        children = {}
+        for name, child, child_rows in self.nested_rows(rows):
+            child_rows = [row async for row in child_rows]
+            children[name] = self.group(child_rows, await child.ato_representation(child_rows))
+        return self.render(rows, children)
+
+    def nested_rows(self, rows):
+        """
+        Yield ``(name, child plan, unevaluated child rows)`` per nested list of ``rows``.
+        """
+        pk = self.model._meta.pk.attname
+        parent_ids = [row[pk] for row in rows]
+        for name, fk_name, child, queryset in self.nested:
+            child_rows = child.rows(queryset.filter(**{f'{fk_name}__in': parent_ids})).annotate(**{PARENT_KEY: F(fk_name)})
+            yield name, child, child_rows if parent_ids else child_rows.none()
+
+    @staticmethod
+    def group(child_rows, items):
+        grouped = defaultdict(list)
+        for raw, item in zip(child_rows, items):
+            grouped[raw[PARENT_KEY]].append(item)
+        return grouped
+
+    def render(self, rows, children):
+        pk = self.model._meta.pk.attname
+        plan = [(name, column, get_converter(field)) for name, column, field in self.plan]
+        data = []
+        for row in rows:
+            item = {}
+            for name, column, convert in plan:
+                if column is None:
+                    item[name] = children[name].get(row[pk], [])
+                    continue
+                value = row[column]
+                item[name] = value if value is None or convert is None else convert(value)
+            data.append(item)
+        return data
+
+# Bounded: the key includes the client's ?fields= subset.
+@lru_cache(maxsize=256)
+def _compile(serializer_class, fields):
+    serializer = serializer_class(fields=list(fields) if fields is not None else None)
+    model = serializer.Meta.model
+    pk = model._meta.pk.attname
+    columns = [pk]
+    plan = []
+    nested = []
+    for name, field in serializer.fields.items():
+        if field.write_only:
+            continue
+        source = field.source
+        if source == '*' or '.' in source:
+            return None
+        try:
+            model_field = model._meta.get_field(source)
+        except FieldDoesNotExist:
+            return None
+
+        if isinstance(field, serializers.ListSerializer):
+            if not (isinstance(field.child, EagerLoadingMixin) and model_field.one_to_many):
+                return None
+            child = _compile(type(field.child), None)
+            if child is None:
+                return None
+            fk_name = model_field.field.name
+            queryset = model_field.related_model._default_manager.all()
+            nested.append((name, fk_name, child, queryset))
+            plan.append((name, None, None))
+        elif isinstance(field, serializers.PrimaryKeyRelatedField):
+            if field.pk_field is not None or not model_field.many_to_one:
+                return None
+            columns.append(model_field.name)
+            plan.append((name, model_field.name, None))
+        elif isinstance(field, serializers.BaseSerializer) or not model_field.concrete or model_field.is_relation:
+            return None
+        else:
+            columns.append(model_field.attname)
+            plan.append((name, model_field.attname, field))
+    return ValuesSerializer(model, list(dict.fromkeys(columns)), plan, nested)
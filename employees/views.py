@@ -1,39 +1,245 @@
 from rest_framework.response import Response
 from rest_framework import status, viewsets
 from rest_framework.decorators import action
-from .models import Employee, Review
-from .serializers import EmployeeSerializer, ReviewSerializer
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import BrowsableAPIRenderer
+from rest_framework.reverse import reverse
+from .models import Employee, Job, Review, VersionConflict
+from .serializers import (
+    EmployeeBulkDeleteSerializer, EmployeeChangeSerializer, EmployeeReviewSummarySerializer,
+    EmployeeSearchResultSerializer, EmployeeSerializer, JobCreateSerializer, JobSerializer, ReviewSerializer,
+)
+from .bulk import create_reviews, upsert_employees
+from .cache import (
+    EMPLOYEE_LIST_NAMESPACE, REVIEW_LIST_NAMESPACE, cached_response, employee_namespace, if_match_versions, make_etag,
+    review_namespace,
+)
+from .changes import employee_changes
+from .db import connection_stats
+from .deletion import remove_employees
+from .export import CONTENT_TYPES, ExportError, ExportStats, iter_export, logged
+from .filters import OrderingFilter, QueryParameterFilter
+from .instrumentation import route_metrics
+from .jobs import JOB_TYPES, enqueue, job_file_path
+from .pagination import ChangeFeedPagination, EmployeeReviewPagination, JobPagination, KeysetPagination, RankedPagination
+from .parsers import NDJSONParser
+from .renderers import ORJSONRenderer
+from .search import search_employees
+from .streaming import streaming_json_response
+from .values_serializers import ValuesSerializer
+import json
+import os
+import shutil
+import uuid
+from functools import partial
+from django.db.models import Count, Sum
+from django.http import FileResponse, Http404, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 
-class EmployeeViewSet(viewsets.GenericViewSet, viewsets.mixins.ListModelMixin, viewsets.mixins.CreateModelMixin, viewsets.mixins.UpdateModelMixin):
+# Tries of an update without If-Match that keeps losing races with other writers.
+UPDATE_ATTEMPTS = 3
+# Bytes copied per read when saving a job upload to disk.
+UPLOAD_CHUNK_SIZE = 1 << 20
+
+
+class SparseFieldsViewMixin:
+    """
+    Honours ``?fields=a,b,c`` on GET requests.
+
+    The requested fields are passed to the serializer and to its eager-loading
+    plan, so unrequested columns are deferred and unrequested relations (such
+    as an employee's ``reviews``) are never queried.
+    """
+    fields_query_param = 'fields'
+
+    def get_requested_fields(self):
+        if self.request is None or self.request.method != 'GET':
+            return None
+        value = self.request.query_params.get(self.fields_query_param)
+        if not value:
+            return None
+        return [name.strip() for name in value.split(',') if name.strip()]
+
+    def get_serializer(self, *args, **kwargs):
+        kwargs.setdefault('fields', self.get_requested_fields())
+        return super().get_serializer(*args, **kwargs)
+
+
+class ValuesSerializationMixin:
+    """
+    Builds list responses from ``values()`` rows with a compiled
+    ``ValuesSerializer`` instead of model instances and the serializer, when
+    ``values_serialization`` is set and the serializer can be compiled. The
+    data is identical either way.
+    """
+    values_serialization = False
+
+    def get_values_serializer(self):
+        if not self.values_serialization:
+            return None
+        return ValuesSerializer.for_serializer(self.get_serializer_class(), self.get_requested_fields())
+
+    def list_data(self, queryset):
+        """
+        The list response data for ``queryset``, paginated if requested.
+        """
+        values_serializer = self.get_values_serializer()
+        if values_serializer is None:
+            page = self.paginate_queryset(queryset)
+            if page is not None:
+                return self.get_paginated_response(self.get_serializer(page, many=True).data).data
+            return self.get_serializer(queryset, many=True).data
+
+        paginator = self.paginator
+        page = paginator.get_page_queryset(queryset, self.request) if paginator is not None else None
+        if page is None:
+            return values_serializer.to_representation(values_serializer.rows(queryset))
+        rows = paginator.get_page(list(values_serializer.rows(page, *paginator.get_key_names())))
+        return self.get_paginated_response(values_serializer.to_representation(rows)).data
+
+    async def alist_data(self, queryset):
+        """
+        ``list_data`` for async views, reading the ``values()`` rows with the
+        async ORM. Only for views whose ``get_values_serializer()`` is not ``None``.
+        """
+        values_serializer = self.get_values_serializer()
+        paginator = self.paginator
+        page = paginator.get_page_queryset(queryset, self.request) if paginator is not None else None
+        if page is None:
+            return await values_serializer.ato_representation(values_serializer.rows(queryset))
+        rows = paginator.get_page([row async for row in values_serializer.rows(page, *paginator.get_key_names())])
+        return self.get_paginated_response(await values_serializer.ato_representation(rows)).data
+
+
+class EmployeeViewSet(SparseFieldsViewMixin, ValuesSerializationMixin, viewsets.GenericViewSet, viewsets.mixins.ListModelMixin, viewsets.mixins.CreateModelMixin, viewsets.mixins.UpdateModelMixin):
     serializer_class = EmployeeSerializer
     queryset = Employee.objects.all()
+    pagination_class = KeysetPagination
+    renderer_classes = [ORJSONRenderer, BrowsableAPIRenderer]
+    values_serialization = True
+    filter_backends = [QueryParameterFilter, OrderingFilter]
+    filter_params = {
+        'department': 'department',
+        'hire_date_after': 'hire_date__gte',
+        'hire_date_before': 'hire_date__lte',
+    }
+    ordering_fields = ['id', 'email', 'department']
 
     def get_queryset(self):
-        return Employee.objects.all()
+        return self.get_serializer_class().setup_eager_loading(
+            Employee.objects.all(), required_fields=['version'], fields=self.get_requested_fields()
+        )
+
+    def get_employee(self, identifier, queryset=None):
+        """
+        Resolve an ID, first name or last name to a single employee, or 404.
+        """
+        if queryset is None:
+            queryset = self.get_queryset()
+        employee = queryset.by_identifier(identifier).first()
+        if employee is None:
+            raise Http404('No Employee matches the given query.')
+        return employee
 
     @action(detail=False, methods=['get'], url_path='(?P<identifier>[^/.]+)')
     def retrieve_employee(self, request, identifier=None, *args, **kwargs):
         """
         Retrieve an employee by ID, first name, or last name.
+
+        Lookups by ID are served from the response cache, with an ETag that
+        ``update_employee`` accepts in ``If-Match``.
         """
-        # Check if the identifier is numeric (i.e., an ID)
         if identifier.isdigit():
-            employee = get_object_or_404(Employee, id=identifier)
-        else:
-            # Try to find an employee by first name or last name (case-insensitive)
-            employee = Employee.objects.filter(first_name__iexact=identifier).first()
-            if not employee:
-                employee = Employee.objects.filter(last_name__iexact=identifier).first()
+            def build():
+                employee = self.get_employee(identifier)
+                return self.get_serializer(employee).data, employee.version
 
+            return cached_response(request, employee_namespace(int(identifier)), build, versioned=True)
+        employee = self.get_employee(identifier)
         serializer = self.get_serializer(employee)
         return Response(serializer.data, status=status.HTTP_200_OK)
     
     @action(detail=False, methods=['get'], url_path='')
     def list(self, request):
-        queryset = Employee.objects.all()
-        serializer = EmployeeSerializer(queryset, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        """
+        List employees.
+
+        ``?stream=1`` streams the whole table as a chunked JSON array;
+        ``?page_size=`` / ``?cursor=`` return one keyset-paginated page.
+        ``filter_params``, ``?ordering=`` and ``?fields=`` apply to all three.
+        """
+        queryset = self.filter_queryset(self.get_queryset())
+        if request.query_params.get('stream'):
+            if not queryset.ordered:
+                queryset = queryset.order_by('id')
+            serializer_class = partial(EmployeeSerializer, fields=self.get_requested_fields())
+            return streaming_json_response(queryset, serializer_class)
+
+        return cached_response(request, EMPLOYEE_LIST_NAMESPACE, lambda: self.list_data(queryset))
+
+    @action(detail=False, methods=['get'], url_path='changes')
+    def changes(self, request, *args, **kwargs):
+        """
+        Employees created, updated or deleted since ``?since=``, oldest first.
+
+        Poll with the ``since`` of the previous response to receive only
+        what changed; see ``employees.changes``. Never cached.
+        """
+        paginator = ChangeFeedPagination()
+        changes = paginator.paginate_changes(employee_changes, request)
+        return paginator.get_paginated_response(EmployeeChangeSerializer(changes, many=True).data)
+
+    @action(detail=False, methods=['get'], url_path='search')
+    def search(self, request, *args, **kwargs):
+        """
+        Ranked, typo-tolerant search over name, email and department.
+
+        ``?q=`` is required. Results are best first, in ``?limit=`` /
+        ``?offset=`` pages, and honour ``?fields=``.
+        """
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            return Response({'q': ['This query parameter is required.']}, status=status.HTTP_400_BAD_REQUEST)
+
+        paginator = RankedPagination()
+        hits = paginator.paginate_queryset(search_employees(query), request, view=self)
+        fields = self.get_requested_fields()
+        employees = EmployeeSearchResultSerializer.setup_eager_loading(
+            Employee.objects.all(), fields=fields
+        ).in_bulk([pk for pk, _ in hits])
+        results = []
+        for pk, score in hits:
+            if pk in employees:  # Skip rows deleted since the index was built.
+                employees[pk].score = round(score, 4)
+                results.append(employees[pk])
+        serializer = EmployeeSearchResultSerializer(
+            results, many=True, fields=fields, context=self.get_serializer_context()
+        )
+        return paginator.get_paginated_response(serializer.data)
+
+    @action(detail=False, methods=['get'], url_path='export')
+    def export(self, request, *args, **kwargs):
+        """
+        Download every employee with review aggregates as one file, streamed.
+
+        ``?file_format=csv`` (default) or ``parquet``; ``?gzip=1`` compresses
+        on the fly. ``filter_params`` apply; rows are ordered by id.
+        """
+        file_format = request.query_params.get('file_format', 'csv')
+        compress = bool(request.query_params.get('gzip'))
+        stats = ExportStats()
+        try:
+            chunks = iter_export(self.filter_queryset(Employee.objects.all()), file_format, compress, stats=stats)
+        except ExportError as exc:
+            return Response({'file_format': [str(exc)]}, status=status.HTTP_400_BAD_REQUEST)
+
+        filename = f"employees.{file_format}{'.gz' if compress else ''}"
+        response = StreamingHttpResponse(
+            logged(chunks, stats, filename),
+            content_type='application/gzip' if compress else CONTENT_TYPES[file_format],
+        )
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
 
     @action(detail=False, methods=['post'], url_path='create')
     def create_employee(self, request, *args, **kwargs):
@@ -43,38 +249,92 @@ class EmployeeViewSet(viewsets.GenericViewSet, viewsets.mixins.ListModelMixin, v
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+    @action(detail=False, methods=['post'], url_path='bulk', parser_classes=[JSONParser, NDJSONParser])
+    def bulk_upsert(self, request, *args, **kwargs):
+        """
+        Create or update many employees, keyed on email.
+
+        Accepts a JSON array or an NDJSON (``application/x-ndjson``) body and
+        returns a summary plus one result per row, in input order.
+        """
+        if not isinstance(request.data, list):
+            return Response({'detail': 'Expected a JSON array or NDJSON body.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        results = upsert_employees(request.data)
+        summary = {'created': 0, 'updated': 0, 'error': 0}
+        for result in results:
+            summary[result['status']] += 1
+        return Response({**summary, 'results': results}, status=status.HTTP_200_OK)
+
     @action(detail=False, methods=['put', 'patch'], url_path='update/(?P<identifier>\w+)')
     def update_employee(self, request, identifier=None, *args, **kwargs):
-        if identifier.isdigit():
-            # If identifier is a digit, filter by id
-            employee = get_object_or_404(Employee, id=identifier)
-        else:
-            # If identifier is a string, filter by name (assuming unique name for simplicity)
-            employee = get_object_or_404(Employee, first_name__iexact=identifier)
+        """
+        Update an employee; only the fields whose values change are written.
+
+        The write is a single ``UPDATE`` conditioned on the version that was
+        read. With ``If-Match`` (an ETag from retrieving the employee by ID or
+        from a previous update) a version other than the one named fails with
+        ``412``; without it, losing a race re-reads and re-applies the request.
+        """
+        expected_versions = if_match_versions(request)
+        for _ in range(UPDATE_ATTEMPTS):
+            employee = self.get_employee(identifier)
+            if expected_versions is not None and employee.version not in expected_versions:
+                return self.precondition_failed(employee)
+
+            serializer = self.get_serializer(employee, data=request.data, partial=request.method == 'PATCH')
+            if not serializer.is_valid():
+                return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+            try:
+                serializer.save()
+            except VersionConflict:
+                if expected_versions is not None:
+                    return self.precondition_failed(self.get_employee(identifier))
+                continue
+            body = ORJSONRenderer().render(serializer.data)
+            return Response(serializer.data, headers={'ETag': make_etag(body, employee.version)})
+        return Response(
+            {'detail': 'The employee is being updated concurrently; retry the request.'},
+            status=status.HTTP_409_CONFLICT,
+        )
+
+    def precondition_failed(self, employee):
+        return Response(
+            {'detail': f'The employee has changed; it is now at version {employee.version}.'},
+            status=status.HTTP_412_PRECONDITION_FAILED,
+        )
 
-        partial = request.method == 'PATCH'
-        serializer = self.get_serializer(employee, data=request.data, partial=partial)
-        
-        if serializer.is_valid():
-            serializer.save()
-            return Response(serializer.data)
-        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
-    
     @action(detail=False, methods=['delete'], url_path='delete/(?P<identifier>\w+)')
     def delete_employee(self, request, identifier=None, *args, **kwargs):
-        if identifier.isdigit():
-            # If the identifier is a digit, assume it's an ID
-            employee = get_object_or_404(Employee, id=identifier)
-        else:
-            # If the identifier is a string, assume it's a name (unique name for simplicity)
-            employee = get_object_or_404(Employee, first_name__iexact=identifier)
-
-        employee.delete()
+        """
+        Delete an employee and its reviews in bounded batches, or only mark it
+        deleted when soft deletion is on (see ``employees.deletion``).
+        """
+        employee = self.get_employee(identifier, queryset=Employee.objects.only('id'))
+        remove_employees(Employee.objects.filter(pk=employee.pk))
         return Response({'detail': 'Employee deleted successfully.'}, status=status.HTTP_204_NO_CONTENT)
 
+    @action(detail=False, methods=['post'], url_path='bulk/delete')
+    def bulk_delete(self, request, *args, **kwargs):
+        """
+        Delete the employees listed in ``ids``, or every employee of ``department``.
+
+        Rows go in bounded batches, as for ``delete_employee``; unknown IDs are
+        ignored. Returns how many employees (and reviews) were deleted.
+        """
+        serializer = EmployeeBulkDeleteSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        selection = serializer.validated_data
+        if 'ids' in selection:
+            queryset = Employee.objects.filter(pk__in=selection['ids'])
+        else:
+            queryset = Employee.objects.filter(department=selection['department'])
+        return Response(remove_employees(queryset), status=status.HTTP_200_OK)
+
    
 
-class PerformanceReviewViewSet(viewsets.ModelViewSet):
+class PerformanceReviewViewSet(SparseFieldsViewMixin, ValuesSerializationMixin, viewsets.ModelViewSet):
     """
     A viewset for handling PerformanceReview models.
 
@@ -83,9 +343,22 @@ class PerformanceReviewViewSet(viewsets.ModelViewSet):
     """
     queryset = Review.objects.all()
     serializer_class = ReviewSerializer
+    renderer_classes = [ORJSONRenderer, BrowsableAPIRenderer]
+    values_serialization = True
+    filter_backends = [QueryParameterFilter, OrderingFilter]
+    filter_params = {
+        'employee': 'employee',
+        'rating': 'rating',
+        'min_rating': 'rating__gte',
+        'max_rating': 'rating__lte',
+    }
+    ordering_fields = ['id', 'employee']
 
     def get_queryset(self):
-        return Review.objects.all()
+        # Reviews of soft-deleted employees go with them (employees.deletion).
+        return self.get_serializer_class().setup_eager_loading(
+            Review.objects.filter(employee__deleted_at__isnull=True), fields=self.get_requested_fields()
+        )
     
     def get_serializer(self, *args, **kwargs):
         return super().get_serializer(*args, **kwargs)
@@ -107,7 +380,8 @@ class PerformanceReviewViewSet(viewsets.ModelViewSet):
     
     def list(self, request, *args, **kwargs):
         """
-        Retrieve all performance reviews.
+        Retrieve all performance reviews, narrowed by ``filter_params``,
+        ``?ordering=`` and ``?fields=``.
 
         Args:
             request (Request): The HTTP request object.
@@ -115,13 +389,12 @@ class PerformanceReviewViewSet(viewsets.ModelViewSet):
         Returns:
             response (Response): The HTTP response object.
         """
-        queryset = self.get_queryset()
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(serializer.data)
+        queryset = self.filter_queryset(self.get_queryset())
+        return cached_response(request, REVIEW_LIST_NAMESPACE, lambda: self.list_data(queryset))
 
     def retrieve(self, request, pk=None, *args, **kwargs):
         """
-        Retrieve a specific performance review by ID.
+        Retrieve a specific performance review by ID, through the response cache.
 
         Args:
             request (Request): The HTTP request object.
@@ -130,10 +403,52 @@ class PerformanceReviewViewSet(viewsets.ModelViewSet):
         Returns:
             response (Response): The HTTP response object.
         """
-    
-        review = get_object_or_404(self.get_queryset(), pk=pk)
-        serializer = self.get_serializer(review)
-        return Response(serializer.data)
+        return cached_response(
+            request,
+            review_namespace(int(pk)),
+            lambda: self.get_serializer(get_object_or_404(self.get_queryset(), pk=pk)).data,
+        )
+
+    @action(detail=False, methods=['post'], url_path='bulk', parser_classes=[JSONParser, NDJSONParser])
+    def bulk_create_reviews(self, request, *args, **kwargs):
+        """
+        Create many reviews in one request.
+
+        Accepts a JSON array or an NDJSON (``application/x-ndjson``) body and
+        returns a summary plus one result per row, in input order.
+        """
+        if not isinstance(request.data, list):
+            return Response({'detail': 'Expected a JSON array or NDJSON body.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        results = create_reviews(request.data)
+        summary = {'created': 0, 'error': 0}
+        for result in results:
+            summary[result['status']] += 1
+        return Response({**summary, 'results': results}, status=status.HTTP_200_OK)
+
+    @action(detail=False, methods=['get'], url_path=r'(?P<employee_pk>\d+)/reviews', pagination_class=EmployeeReviewPagination)
+    def employee_reviews(self, request, employee_pk=None, *args, **kwargs):
+        """
+        One employee's reviews in keyset pages, oldest first (``?ordering=-created_at``
+        for newest first), narrowed by ``filter_params`` and ``?fields=``.
+
+        Args:
+            request (Request): The HTTP request object.
+            employee_pk (str): The primary key of the employee.
+
+        Returns:
+            response (Response): The HTTP response object.
+        """
+        queryset = self.filter_queryset(self.get_queryset()).filter(employee_id=employee_pk)
+
+        def build():
+            data = self.list_data(queryset)
+            # Only an empty page needs telling "no reviews" apart from "no employee".
+            if not data['results'] and not Employee.objects.filter(pk=employee_pk).exists():
+                raise Http404('No Employee matches the given query.')
+            return data
+
+        return cached_response(request, employee_namespace(int(employee_pk)), build)
 
     def update(self, request, pk=None, *args, **kwargs):
         """
@@ -170,4 +485,182 @@ class PerformanceReviewViewSet(viewsets.ModelViewSet):
         review.delete()
         return Response({'detail': 'Review deleted successfully.'}, status=status.HTTP_204_NO_CONTENT)
 
-    
+
+class ReviewSummaryViewSet(SparseFieldsViewMixin, ValuesSerializationMixin, viewsets.GenericViewSet):
+    """
+    Review aggregates for dashboards.
+
+    Both summaries read the review stats denormalized onto ``Employee``
+    (kept current by ``employees.signals``), so a per-employee row costs
+    O(1) and the department summary scans employees rather than reviews.
+    """
+    serializer_class = EmployeeReviewSummarySerializer
+    queryset = Employee.objects.all()
+    pagination_class = KeysetPagination
+    renderer_classes = [ORJSONRenderer, BrowsableAPIRenderer]
+    values_serialization = True
+    filter_backends = [QueryParameterFilter, OrderingFilter]
+    filter_params = {
+        'department': 'department',
+    }
+    ordering_fields = ['id', 'department']
+
+    def get_queryset(self):
+        return self.get_serializer_class().setup_eager_loading(
+            Employee.objects.all(), fields=self.get_requested_fields()
+        )
+
+    def employees(self, request, *args, **kwargs):
+        """
+        Review count and average rating per employee.
+
+        Args:
+            request (Request): The HTTP request object.
+
+        Returns:
+            response (Response): The HTTP response object.
+        """
+        queryset = self.filter_queryset(self.get_queryset())
+        return Response(self.list_data(queryset))
+
+    def departments(self, request, *args, **kwargs):
+        """
+        Employee count, review count and average rating per department.
+
+        Args:
+            request (Request): The HTTP request object.
+
+        Returns:
+            response (Response): The HTTP response object.
+        """
+        queryset = QueryParameterFilter().filter_queryset(request, Employee.objects.all(), self)
+        rows = queryset.values('department').annotate(
+            employees_total=Count('id'),
+            reviews_total=Sum('review_count'),
+            ratings_total=Sum('rating_total'),
+        ).order_by('department')
+        return Response([
+            {
+                'department': row['department'],
+                'employee_count': row['employees_total'],
+                'review_count': row['reviews_total'],
+                'avg_rating': row['ratings_total'] / row['reviews_total'] if row['reviews_total'] else None,
+            }
+            for row in rows
+        ])
+
+
+class JobViewSet(viewsets.GenericViewSet):
+    """
+    Enqueue background jobs and poll their status, progress and result.
+
+    Jobs are run by ``manage.py run_workers`` (see ``employees.jobs``).
+    """
+    queryset = Job.objects.all()
+    serializer_class = JobSerializer
+    pagination_class = JobPagination
+    renderer_classes = [ORJSONRenderer, BrowsableAPIRenderer]
+    filter_backends = [QueryParameterFilter]
+    filter_params = {
+        'kind': 'kind',
+        'status': 'status',
+    }
+
+    def list(self, request, *args, **kwargs):
+        page = self.paginate_queryset(self.filter_queryset(self.get_queryset()))
+        return self.get_paginated_response(self.get_serializer(page, many=True).data)
+
+    def retrieve(self, request, pk=None, *args, **kwargs):
+        return Response(self.get_serializer(get_object_or_404(self.get_queryset(), pk=pk)).data)
+
+    def create(self, request, *args, **kwargs):
+        """
+        Queue a job: ``{"kind": "export_employees", "params": {...}}``.
+
+        Returns ``202`` with the job and its URL in ``Location``.
+        """
+        serializer = JobCreateSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        kind = serializer.validated_data['kind']
+        if kind not in JOB_TYPES or kind == 'import_employees':
+            choices = ', '.join(sorted(set(JOB_TYPES) - {'import_employees'}))
+            return Response({'kind': [f'Expected one of {choices}; upload imports to jobs/import/.']},
+                            status=status.HTTP_400_BAD_REQUEST)
+        return self.accepted(enqueue(kind, serializer.validated_data['params']))
+
+    @action(detail=False, methods=['post'], url_path='import', parser_classes=[JSONParser])
+    def import_employees(self, request, *args, **kwargs):
+        """
+        Save the body, a CSV (``text/csv``), NDJSON (``application/x-ndjson``)
+        or JSON array of employees, and queue its import.
+
+        CSV and NDJSON bodies are copied to disk as they arrive, never parsed here.
+        """
+        content_type = request.content_type.split(';')[0].strip()
+        file_format = {'text/csv': 'csv', 'application/x-ndjson': 'ndjson', 'application/json': 'ndjson'}.get(content_type)
+        if file_format is None:
+            return Response({'detail': 'Send text/csv, application/x-ndjson or a JSON array.'},
+                            status=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE)
+        rows = None
+        if content_type == 'application/json':
+            rows = request.data
+            if not isinstance(rows, list):
+                return Response({'detail': 'Expected a JSON array.'}, status=status.HTTP_400_BAD_REQUEST)
+        # DRF leaves request.stream as None for an empty body.
+        if not rows and request.stream is None:
+            return Response({'detail': 'The request body is empty.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        name = f'upload-{uuid.uuid4().hex}.{file_format}'
+        with open(job_file_path(name), 'wb') as handle:
+            if rows is not None:
+                handle.writelines(json.dumps(row).encode() + b'\n' for row in rows)
+            else:
+                shutil.copyfileobj(request.stream, handle, UPLOAD_CHUNK_SIZE)
+        return self.accepted(enqueue('import_employees', {'file': name, 'file_format': file_format}))
+
+    @action(detail=True, methods=['get'], url_path='download')
+    def download(self, request, pk=None, *args, **kwargs):
+        """
+        The file a finished job produced (an export, or an import's rejected rows).
+        """
+        job = get_object_or_404(self.get_queryset(), pk=pk, status=Job.SUCCEEDED)
+        name = (job.result or {}).get('file')
+        if not name or not os.path.isfile(job_file_path(name)):
+            raise Http404('This job has no file.')
+        return FileResponse(open(job_file_path(name), 'rb'), as_attachment=True, filename=name)
+
+    def accepted(self, job):
+        data = self.get_serializer(job).data
+        location = reverse('job-detail', kwargs={'pk': job.pk}, request=self.request)
+        return Response(data, status=status.HTTP_202_ACCEPTED, headers={'Location': location})
+
+
+class MetricsViewSet(viewsets.ViewSet):
+    """
+    Operational metrics of the worker process that serves the request.
+    """
+
+    def database(self, request, *args, **kwargs):
+        """
+        Connection reuse and pool usage, for sizing the pool per worker.
+
+        Args:
+            request (Request): The HTTP request object.
+
+        Returns:
+            response (Response): The HTTP response object.
+        """
+        return Response(connection_stats())
+
+    def requests(self, request, *args, **kwargs):
+        """
+        Request count, N+1-flagged requests, and wall time, DB time and query
+        count percentiles per route, for finding slow or chatty endpoints.
+
+        Args:
+            request (Request): The HTTP request object.
+
+        Returns:
+            response (Response): The HTTP response object.
+        """
+        return Response(route_metrics.snapshot())